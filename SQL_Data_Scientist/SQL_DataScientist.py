@@ -1,4 +1,12 @@
-def main():
+import sys
+from pathlib import Path
+
+# Make the shared `sqlkit` package at the repository root importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main(loader="pandas", profile=False, profile_json=None, only=None, tags=None,
+         list_queries=False, jobs=1, export_dir=None, export_format="csv", compression=None):
     """
     📊 Data Scientist Job Market Analysis (2020–2025)
     -------------------------------------------------
@@ -17,98 +25,57 @@ def main():
 
     🗂 Dataset: DataScientist.csv (from Kaggle or local source)
 
+    ⚡ Loading: `loader="bulk"` (`--loader bulk`) loads the CSV with
+    `sqlkit.bulkload` instead of pandas `to_sql`; with `--profile` either
+    load is reported in rows/sec.
+    `loader="columnar"` reads it through the typed Feather cache of
+    `sqlkit.columnar`, memory-mapped on every run after the first.
+
+    ⏱️ Profiling: `profile=True` (`--profile`) times every query and prints
+    a slowest-first report flagging full scans and temp B-trees from
+    `EXPLAIN QUERY PLAN`; `--profile-json FILE` writes JSON lines instead.
+
+    🗃️ Query selection: every query is registered by name and tags in a
+    `sqlkit.registry.QueryRegistry`. `--only querya1 queryd2` or
+    `--tag salary` runs just those, and `--list` prints the queries and
+    exits without loading the CSV. `--jobs N` runs the queries on N
+    read-only connections in parallel (`sqlkit.parallel`), printing the
+    results in the usual order.
+
+    💰 Salary profiles: querya1-querya5 (average/max/min salary and a
+    LOW/MEDIUM/HIGH level per job title, experience level, employment type,
+    remote ratio and company location) read `salary_profiles`, built for
+    all five dimensions in one scan of `DATA` by the `salary_profiles`
+    engine, which takes any list of dimensions.
+
+    📤 Export: `--export DIR` writes every selected query to its own
+    csv/jsonl/parquet file in DIR (`--export-format`, `--compression`) with
+    a `manifest.json`, streaming rows from the cursor via `sqlkit.export`.
+
     Author: Krishn Meena
     """
     import pandas as pd
     import sqlite3
     from pathlib import Path
-
-    # Load dataset
-    file_path = Path("salaries.csv")
-    df = pd.read_csv(file_path)
-    conn = sqlite3.connect(":memory:")
-    df.to_sql("DATA", conn, index=False, if_exists="replace")
-
-    # Salary Analysis
-    querya1 = """SELECT job_title,average_salary,MAX_salary,MIN_salary,
-            CASE 
-                WHEN average_salary<50000 THEN "LOW"
-                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
-                ELSE "HIGH"
-              END AS salary_level
-            FROM
-            (SELECT job_title, AVG(salary_in_usd) AS average_salary,MAX(salary_in_usd) AS MAX_salary,MIN(salary_in_usd) AS MIN_salary                            
-            FROM DATA
-            GROUP BY job_title)
-            ORDER BY average_salary DESC
-            """
-    resulta1 = pd.read_sql_query(querya1, conn)
-    print("\nSalary Analysis by Job Title:")
-    print(resulta1)
-
-    querya2 = """SELECT experience_level,average_salary,MAX_salary,MIN_salary,
-            CASE 
-                WHEN average_salary<50000 THEN "LOW"
-                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
-                ELSE "HIGH"
-              END AS salary_level
-            FROM
-            (SELECT experience_level, AVG(salary_in_usd) AS average_salary,MAX(salary_in_usd) AS MAX_salary,MIN(salary_in_usd) AS MIN_salary                            
-            FROM DATA
-            GROUP BY experience_level)
-            ORDER BY average_salary DESC
-            """
-    resulta2 = pd.read_sql_query(querya2, conn)
-    print("\nSalary Analysis by Experience Level:")
-    print(resulta2)
-
-    querya3 = """SELECT employment_type,average_salary,MAX_salary,MIN_salary,
-            CASE 
-                WHEN average_salary<50000 THEN "LOW"
-                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
-                ELSE "HIGH"
-              END AS salary_level
-            FROM
-            (SELECT employment_type, AVG(salary_in_usd) AS average_salary,MAX(salary_in_usd) AS MAX_salary,MIN(salary_in_usd) AS MIN_salary                            
-            FROM DATA
-            GROUP BY employment_type)
-            ORDER BY average_salary DESC
-            """
-    resulta3 = pd.read_sql_query(querya3, conn)
-    print("\nSalary Analysis by Employment Type:")
-    print(resulta3)
-
-    querya4 = """SELECT remote_ratio,average_salary,MAX_salary,MIN_salary,
-            CASE 
-                WHEN average_salary<50000 THEN "LOW"
-                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
-                ELSE "HIGH"
-              END AS salary_level
-            FROM
-            (SELECT remote_ratio, AVG(salary_in_usd) AS average_salary,MAX(salary_in_usd) AS MAX_salary,MIN(salary_in_usd) AS MIN_salary                            
-            FROM DATA
-            GROUP BY remote_ratio)
-            ORDER BY average_salary DESC
-            """
-    resulta4 = pd.read_sql_query(querya4, conn)
-    print("\nSalary Analysis by Remote Ratio:")
-    print(resulta4)
-
-    querya5 = """SELECT company_location,average_salary,MAX_salary,MIN_salary,
-            CASE 
-                WHEN average_salary<50000 THEN "LOW"
-                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
-                ELSE "HIGH"
-              END AS salary_level
-            FROM
-            (SELECT company_location, AVG(salary_in_usd) AS average_salary,MAX(salary_in_usd) AS MAX_salary,MIN(salary_in_usd) AS MIN_salary                            
-            FROM DATA
-            GROUP BY company_location)
-            ORDER BY average_salary DESC
-           """
-    resulta5 = pd.read_sql_query(querya5, conn)
-    print("\nSalary Analysis by Company Location:")
-    print(resulta5)
+    from sqlkit.bulkload import bulk_load_csv, csv_to_sql
+    from sqlkit.instrument import QueryProfiler
+    from sqlkit.export import export_queries
+    from sqlkit.registry import QueryRegistry
+    from sqlkit.columnar import columnar_load
+    from salary_profiles import PROFILE_DIMENSIONS, build_profiles, profile_query
+
+    registry = QueryRegistry()
+
+    # Salary Analysis: every profile comes from one shared scan of DATA
+    registry.prerequisite("salary_profiles", lambda: build_profiles(conn, PROFILE_DIMENSIONS))
+    for name, dimension, title in (
+        ("querya1", "job_title", "Salary Analysis by Job Title:"),
+        ("querya2", "experience_level", "Salary Analysis by Experience Level:"),
+        ("querya3", "employment_type", "Salary Analysis by Employment Type:"),
+        ("querya4", "remote_ratio", "Salary Analysis by Remote Ratio:"),
+        ("querya5", "company_location", "Salary Analysis by Company Location:"),
+    ):
+        registry.add(name, title, profile_query(dimension), tags=("salary",), requires=("salary_profiles",))
 
     # Role & title trend
     queryb1 = """SELECT job_title,COUNT(*) AS title_count
@@ -117,9 +84,7 @@ def main():
             ORDER BY title_count DESC
             LIMIT 10
             """
-    resultb1 = pd.read_sql_query(queryb1, conn)
-    print("\nTop 10 Job Titles by Count:")
-    print(resultb1)
+    registry.add("queryb1", "Top 10 Job Titles by Count:", queryb1, tags=("roles",))
 
     queryb2 = """ SELECT work_year, job_title, title_count, rank
              FROM (
@@ -134,9 +99,7 @@ def main():
                WHERE rank <= 5
                ORDER BY work_year, rank
                """
-    resultb2 = pd.read_sql_query(queryb2, conn)
-    print("\nTop 5 Job Titles by Year:")
-    print(resultb2)
+    registry.add("queryb2", "Top 5 Job Titles by Year:", queryb2, tags=("roles",))
 
     queryb3 = """ SELECT experience_level, job_title, title_count, rank
              FROM (
@@ -151,9 +114,7 @@ def main():
                WHERE rank <= 5
                ORDER BY experience_level, rank
                """
-    resultb3 = pd.read_sql_query(queryb3, conn)
-    print("\nTop 5 Job Titles by Experience Level:")
-    print(resultb3)
+    registry.add("queryb3", "Top 5 Job Titles by Experience Level:", queryb3, tags=("roles",))
 
     # Remote Work impact
     queryc1 = """SELECT work_year, COUNT(remote_ratio) AS remote_jobs,
@@ -164,9 +125,7 @@ def main():
             FROM DATA
             GROUP BY work_year,remote_ratio
             """
-    resultc1 = pd.read_sql_query(queryc1, conn)
-    print("\nRemote Work Impact by Year:")
-    print(resultc1)
+    registry.add("queryc1", "Remote Work Impact by Year:", queryc1, tags=("remote",))
 
     queryc2 = """SELECT AVG(salary_in_usd) AS average_salary,
             CASE WHEN remote_ratio="100" THEN "Remote job"
@@ -177,9 +136,7 @@ def main():
             GROUP BY job_type
             ORDER BY average_salary DESC
             """
-    resultc2 = pd.read_sql_query(queryc2, conn)
-    print("\nAverage Salary by Remote Work Type:")
-    print(resultc2)
+    registry.add("queryc2", "Average Salary by Remote Work Type:", queryc2, tags=("remote",))
 
     queryc3 = """SELECT company_location,COUNT(*) AS remote_jobs
             FROM DATA
@@ -188,9 +145,7 @@ def main():
             ORDER BY remote_jobs DESC
             LIMIT 10
             """
-    resultc3 = pd.read_sql_query(queryc3, conn)
-    print("\nTop 10 Companies with Remote Jobs:")
-    print(resultc3)
+    registry.add("queryc3", "Top 10 Companies with Remote Jobs:", queryc3, tags=("remote",))
 
     # geographical insight
     queryd1 = """SELECT company_location,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
@@ -199,9 +154,7 @@ def main():
             ORDER BY total_jobs DESC,Average_salary DESC
             LIMIT 10
             """
-    resultd1 = pd.read_sql_query(queryd1, conn)
-    print("\nTop 10 Company location by Job Count and Average Salary:")
-    print(resultd1)
+    registry.add("queryd1", "Top 10 Company location by Job Count and Average Salary:", queryd1, tags=("geography",))
 
     queryd2 = """SELECT COUNT(*) AS ds_jobs,AVG(salary_in_usd) AS Average_salary,company_location
             FROM DATA
@@ -209,9 +162,7 @@ def main():
             GROUP BY company_location           
             ORDER BY Average_salary DESC          
             """
-    resultd2 = pd.read_sql_query(queryd2, conn)
-    print("\nData Scientist Jobs by Company Location:")
-    print(resultd2)
+    registry.add("queryd2", "Data Scientist Jobs by Company Location:", queryd2, tags=("geography",))
 
     # experience vs salary
     querye1 = """SELECT experience_level,work_year,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
@@ -219,69 +170,53 @@ def main():
             GROUP BY experience_level,work_year           
             ORDER BY work_year ASC, Average_salary DESC          
             """
-    resulte1 = pd.read_sql_query(querye1, conn)
-    print("\nExperience Level vs Salary by Year:")
-    print(resulte1)
+    registry.add("querye1", "Experience Level vs Salary by Year:", querye1, tags=("experience",))
 
     querye2 = """SELECT experience_level,company_location,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY experience_level,company_location          
             ORDER BY Average_salary DESC          
             """
-    resulte2 = pd.read_sql_query(querye2, conn)
-    print("\nExperience Level vs Salary by Company Location:")
-    print(resulte2)
+    registry.add("querye2", "Experience Level vs Salary by Company Location:", querye2, tags=("experience",))
 
     querye3 = """SELECT experience_level,job_title,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY experience_level,job_title          
             ORDER BY total_jobs DESC,Average_salary DESC          
             """
-    resulte3 = pd.read_sql_query(querye3, conn)
-    print("\nExperience Level vs Salary by Job Title:")
-    print(resulte3)
+    registry.add("querye3", "Experience Level vs Salary by Job Title:", querye3, tags=("experience",))
 
     # employment type
     queryf1 = """SELECT employment_type,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY employment_type           
             ORDER BY total_jobs DESC"""
-    resultf1 = pd.read_sql_query(queryf1, conn)
-    print("\nEmployment Type Analysis:")
-    print(resultf1)
+    registry.add("queryf1", "Employment Type Analysis:", queryf1, tags=("employment",))
 
     queryf2 = """SELECT company_location,employment_type,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY company_location ,employment_type           
             ORDER BY company_location ASC"""
-    resultf2 = pd.read_sql_query(queryf2, conn)
-    print("\nEmployment Type by Company Location:")
-    print(resultf2)
+    registry.add("queryf2", "Employment Type by Company Location:", queryf2, tags=("employment",))
 
     queryf3 = """SELECT job_title,employment_type,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY  job_title,employment_type           
             ORDER BY job_title ASC"""
-    resultf3 = pd.read_sql_query(queryf3, conn)
-    print("\nEmployment Type by Job Title:")
-    print(resultf3)
+    registry.add("queryf3", "Employment Type by Job Title:", queryf3, tags=("employment",))
 
     # company insight
     queryg1 = """SELECT company_location,AVG(salary_in_usd) AS Average_salary,COUNT(*) AS total_jobs
             FROM DATA
             GROUP BY company_location
             ORDER BY Average_salary DESC"""
-    resultg1 = pd.read_sql_query(queryg1, conn)
-    print("\nCompany Insight by Location:")
-    print(resultg1)
+    registry.add("queryg1", "Company Insight by Location:", queryg1, tags=("company",))
 
     queryg2 = """SELECT company_size,AVG(salary_in_usd) AS Average_salary,COUNT(*) AS total_jobs
             FROM DATA
             GROUP BY company_size
             ORDER BY Average_salary DESC"""
-    resultg2 = pd.read_sql_query(queryg2, conn)
-    print("\nCompany Insight by Size:")
-    print(resultg2)
+    registry.add("queryg2", "Company Insight by Size:", queryg2, tags=("company",))
 
     # keyword analysis
     queryh1 = """SELECT job_title,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
@@ -289,26 +224,20 @@ def main():
             WHERE job_title LIKE "%Data Scientist%" OR job_title LIKE "%ML%" OR job_title LIKE "%AI%"
             GROUP BY job_title
             ORDER BY Average_salary DESC"""
-    resulth1 = pd.read_sql_query(queryh1, conn)
-    print("\nKeyword Analysis for Data Scientist, ML, AI:")
-    print(resulth1)
+    registry.add("queryh1", "Keyword Analysis for Data Scientist, ML, AI:", queryh1, tags=("keywords",))
 
     # year on year comparision
     queryi1 = """SELECT work_year,COUNT(*) AS total_jobs,AVG(salary_in_usd) AS Average_salary
             FROM DATA
             GROUP BY work_year
             ORDER BY work_year ASC"""
-    resulti1 = pd.read_sql_query(queryi1, conn)
-    print("\nYear on Year Job Count and Average Salary:")
-    print(resulti1)
+    registry.add("queryi1", "Year on Year Job Count and Average Salary:", queryi1, tags=("growth",))
 
     queryi2 = """SELECT work_year,job_title,COUNT(*) AS total_jobs
             FROM DATA
             GROUP BY work_year,job_title
             ORDER BY work_year ASC"""
-    resulti2 = pd.read_sql_query(queryi2, conn)
-    print("\nYear on Year Job Count by Title:")
-    print(resulti2)
+    registry.add("queryi2", "Year on Year Job Count by Title:", queryi2, tags=("growth",))
 
     queryi3 = """WITH job_count AS
             (SELECT work_year,job_title,COUNT(*) AS total_jobs
@@ -324,9 +253,7 @@ def main():
              WHERE previous_total_jobs IS NOT NULL
              ORDER BY work_year ASC,total_jobs DESC
              """
-    resulti3 = pd.read_sql_query(queryi3, conn)
-    print("\nYear on Year Growth by Job Title:")
-    print(resulti3)
+    registry.add("queryi3", "Year on Year Growth by Job Title:", queryi3, tags=("growth",))
 
     queryi4 = """WITH base AS
            (SELECT work_year,
@@ -348,9 +275,7 @@ def main():
             WHERE Previous_total_jobs IS NOT NULL
             ORDER BY work_year ASC,job_type DESC
              """
-    resulti4 = pd.read_sql_query(queryi4, conn)
-    print("\nYear on Year Growth by Remote Work Type:")
-    print(resulti4)
+    registry.add("queryi4", "Year on Year Growth by Remote Work Type:", queryi4, tags=("growth",))
 
     queryi5 = """WITH start AS
             (SELECT work_year,job_title,COUNT(*) AS total_jobs
@@ -376,10 +301,51 @@ def main():
             WHERE rank<=5
             ORDER BY work_year ASC,rank ASC
             """
-    resulti5 = pd.read_sql_query(queryi5, conn)
-    print("\nTop 5 Job Titles by Year on Year Growth(percentage):")
-    print(resulti5)
+    registry.add("queryi5", "Top 5 Job Titles by Year on Year Growth(percentage):", queryi5, tags=("growth",))
+
+    selected = registry.select(only, tags)
+    if list_queries:
+        print(registry.listing(selected).to_string(index=False))
+        return
 
+    # Load dataset
+    file_path = Path("salaries.csv")
+    conn = sqlite3.connect(":memory:")
+    profiler = QueryProfiler(enabled=profile or profile_json is not None)
+    if loader == "bulk":
+        profiler.record_load(bulk_load_csv(conn, "DATA", file_path))
+    elif loader == "columnar":
+        profiler.record_load(columnar_load(conn, "DATA", file_path))
+    else:
+        profiler.record_load(csv_to_sql(conn, "DATA", file_path))
+
+    if export_dir:
+        export_queries(registry, selected, conn, export_dir, export_format, compression, jobs=jobs)
+    else:
+        registry.run(selected, conn, profiler, jobs=jobs)
+
+    if profile:
+        profiler.print_report()
+    if profile_json:
+        profiler.write_jsonl(profile_json)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from sqlkit.registry import UnknownQueryError, add_arguments
+
+    parser = argparse.ArgumentParser(description="Data Scientist Job Market Analysis")
+    parser.add_argument("--loader", choices=["pandas", "bulk", "columnar"], default="pandas",
+                        help="load with DataFrame.to_sql, the sqlkit bulk loader, or through a Feather "
+                             "cache of the CSV (--profile reports rows/sec)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every query and print a report with full scans and temp b-trees flagged")
+    parser.add_argument("--profile-json", metavar="FILE",
+                        help="write the per-query profile (including plans) as JSON lines ('-' for stdout)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        main(loader=args.loader, profile=args.profile, profile_json=args.profile_json,
+             only=args.only, tags=args.tags, list_queries=args.list_queries, jobs=args.jobs,
+             export_dir=args.export_dir, export_format=args.export_format, compression=args.compression)
+    except UnknownQueryError as exc:
+        parser.error(str(exc))
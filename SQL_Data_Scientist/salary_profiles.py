@@ -0,0 +1,119 @@
+"""
+💰 Salary profiles
+
+The salary profile of a dimension is, for each of its values, the average,
+maximum and minimum `salary_in_usd` plus a LOW/MEDIUM/HIGH level from the
+average.  `querya1`–`querya5` in `SQL_DataScientist.py` used to compute one
+profile each with its own GROUP BY over `DATA`; this engine computes the
+profiles of any list of dimensions in a single scan:
+
+1. one pass aggregates `DATA` to the finest grain (every dimension at once),
+   keeping count, sum, max and min of the salary;
+2. that small result is CROSS JOINed to a VALUES list of the dimensions and
+   rolled up to each one (sums and counts add up, max/min of max/min).
+
+Adding a dimension only adds rows to the step-2 rollup; `DATA` is still read
+once.  `build_profiles` stores the result in `salary_profiles`, one row per
+(dimension, value), which the report queries filter; `salary_profiles`
+returns it as one DataFrame per dimension.
+"""
+
+import pandas as pd
+
+PROFILE_DIMENSIONS = ("job_title", "experience_level", "employment_type", "remote_ratio", "company_location")
+
+PROFILE_TABLE = "salary_profiles"
+
+# The `value` column carries no declared type: it holds text for most
+# dimensions and integers for remote_ratio, and must keep whichever it gets.
+PROFILE_COLUMNS = """(
+    dimension TEXT,
+    value,
+    employees INTEGER,
+    average_salary REAL,
+    MAX_salary,
+    MIN_salary,
+    salary_level TEXT
+)"""
+
+
+def _check_dimensions(conn, dimensions):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(DATA)")}
+    unknown = [dim for dim in dimensions if dim not in columns]
+    if unknown:
+        raise ValueError(f"unknown dimensions {unknown}; DATA has {sorted(columns)}")
+    if not dimensions:
+        raise ValueError("at least one dimension is needed")
+
+
+def profiles_query(dimensions=PROFILE_DIMENSIONS):
+    """SQL returning (dimension, value, employees, average_salary, MAX_salary, MIN_salary, salary_level)."""
+    columns = ", ".join(f'"{dim}"' for dim in dimensions)
+    names = ", ".join(f"('{dim}')" for dim in dimensions)
+    value = "CASE d.dimension " + " ".join(
+        f"WHEN '{dim}' THEN b.\"{dim}\"" for dim in dimensions
+    ) + " END"
+    return f"""WITH base AS
+    (SELECT {columns},
+            COUNT(salary_in_usd) AS n,
+            SUM(salary_in_usd) AS total,
+            MAX(salary_in_usd) AS max_salary,
+            MIN(salary_in_usd) AS min_salary
+    FROM DATA
+    GROUP BY {columns}),
+    dimensions(dimension) AS (VALUES {names}),
+    profiles AS
+    (SELECT d.dimension,
+            {value} AS value,
+            SUM(b.n) AS employees,
+            SUM(b.total)*1.0/SUM(b.n) AS average_salary,
+            MAX(b.max_salary) AS MAX_salary,
+            MIN(b.min_salary) AS MIN_salary
+    FROM base AS b
+    CROSS JOIN dimensions AS d
+    GROUP BY d.dimension, value)
+    SELECT dimension, value, employees, average_salary, MAX_salary, MIN_salary,
+            CASE
+                WHEN average_salary<50000 THEN "LOW"
+                WHEN average_salary BETWEEN 50000 AND 100000 THEN "MEDIUM"
+                ELSE "HIGH"
+              END AS salary_level
+    FROM profiles"""
+
+
+def build_profiles(conn, dimensions=PROFILE_DIMENSIONS):
+    """(Re)build the `salary_profiles` table for `dimensions` with one scan of `DATA`."""
+    _check_dimensions(conn, dimensions)
+    conn.execute(f"DROP TABLE IF EXISTS {PROFILE_TABLE}")
+    conn.execute(f"CREATE TABLE {PROFILE_TABLE} {PROFILE_COLUMNS}")
+    conn.execute(f"INSERT INTO {PROFILE_TABLE} {profiles_query(dimensions)}")
+    conn.execute(f"CREATE INDEX {PROFILE_TABLE}_dimension ON {PROFILE_TABLE} (dimension)")
+    conn.commit()
+
+
+def profile_query(dimension):
+    """SQL for the profile of one dimension from `salary_profiles`, highest average first."""
+    return f"""SELECT value AS {dimension},average_salary,MAX_salary,MIN_salary,salary_level
+            FROM {PROFILE_TABLE}
+            WHERE dimension = '{dimension}'
+            ORDER BY average_salary DESC"""
+
+
+def salary_profiles(conn, dimensions=PROFILE_DIMENSIONS):
+    """
+    Profiles of every dimension in `dimensions`, computed in one scan:
+    {dimension: DataFrame of value, average_salary, MAX_salary, MIN_salary,
+    salary_level}, each sorted by average salary, highest first.
+    """
+    dimensions = list(dimensions)
+    _check_dimensions(conn, dimensions)
+    df = pd.read_sql_query(profiles_query(dimensions), conn)
+    return {
+        dim: (df[df["dimension"] == dim]
+              .drop(columns=["dimension", "employees"])
+              .rename(columns={"value": dim})
+              .sort_values("average_salary", ascending=False, kind="stable")
+              .reset_index(drop=True)
+              .infer_objects())
+        for dim in dimensions
+    }
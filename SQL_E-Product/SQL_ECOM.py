@@ -1,4 +1,12 @@
-def main():
+import sys
+from pathlib import Path
+
+# Make the shared `sqlkit` package at the repository root importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main(loader="pandas", profile=False, profile_json=None, only=None, tags=None,
+         list_queries=False, jobs=1, export_dir=None, export_format="csv", compression=None):
     """
     E-Commerce Sales & Marketing Analytics (SQL Project)
     ----------------------------------------------------
@@ -28,6 +36,36 @@ def main():
     - Clicks, Impressions, Conversion_Rate
     - Category, Region, Ad_CTR, Ad_CPC, Ad_Spend
 
+    Loading:
+    - `loader="bulk"` (`--loader bulk`) inserts the prepared frame with
+      `sqlkit.bulkload` instead of pandas `to_sql`; with `--profile` either
+      load is reported in rows/sec.
+    - `loader="columnar"` also reads the CSV through `sqlkit.columnar`, which
+      memory-maps a typed Feather copy of it on later runs.
+    - `Transaction_Date` is not parsed per row: each distinct date string is
+      mapped once to an integer `date_key` (YYYYMMDD, `sqlkit.calendar`),
+      which is all the ECOM table stores. Year and month come back from the
+      key arithmetically, the date itself from the `calendar` table.
+
+    Profiling:
+    - `profile=True` (`--profile`) prints per-query wall time and rows,
+      slowest first, with full scans and temp B-trees flagged from
+      `EXPLAIN QUERY PLAN`; `--profile-json FILE` writes JSON lines.
+
+    Query selection:
+    - Every query is registered by name and tags in a
+      `sqlkit.registry.QueryRegistry`; `--only queryb1 queryf3` or
+      `--tag advertising` runs just those, `--list` prints them and exits
+      before the CSV is read.
+    - `--jobs N` runs the queries on N threads over read-only connections to
+      a snapshot of the database (`sqlkit.parallel`); results print in the
+      usual order.
+
+    Export:
+    - `--export DIR` streams every selected query's rows from the cursor to
+      one csv/jsonl/parquet file each in DIR (`--export-format`,
+      `--compression`) plus a `manifest.json`, instead of printing them.
+
     Ideal For:
     - SQL Portfolio Project
     - GitHub resume enhancement
@@ -38,77 +76,60 @@ def main():
     import pandas as pd
     import sqlite3
     from pathlib import Path
+    from sqlkit.bulkload import bulk_load_frame, frame_to_sql
+    from sqlkit.instrument import QueryProfiler
+    from sqlkit.calendar import date_keys, ensure_calendar, month_sql, period_sql, year_sql
+    from sqlkit.export import export_queries
+    from sqlkit.registry import QueryRegistry
+    from sqlkit.columnar import read_csv_cached
 
-    file_path = Path(
-        'synthetic_ecommerce_data.csv'
-    )
-    df = pd.read_csv(file_path)
-    df["Transaction_Date"] = pd.to_datetime(df["Transaction_Date"])
-    df["year"] = df["Transaction_Date"].dt.year
-    df["month"] = df["Transaction_Date"].dt.month
-    df["day"] = df["Transaction_Date"].dt.day
-    conn = sqlite3.connect(":memory:")
-    df.to_sql("ECOM", conn, index=False, if_exists="replace")
+    registry = QueryRegistry()
 
     # Sales Performance
     querya1 = """SELECT Category,SUM(Revenue) as Revenue
             FROM ECOM
             GROUP BY Category
             ORDER BY Revenue DESC"""
-    resulta1 = pd.read_sql_query(querya1, conn)
-    print("Sales Performance by Category:")
-    print(resulta1)
+    registry.add("querya1", "Sales Performance by Category:", querya1, tags=("sales",))
 
     querya2 = """SELECT  Region,SUM(Revenue) as Revenue
             FROM ECOM
             GROUP BY  Region
             ORDER BY Revenue DESC """
-    resulta2 = pd.read_sql_query(querya2, conn)
-    print("\nSales Performance by Region:")
-    print(resulta2)
+    registry.add("querya2", "Sales Performance by Region:", querya2, tags=("sales",))
 
     querya3 = """SELECT  Product_ID,SUM(Revenue) as Revenue
             FROM ECOM
             GROUP BY  Product_ID
             ORDER BY Revenue DESC
             LIMIT 10 """
-    resulta3 = pd.read_sql_query(querya3, conn)
-    print("\nTop 10 Products by Revenue:")
-    print(resulta3)
+    registry.add("querya3", "Top 10 Products by Revenue:", querya3, tags=("sales",))
 
-    querya4 = """SELECT  year,month,SUM(Revenue) as Revenue
+    querya4 = f"""SELECT  {year_sql("date_key")} AS year,{month_sql("date_key")} AS month,SUM(Revenue) as Revenue
             FROM ECOM
             GROUP BY  year,month
               """
-    resulta4 = pd.read_sql_query(querya4, conn)
-    print("\nMonthly Sales Performance:")
-    print(resulta4)
+    registry.add("querya4", "Monthly Sales Performance:", querya4, tags=("sales",))
 
     querya5 = """SELECT Product_ID,COUNT(Units_Sold) AS Total_Quantity
             FROM ECOM
             GROUP BY Product_ID
             ORDER BY Total_Quantity DESC
             LIMIT 10"""
-    resulta5 = pd.read_sql_query(querya5, conn)
-    print("\nTop 10 Products by Quantity Sold:")
-    print(resulta5)
+    registry.add("querya5", "Top 10 Products by Quantity Sold:", querya5, tags=("sales",))
 
     querya6 = """SELECT Category,AVG(Discount_Applied) AS Average_Discount
             FROM ECOM
             GROUP BY Category
             ORDER BY Average_Discount DESC
             LIMIT 10"""
-    resulta6 = pd.read_sql_query(querya6, conn)
-    print("\nTop 10 Categories by Average Discount Applied:")
-    print(resulta6)
+    registry.add("querya6", "Top 10 Categories by Average Discount Applied:", querya6, tags=("sales",))
 
     querya7 = """SELECT SUM(Revenue) AS Actual_Revenue,
             SUM(Revenue/(1-Discount_Applied)) AS Expected_Revenue
             FROM ECOM
             """
-    resulta7 = pd.read_sql_query(querya7, conn)
-    print("\nActual vs Expected Revenue:")
-    print(resulta7)
+    registry.add("querya7", "Actual vs Expected Revenue:", querya7, tags=("sales",))
 
     # Customer Behaviour
     queryb1 = """SELECT Customer_ID,SUM(Revenue) AS Total_Revenue
@@ -116,9 +137,7 @@ def main():
             GROUP BY Customer_ID
             ORDER BY Total_Revenue DESC
             LIMIT 10"""
-    resultb1 = pd.read_sql_query(queryb1, conn)
-    print("\nTop 10 Customers by Total Revenue:")
-    print(resultb1)
+    registry.add("queryb1", "Top 10 Customers by Total Revenue:", queryb1, tags=("customers",))
 
     queryb2 = """SELECT Customer_ID,COUNT(*) AS Total_Transactions,
             CASE WHEN COUNT(*)>1 THEN 'Repeat customer' ELSE 'One time buyer' END  AS Customer_type
@@ -126,20 +145,16 @@ def main():
             GROUP BY Customer_ID
             ORDER BY Total_Transactions DESC
            """
-    resultb2 = pd.read_sql_query(queryb2, conn)
-    print("\nCustomer Segmentation by Transaction Count:")
-    print(resultb2)
+    registry.add("queryb2", "Customer Segmentation by Transaction Count:", queryb2, tags=("customers",))
 
-    queryb3 = """SELECT Customer_ID,COUNT(DISTINCT year||"-"||month) AS Active_Months,
-            CASE WHEN COUNT(DISTINCT year||"-"||month)>1 THEN 'Retained' ELSE 'Not Retained' END  AS Retaintion_status
+    queryb3 = f"""SELECT Customer_ID,COUNT(DISTINCT {period_sql("date_key")}) AS Active_Months,
+            CASE WHEN COUNT(DISTINCT {period_sql("date_key")})>1 THEN 'Retained' ELSE 'Not Retained' END  AS Retaintion_status
             FROM ECOM
             GROUP BY Customer_ID
             HAVING Retaintion_status='Retained'
             ORDER BY Active_Months DESC
            """
-    resultb3 = pd.read_sql_query(queryb3, conn)
-    print("\nCustomer Retention Analysis:")
-    print(resultb3)
+    registry.add("queryb3", "Customer Retention Analysis:", queryb3, tags=("customers",))
 
     queryb4 = """SELECT Customer_ID,AVG(Revenue) AS Average_Revenue
             FROM ECOM
@@ -147,9 +162,7 @@ def main():
             ORDER BY Average_Revenue DESC
             LIMIT 10
            """
-    resultb4 = pd.read_sql_query(queryb4, conn)
-    print("\nTop 10 Customers by Average Revenue:")
-    print(resultb4)
+    registry.add("queryb4", "Top 10 Customers by Average Revenue:", queryb4, tags=("customers",))
 
     # Product Insight
     queryc1 = """SELECT Product_ID,AVG(Discount_Applied) AS Average_Discount
@@ -157,18 +170,14 @@ def main():
             GROUP BY Product_ID
             ORDER BY Average_Discount DESC
             LIMIT 10"""
-    resultc1 = pd.read_sql_query(queryc1, conn)
-    print("\nTop 10 Products by Average Discount Applied:")
-    print(resultc1)
+    registry.add("queryc1", "Top 10 Products by Average Discount Applied:", queryc1, tags=("products",))
 
     queryc2 = """SELECT Product_ID,ROUND(SUM(Revenue)*1.0/SUM(units_sold),2) AS Revenue_Per_Unit
             FROM ECOM
             GROUP BY Product_ID
             ORDER BY Revenue_Per_Unit DESC
             LIMIT 10"""
-    resultc2 = pd.read_sql_query(queryc2, conn)
-    print("\nTop 10 Products by Revenue Per Unit:")
-    print(resultc2)
+    registry.add("queryc2", "Top 10 Products by Revenue Per Unit:", queryc2, tags=("products",))
 
     # Regional Trends
     queryd1 = """SELECT Region,product_ID,SUM(Units_Sold) AS Total_Units
@@ -176,18 +185,14 @@ def main():
             GROUP BY Region,product_ID
             ORDER BY Region,Total_Units DESC
             """
-    resultd1 = pd.read_sql_query(queryd1, conn)
-    print("\nRegional Product Performance:")
-    print(resultd1)
+    registry.add("queryd1", "Regional Product Performance:", queryd1, tags=("regions",))
 
     queryd2 = """SELECT Region, AVG(Ad_CPC) AS Average_CPC
              FROM ECOM
              GROUP BY Region
              ORDER BY Average_CPC DESC
             """
-    resultd2 = pd.read_sql_query(queryd2, conn)
-    print("\nAverage Ad CPC by Region:")
-    print(resultd2)
+    registry.add("queryd2", "Average Ad CPC by Region:", queryd2, tags=("regions",))
 
     # Advertising & Marketing Effectiveness
     querye1 = """SELECT Category,SUM(Ad_Spend) AS AD_Spend,SUM(Revenue) AS Revenue,
@@ -197,18 +202,14 @@ def main():
             ORDER BY  Revenue_Per_Spend DESC
             LIMIT 5
             """
-    resulte1 = pd.read_sql_query(querye1, conn)
-    print("\nTop 5 Categories by Revenue Per Ad Spend:")
-    print(resulte1)
+    registry.add("querye1", "Top 5 Categories by Revenue Per Ad Spend:", querye1, tags=("advertising",))
 
     querye2 = """SELECT Region,AVG(Ad_CTR) as Avg_CTR,AVG(Conversion_Rate) AS Avg_Conversion_Rate
             FROM ECOM
             GROUP BY Region
             ORDER BY Avg_CTR DESC,Avg_Conversion_Rate DESC
             """
-    resulte2 = pd.read_sql_query(querye2, conn)
-    print("\nAverage Ad CTR and Conversion Rate by Region:")
-    print(resulte2)
+    registry.add("querye2", "Average Ad CTR and Conversion Rate by Region:", querye2, tags=("advertising",))
 
     querye3 = """WITH states AS (
             SELECT
@@ -225,9 +226,7 @@ def main():
           SELECT 
           (SUM(x * y)) / (SQRT(SUM(x * x)) * SQRT(SUM(y * y))) AS r
            FROM cal"""
-    resulte3 = pd.read_sql_query(querye3, conn)
-    print("\nCorrelation between Ad CPC and Conversion Rate:")
-    print(resulte3)
+    registry.add("querye3", "Correlation between Ad CPC and Conversion Rate:", querye3, tags=("advertising",))
 
     querye4 = """SELECT Region,SUM(Ad_Spend) AS AD_Spend,SUM(Revenue) AS Revenue,
             ROUND(SUM(Revenue)*1.0/SUM(Ad_Spend),2) AS Revenue_Per_Spend
@@ -236,9 +235,7 @@ def main():
             ORDER BY  Revenue_Per_Spend DESC
             LIMIT 5
             """
-    resulte4 = pd.read_sql_query(querye4, conn)
-    print("\nTop 5 Regions by Revenue Per Ad Spend:")
-    print(resulte4)
+    registry.add("querye4", "Top 5 Regions by Revenue Per Ad Spend:", querye4, tags=("advertising",))
 
     querye5 = """SELECT Product_ID,SUM(Ad_Spend) AS AD_Spend,SUM(Revenue) AS Revenue,
             ROUND(SUM(Revenue)*1.0/SUM(Ad_Spend),2) AS Revenue_Per_Spend
@@ -247,9 +244,7 @@ def main():
             ORDER BY  Revenue_Per_Spend DESC
             LIMIT 5
             """
-    resulte5 = pd.read_sql_query(querye5, conn)
-    print("\nTop 5 Products by Revenue Per Ad Spend:")
-    print(resulte5)
+    registry.add("querye5", "Top 5 Products by Revenue Per Ad Spend:", querye5, tags=("advertising",))
 
     # Advance Query
     queryf1 = """SELECT* 
@@ -260,9 +255,7 @@ def main():
              )  AS ranked_customers
             WHERE Customer_Rank<=5"""
 
-    resultf1 = pd.read_sql_query(queryf1, conn)
-    print("\nTop 5 Customers by Revenue in Each Region:")
-    print(resultf1)
+    registry.add("queryf1", "Top 5 Customers by Revenue in Each Region:", queryf1, tags=("advanced",))
 
     queryf2 = """SELECT* 
             FROM (
@@ -272,24 +265,21 @@ def main():
              )  AS ranked_Product
             WHERE product_Rank<=5"""
 
-    resultf2 = pd.read_sql_query(queryf2, conn)
-    print("\nTop 5 Products by Revenue in Each Category:")
-    print(resultf2)
+    registry.add("queryf2", "Top 5 Products by Revenue in Each Category:", queryf2, tags=("advanced",))
 
-    queryf3 = """SELECT Transaction_Date,
+    queryf3 = """SELECT calendar.date AS Transaction_Date,
             SUM(Revenue) AS daily_revenue,
-            SUM(SUM(Revenue)) OVER (ORDER BY Transaction_Date) AS Cumulative_Revenue
+            SUM(SUM(Revenue)) OVER (ORDER BY ECOM.date_key) AS Cumulative_Revenue
             FROM ECOM
-            GROUP BY Transaction_Date
-            ORDER BY Transaction_Date
+            LEFT JOIN calendar ON calendar.date_key = ECOM.date_key
+            GROUP BY ECOM.date_key
+            ORDER BY ECOM.date_key
             """
-    resultf3 = pd.read_sql_query(queryf3, conn)
-    print("\nDaily Revenue and Cumulative Revenue:")
-    print(resultf3)
+    registry.add("queryf3", "Daily Revenue and Cumulative Revenue:", queryf3, tags=("advanced",))
 
-    queryf4 = """WITH states AS
+    queryf4 = f"""WITH states AS
             (SELECT 
-            year,month,
+            {year_sql("date_key")} AS year,{month_sql("date_key")} AS month,
             SUM(Revenue) AS month_revenue  
             FROM ECOM
             GROUP BY year,month
@@ -312,9 +302,7 @@ def main():
            FROM final
            ORDER BY year,month          
             """
-    resultf4 = pd.read_sql_query(queryf4, conn)
-    print("\nMonthly Revenue with Percentage Change:")
-    print(resultf4)
+    registry.add("queryf4", "Monthly Revenue with Percentage Change:", queryf4, tags=("advanced",))
 
     queryf5 = """WITH states AS (
             SELECT
@@ -331,9 +319,7 @@ def main():
           SELECT 
           (SUM(x * y)) / (SQRT(SUM(x * x)) * SQRT(SUM(y * y))) AS r
            FROM cal"""
-    resultf5 = pd.read_sql_query(queryf5, conn)
-    print("\nCorrelation between Clicks and Conversion Rate:")
-    print(resultf5)
+    registry.add("queryf5", "Correlation between Clicks and Conversion Rate:", queryf5, tags=("advanced",))
 
     queryf6 = """WITH states AS (
             SELECT
@@ -350,9 +336,7 @@ def main():
           SELECT 
           (SUM(x * y)) / (SQRT(SUM(x * x)) * SQRT(SUM(y * y))) AS r
            FROM cal"""
-    resultf6 = pd.read_sql_query(queryf6, conn)
-    print("\nCorrelation between Impressions and Conversion Rate:")
-    print(resultf6)
+    registry.add("queryf6", "Correlation between Impressions and Conversion Rate:", queryf6, tags=("advanced",))
 
     queryf7 = """WITH states AS (
             SELECT
@@ -369,10 +353,54 @@ def main():
           SELECT 
           (SUM(x * y)) / (SQRT(SUM(x * x)) * SQRT(SUM(y * y))) AS r
            FROM cal"""
-    resultf7 = pd.read_sql_query(queryf7, conn)
-    print("\nCorrelation between Ad CTR and Conversion Rate:")
-    print(resultf7)
+    registry.add("queryf7", "Correlation between Ad CTR and Conversion Rate:", queryf7, tags=("advanced",))
+
+    selected = registry.select(only, tags)
+    if list_queries:
+        print(registry.listing(selected).to_string(index=False))
+        return
 
+    file_path = Path(
+        'synthetic_ecommerce_data.csv'
+    )
+    df = read_csv_cached(file_path) if loader == "columnar" else pd.read_csv(file_path)
+    # Map each distinct date once; ECOM keeps only the integer key into `calendar`.
+    df["date_key"] = date_keys(df.pop("Transaction_Date"))
+    conn = sqlite3.connect(":memory:")
+    ensure_calendar(conn, df["date_key"])
+    profiler = QueryProfiler(enabled=profile or profile_json is not None)
+    if loader in ("bulk", "columnar"):
+        profiler.record_load(bulk_load_frame(conn, "ECOM", df))
+    else:
+        profiler.record_load(frame_to_sql(conn, "ECOM", df))
+
+    if export_dir:
+        export_queries(registry, selected, conn, export_dir, export_format, compression, jobs=jobs)
+    else:
+        registry.run(selected, conn, profiler, jobs=jobs)
+
+    if profile:
+        profiler.print_report()
+    if profile_json:
+        profiler.write_jsonl(profile_json)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from sqlkit.registry import UnknownQueryError, add_arguments
+
+    parser = argparse.ArgumentParser(description="E-Commerce Sales & Marketing Analytics")
+    parser.add_argument("--loader", choices=["pandas", "bulk", "columnar"], default="pandas",
+                        help="load with DataFrame.to_sql, the sqlkit bulk loader, or through a Feather "
+                             "cache of the CSV (--profile reports rows/sec)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every query and print a report with full scans and temp b-trees flagged")
+    parser.add_argument("--profile-json", metavar="FILE",
+                        help="write the per-query profile (including plans) as JSON lines ('-' for stdout)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        main(loader=args.loader, profile=args.profile, profile_json=args.profile_json,
+             only=args.only, tags=args.tags, list_queries=args.list_queries, jobs=args.jobs,
+             export_dir=args.export_dir, export_format=args.export_format, compression=args.compression)
+    except UnknownQueryError as exc:
+        parser.error(str(exc))
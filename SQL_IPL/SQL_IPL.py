@@ -1,4 +1,14 @@
-def main():
+import sys
+from pathlib import Path
+
+# Make the shared `sqlkit` package at the repository root importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main(cache=None, indexes=True, player_ids=False, partition_seasons=False, loader="pandas",
+         incremental=False, engine="sql", check_parity=False, profile=False, profile_json=None,
+         only=None, tags=None, list_queries=False, jobs=1, export_dir=None, export_format="csv",
+         compression=None):
  """
  📊 Project: IPL SQL Analysis Project
 🧑‍💻 Author: Krishn Meena
@@ -20,164 +30,248 @@ executed via SQLite in a Python (Pandas + SQLite3) environment.
 - Python
 - Pandas
 - SQLite3
-- Google Colab"""
-
+- Google Colab
+
+⚡ Cached load:
+Pass `cache` (or `--cache ipl.db` on the command line) to build an on-disk
+SQLite database once; later runs reopen it directly and only rebuild when
+`deliveries.csv` or `matches.csv` change. With `incremental=True`
+(`--incremental`) a cache whose CSVs only gained new matches (e.g. a new
+season) is updated in place: just the new deliveries are loaded and folded
+into the rollups.
+
+🔎 Indexes:
+Covering indexes on `IPL` and `Matches` are created after load (and ANALYZE
+is run). Pass `indexes=False` (`--no-indexes`) to run without them and compare
+the query timings printed at the end.
+
+📦 Rollups:
+The batting leaderboards read from `batting_scorecard` (one row per
+match/innings/batter) and the bowling leaderboards from `bowling_scorecard`
+(per match/innings/bowler) and `matchups` (per bowler/batter); all are built
+in a single pass each at load time. Match-level trends read the
+`innings_phases` rollup (runs, wickets, balls, boundaries and extras per
+innings and powerplay/middle/death phase). Season leaderboards (e.g. the Orange
+Cap query) rank the `season_batting`/`season_bowling` rollups with a window
+function via `ipl_rollups.season_leaders`.
+A run narrowed to some queries builds only the rollups those queries read.
+
+🏁 Fastest fifties/hundreds come from `ipl_milestones`, which streams the
+deliveries once in ball order and tracks only batters still chasing a
+milestone.
+
+🔢 Player ids:
+Pass `player_ids=True` (`--player-ids`) to store players as integer ids in
+`IPL` with names in a `players` dimension; results are decoded back to names
+before printing.
+
+🗂️ Season partitions:
+Pass `partition_seasons=True` (`--partition-seasons`) to store the deliveries
+in one table per season behind an `IPL` view; finished seasons are frozen
+read-only. Season-scoped queries (e.g. the top scorers of the two latest
+seasons) go through `ipl_partitions.deliveries_source`, which reads only the
+partitions for the seasons asked for.
+
+📥 Loaders:
+`loader="chunked"` (`--loader chunked`) streams `deliveries.csv` in chunks
+with declared dtypes (small ints, categoricals) and one transaction per
+chunk, keeping peak memory near a single chunk. `loader="bulk"` skips pandas
+and loads both CSVs with `sqlkit.bulkload` (typed schema, load pragmas, one
+`executemany` transaction). `loader="columnar"` reads
+both CSVs through `sqlkit.columnar`, which writes a typed Feather copy next to
+each CSV and memory-maps it on later builds instead of re-parsing the text.
+
+🐼 Engines:
+`engine="pandas"` (`--engine pandas`) computes every leaderboard in-process
+with vectorized groupbys (`ipl_pandas`) instead of loading SQLite.
+`check_parity=True` (`--check-parity`) runs both engines, prints the SQL
+results and a per-query table of timings and whether the pandas result is
+identical (up to the order of tied rows). The pandas timing of the first
+query to need a rollup includes building it; the SQL rollups are built at
+load time.
+
+⏱️ Profiling:
+`profile=True` (`--profile`) times every SQL query and prints a report,
+slowest first, with full scans and temp B-trees flagged from
+`EXPLAIN QUERY PLAN`, below the rows/sec of the load stage;
+`--profile-json FILE` writes both as JSON lines.
+
+🗃️ Query selection:
+Every query is registered by name and tags (batting, bowling, match,
+aggressive, dismissals, partnerships) in a `sqlkit.registry.QueryRegistry`.
+`only=[...]` (`--only querya1 queryb2`) or `tags=[...]` (`--tag bowling`)
+runs just those queries, loading only the rollups they need;
+`list_queries=True` (`--list`) prints the queries without loading anything.
+
+🧵 Parallel queries:
+`jobs=N` (`--jobs N`) runs the SQL queries on N threads, each with its own
+read-only connection to the database (an in-memory database is snapshotted
+to a temporary file first, see `sqlkit.parallel`); results print in the usual
+order. The pandas engine and `--check-parity` always run serially.
+
+📤 Export:
+`export_dir=DIR` (`--export DIR`) writes each selected query's result to its
+own file in DIR instead of printing it, streamed from the SQLite cursor by
+`sqlkit.export` (`--export-format csv|jsonl|parquet`, `--compression gzip`),
+with a `manifest.json` listing the files; player ids are decoded to names on
+the way out."""
+
+ import threading
+ import time
  import pandas as pd
- import sqlite3
  from pathlib import Path
-
- file_path1 = Path("deliveries.csv")
- file_path2 = Path("matches.csv")
- df1=pd.read_csv( file_path1)
- df2=pd.read_csv( file_path2)
- conn=sqlite3.connect(':memory:')
- df1.to_sql('IPL', conn, index=False, if_exists='replace')
- df2.to_sql('Matches', conn, index=False, if_exists='replace')
+ from ipl_milestones import balls_to_milestones, fastest
+ from ipl_pandas import IPLFrames, compare_results, parity_report, run_query
+ from ipl_partitions import deliveries_source
+ from ipl_rollups import DEPENDENCIES, ROLLUPS, ensure_rollups, season_leaders_query
+ from ipl_store import create_indexes, drop_indexes, open_database, player_decoder, player_row_decoder
+ from sqlkit.bulkload import LoadStats
+ from sqlkit.export import export_queries
+ from sqlkit.instrument import QueryProfiler
+ from sqlkit.registry import QueryRegistry
+
+ # Queries name the rollups they read; only those are built (the pandas engine
+ # derives its own frames lazily).
+ registry=QueryRegistry()
+ def rollup_builder(name):
+     return lambda: conn is not None and ensure_rollups(conn, [name])
+ for rollup in ROLLUPS:
+     registry.prerequisite(rollup, rollup_builder(rollup), requires=DEPENDENCIES.get(rollup, ()))
+ recent=[]
+ def latest_seasons():
+     if conn is not None:
+         recent[:]=[season for (season,) in conn.execute("SELECT DISTINCT season FROM Matches ORDER BY season DESC LIMIT 2")]
+     else:
+         recent[:]=frames.latest_seasons(2)
+ registry.prerequisite("recent_seasons", latest_seasons)
 
  #Batsman Perdformance
  querya1='''SELECT batter,
-            SUM(batsman_runs) AS [Total Run]
-            FROM IPL
+            SUM(runs) AS [Total Run]
+            FROM batting_scorecard
             GROUP BY batter
             ORDER BY [Total Run] DESC
             LIMIT 10'''
- resulta1=pd.read_sql_query(querya1, conn)
- print("\nTop 10 Batsman by Total Runs:")
- print(resulta1)
+ registry.add("querya1", "Top 10 Batsman by Total Runs:", sql=querya1, tags=("batting",), requires=("batting_scorecard",))
 
  querya2='''SELECT batter,
-            SUM(batsman_runs) AS [Total Run],
-            COUNT(ball) AS [Total Ball],
-            ROUND((SUM(batsman_runs)*100.0)/COUNT(ball),2) AS [Strike Rate]
-            FROM IPL
+            SUM(runs) AS [Total Run],
+            SUM(deliveries) AS [Total Ball],
+            ROUND((SUM(runs)*100.0)/SUM(deliveries),2) AS [Strike Rate]
+            FROM batting_scorecard
             GROUP BY batter
-            HAVING COUNT(ball)>500
+            HAVING SUM(deliveries)>500
             ORDER BY [Strike Rate] DESC
             LIMIT 10'''
- resulta2=pd.read_sql_query(querya2, conn)
- print("\nTop 10 Batsman by Strike Rate:")
- print(resulta2)
+ registry.add("querya2", "Top 10 Batsman by Strike Rate:", sql=querya2, tags=("batting",), requires=("batting_scorecard",))
 
  querya3='''SELECT batter,
-            SUM(CASE WHEN batsman_runs = 4 THEN 1 ELSE 0 END) AS Fours,
-            SUM(CASE WHEN batsman_runs = 6 THEN 1 ELSE 0 END) AS Sixes,
-            COUNT(ball) AS [Total Boundries]
-            FROM IPL
-            WHERE batsman_runs IN (4,6)
+            SUM(fours) AS Fours,
+            SUM(sixes) AS Sixes,
+            SUM(fours+sixes) AS [Total Boundries]
+            FROM batting_scorecard
             GROUP BY batter
+            HAVING SUM(fours+sixes)>0
             ORDER BY [Total Boundries] DESC
             LIMIT 10'''
- resulta3=pd.read_sql_query(querya3, conn)
- print("\nTop 10 Batsman by Boundaries:")
- print(resulta3)
-
- querya4='''SELECT a.batter,
-            a.season,
-            a.[Total Run]
-
-            FROM
-            (SELECT IPL.batter,
-            Matches.season,
-            SUM(IPL.batsman_runs) AS [Total Run]
-            FROM IPL
-            LEFT JOIN Matches ON IPL.match_id=Matches.id
-            GROUP BY Matches.season,IPL.batter
-            ) AS a
-
-            WHERE (a.Season,a.[Total Run]) IN
-
-            (SELECT b.season,
-            MAX(b.[Total Run])
-            FROM
-            (SELECT IPL.batter,
-            Matches.season,
-            SUM(IPL.batsman_runs) AS [Total Run]
-            FROM IPL
-            LEFT JOIN Matches ON IPL.match_id=Matches.id
-            GROUP BY Matches.season,IPL.batter
-            ) AS b
-            GROUP BY b.Season
-            )
-            ORDER BY a.Season '''
- resulta4=pd.read_sql_query(querya4, conn)
- print("\nTop Batsman by Season:")
- print(resulta4)
+ registry.add("querya3", "Top 10 Batsman by Boundaries:", sql=querya3, tags=("batting",), requires=("batting_scorecard",))
+
+ querya4=season_leaders_query("runs")
+ registry.add("querya4", "Top Batsman by Season:", sql=querya4, tags=("batting",), requires=("season_rollups",))
+
+ querya5=lambda db: f'''SELECT batter,
+            SUM(batsman_runs) AS [Total Run],
+            COUNT(*) AS [Total Ball]
+            FROM {deliveries_source(db, recent)}
+            GROUP BY batter
+            ORDER BY [Total Run] DESC
+            LIMIT 10'''
+ registry.add("querya5", "Top 10 Batsman in the Two Latest Seasons:", sql=querya5, tags=("batting",), requires=("recent_seasons",))
 
  #Bowler Performance
- queryb1='''SELECT bowler,COUNT(*) AS [Total Wicket]
-            FROM IPL
-            WHERE dismissal_kind IS NOT NULL AND dismissal_kind NOT IN ('run out', 'retired hurt', 'obstructing the field', 'retired out')
+ queryb1='''SELECT bowler,SUM(wickets) AS [Total Wicket]
+            FROM bowling_scorecard
             GROUP BY bowler
+            HAVING SUM(wickets)>0
             ORDER BY [Total Wicket] DESC
             LIMIT 10'''
- resultb1=pd.read_sql_query(queryb1, conn)
- print("\nTop 10 Bowlers by Total Wickets:")
- print(resultb1)
+ registry.add("queryb1", "Top 10 Bowlers by Total Wickets:", sql=queryb1, tags=("bowling",), requires=("bowling_scorecard",))
 
  queryb2='''SELECT bowler,
-            SUM(total_runs) AS [Total Run Given],
-            COUNT(ball) AS [Total Ball],
-            ROUND((SUM(total_runs)*1.0)/(COUNT(ball)/6.0),2) AS [Economy Rate]
-            FROM IPL
-            WHERE extras_type NOT IN ("byes","legbyes","penalty")
+            SUM(runs_conceded) AS [Total Run Given],
+            SUM(balls) AS [Total Ball],
+            ROUND((SUM(runs_conceded)*1.0)/(SUM(balls)/6.0),2) AS [Economy Rate]
+            FROM bowling_scorecard
             GROUP BY bowler
-            HAVING COUNT(ball)>50
+            HAVING SUM(balls)>50
             ORDER BY [Economy Rate] ASC
             LIMIT 10'''
- resultb2=pd.read_sql_query(queryb2, conn)
- print("\nTop 10 Bowlers by Economy Rate:")
- print(resultb2)
+ registry.add("queryb2", "Top 10 Bowlers by Economy Rate:", sql=queryb2, tags=("bowling",), requires=("bowling_scorecard",))
 
- queryb3='''SELECT bowler,count(*) AS [Total Dots]
-            FROM IPL
-            WHERE total_runs=0
+ queryb3='''SELECT bowler,SUM(dots) AS [Total Dots]
+            FROM bowling_scorecard
             GROUP BY bowler
+            HAVING SUM(dots)>0
             ORDER BY [Total Dots] DESC
             LIMIT 10'''
- resultb3=pd.read_sql_query(queryb3, conn)
- print("\nTop 10 Bowlers by Total Dot Balls:")
- print(resultb3)
+ registry.add("queryb3", "Top 10 Bowlers by Total Dot Balls:", sql=queryb3, tags=("bowling",), requires=("bowling_scorecard",))
 
  #Match Level Trends
- queryc1='''SELECT IPL.match_id,
-            IPL.inning,
-            IPL.batting_team,
-            IPL.bowling_team,
-            SUM(IPL.total_runs) AS [Total Run],
+ queryc1='''SELECT p.match_id,
+            p.inning,
+            p.batting_team,
+            p.bowling_team,
+            SUM(p.runs) AS [Total Run],
             Matches.result,
             Matches.result_margin
-            FROM IPL
-            LEFT JOIN Matches ON IPL.match_id=Matches.id
-            GROUP BY IPL.match_id,
-            IPL.inning,
-            IPL.batting_team,
-            IPL.bowling_team,
+            FROM innings_phases AS p
+            LEFT JOIN Matches ON p.match_id=Matches.id
+            GROUP BY p.match_id,
+            p.inning,
+            p.batting_team,
+            p.bowling_team,
             Matches.result,
             Matches.result_margin
-            ORDER BY IPL.match_id'''
- resultc1=pd.read_sql_query(queryc1, conn)
- print("\nMatch Level Trends:")
- print(resultc1)
+            ORDER BY p.match_id'''
+ registry.add("queryc1", "Match Level Trends:", sql=queryc1, tags=("match",), requires=("innings_phases",))
 
  queryc2='''SELECT match_id,
             inning,
             batting_team,
-            SUM(total_runs) AS 'Powerplay Runs',
-            COUNT(CASE WHEN dismissal_kind IS NOT NULL THEN 1 END) AS 'Wickets lost',
-            ROUND((SUM(total_runs)*1.0)/6.0,2) AS [RUN RATE]
+            runs AS 'Powerplay Runs',
+            wickets AS 'Wickets lost',
+            ROUND((runs*1.0)/6.0,2) AS [RUN RATE]
+            FROM innings_phases
+            WHERE phase='powerplay'
+            ORDER BY match_id, inning'''
+ registry.add("queryc2", "Powerplay Runs and Wickets Lost:", sql=queryc2, tags=("match",), requires=("innings_phases",))
+
+ queryc3='''SELECT batting_team,
+            phase,
+            ROUND(AVG(runs),2) AS [Avg Runs],
+            ROUND(AVG(wickets),2) AS [Avg Wickets],
+            ROUND((SUM(runs)*6.0)/SUM(balls),2) AS [RUN RATE],
+            ROUND((SUM(boundaries)*100.0)/SUM(balls),2) AS [Boundary %]
+            FROM innings_phases
+            GROUP BY batting_team,
+            phase
+            ORDER BY batting_team,
+            CASE phase WHEN 'powerplay' THEN 1 WHEN 'middle' THEN 2 ELSE 3 END'''
+ registry.add("queryc3", "Phase-wise Scoring by Team (Powerplay / Middle / Death):", sql=queryc3, tags=("match",), requires=("innings_phases",))
 
-            FROM IPL
-            WHERE over BETWEEN 0 AND 5
+ #Aggressive Play
+ queryd1='''WITH match_sixes AS
+            (SELECT match_id,
+            batting_team,
+            batter,
+            SUM(sixes) AS sixes,
+            MAX(SUM(sixes)) OVER (PARTITION BY match_id) AS max_sixes
+            FROM batting_scorecard
             GROUP BY match_id,
-            inning,
-            batting_team
-            ORDER BY match_id'''
- resultc2=pd.read_sql_query(queryc2, conn)
- print("\nPowerplay Runs and Wickets Lost:")
- print(resultc2)
+            batter
+            HAVING SUM(sixes)>0)
 
- #Aggressive Play
- queryd1='''SELECT a.match_id,
+            SELECT a.match_id,
             a.batter,
             a.batting_team AS "Batter Team",
             m.winner AS "Winning Team",
@@ -185,91 +279,38 @@ executed via SQLite in a Python (Pandas + SQLite3) environment.
             m.season,
             m.city,
             m.player_of_match
-
-            FROM
-            (
-            SELECT match_id,
-            batting_team,
-            batter,
-            COUNT(*) AS sixes
-            FROM IPL
-            WHERE batsman_runs=6
-            GROUP BY match_id,
-            batter
-            ) AS a
-
-            JOIN
-            (SELECT b.match_id,
-            MAX(b.sixes) AS "max sixes"
-            FROM
-            (SELECT match_id,
-            batter,
-            COUNT(*) AS sixes
-            FROM IPL
-            WHERE batsman_runs=6
-            GROUP BY match_id,
-            batter) AS b
-            GROUP BY b.match_id) AS top_sixes
-            ON a.match_id = top_sixes.match_id AND a.sixes = top_sixes."max sixes"
+            FROM match_sixes AS a
             LEFT JOIN Matches m ON a.match_id = m.id
+            WHERE a.sixes = a.max_sixes
             ORDER BY a.sixes DESC
             LIMIT 10
             '''
- resultd1=pd.read_sql_query(queryd1, conn)
- print("\nTop 10 Aggressive Players by Maximum Sixes:")
- print(resultd1)
-
- queryd2='''WITH running_score AS (
-            SELECT
-            match_id,
-            batter,
-            batting_team,
-            over,
-            ball,
-            batsman_runs,
-            SUM(batsman_runs) OVER (PARTITION BY match_id, batter ORDER BY over, ball
-            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS running_total,
-            ROW_NUMBER() OVER (PARTITION BY match_id, batter ORDER BY over, ball) AS ball_number
-            FROM IPL),
-
-            FirstFifty AS (SELECT*
-            FROM
-            (SELECT *,
-            ROW_NUMBER() OVER (PARTITION BY match_id, batter ORDER BY over, ball) AS rn
-            FROM running_score
-            WHERE running_total>=50
-            )AS sub
-            WHERE rn=1)
-
-            SELECT
-            match_id,
-            batter,
-            batting_team,
-            ball_number AS balls_to_fifty
-            FROM FirstFifty
-            ORDER BY balls_to_fifty ASC
-            LIMIT 10'''
- resultd2=pd.read_sql_query(queryd2, conn)
- print("\nTop 10 Players by Balls Faced to Reach Fifty:")
- print(resultd2)
-
- queryd3='''WITH Allbatsman_TotalBoundries AS
-           (SELECT batter,COUNT(ball) AS [Total Boundries]
-            FROM IPL
-            WHERE batsman_runs IN (4,6)
-            GROUP BY batter)
-            SELECT IPL.batter,Allbatsman_TotalBoundries.[Total Boundries],COUNT(IPL.ball) AS "Total balls Played",ROUND((Allbatsman_TotalBoundries.[Total Boundries]*100.0)/(COUNT(IPL.ball)),2) AS "Percentage of Boundries"
-            FROM IPL
-            LEFT JOIN Allbatsman_TotalBoundries ON IPL.batter=Allbatsman_TotalBoundries.batter
-            WHERE IPL.batsman_runs IN (0,1,2,3,4,5,6) AND (IPL.extras_type IS NULL OR IPL.extras_type != "wides")
-            GROUP BY IPL.batter,Allbatsman_TotalBoundries.[Total Boundries]
-            HAVING COUNT(IPL.ball)>100
+ registry.add("queryd1", "Top 10 Aggressive Players by Maximum Sixes:", sql=queryd1, tags=("aggressive",), requires=("batting_scorecard",))
+
+ # Both milestone queries share one pass of the engine, even when they run in parallel.
+ milestones={}
+ milestones_lock=threading.Lock()
+ def sql_milestones(db):
+     with milestones_lock:
+         if not milestones:
+             milestones["df"]=decode(balls_to_milestones(db, (50, 100)))
+     return milestones["df"]
+
+ registry.add("queryd2", "Top 10 Players by Balls Faced to Reach Fifty:", fn=lambda db: fastest(sql_milestones(db), 50), tags=("aggressive",))
+
+ registry.add("queryd2b", "Top 10 Players by Balls Faced to Reach Hundred:", fn=lambda db: fastest(sql_milestones(db), 100), tags=("aggressive",))
+
+ queryd3='''SELECT batter,
+            SUM(fours+sixes) AS [Total Boundries],
+            SUM(balls) AS "Total balls Played",
+            ROUND((SUM(fours+sixes)*100.0)/SUM(balls),2) AS "Percentage of Boundries"
+            FROM batting_scorecard
+            GROUP BY batter
+            HAVING SUM(balls)>100
             ORDER BY "Percentage of Boundries" DESC
             LIMIT 10
             '''
- resultd3=pd.read_sql_query(queryd3, conn)
- print("\nTop 10 Players by Percentage of Boundaries:")
- print(resultd3)
+ registry.add("queryd3", "Top 10 Players by Percentage of Boundaries:", sql=queryd3, tags=("aggressive",), requires=("batting_scorecard",))
 
  #Dismissal Analysis
  querye1='''SELECT dismissal_kind,
@@ -279,9 +320,7 @@ executed via SQLite in a Python (Pandas + SQLite3) environment.
             GROUP BY dismissal_kind
             ORDER BY [Total Dismissal] DESC
             '''
- resulte1=pd.read_sql_query(querye1, conn)
- print("\nDismissal Analysis:")
- print(resulte1)
+ registry.add("querye1", "Dismissal Analysis:", sql=querye1, tags=("dismissals",))
 
  querye2='''SELECT fielder,
             SUM(CASE WHEN dismissal_kind = 'caught' THEN 1 ELSE 0 END) AS catches,
@@ -294,62 +333,161 @@ executed via SQLite in a Python (Pandas + SQLite3) environment.
             ORDER BY "Total" DESC
             LIMIT 10
             '''
- resulte2=pd.read_sql_query(querye2, conn)
- print("\nTop 10 Fielders by Dismissals:")
- print(resulte2)
+ registry.add("querye2", "Top 10 Fielders by Dismissals:", sql=querye2, tags=("dismissals",))
 
- querye3='''SELECT bowler,batter,COUNT(*) AS "Total Dismissal"
-            FROM IPL
-            WHERE dismissal_kind IS NOT NULL AND dismissal_kind NOT IN ('run out', 'retired hurt', 'obstructing the field', 'retired out')
-            GROUP BY bowler,batter
+ querye3='''SELECT bowler,batter,dismissals AS "Total Dismissal"
+            FROM matchups
+            WHERE dismissals>0
             ORDER BY "Total Dismissal" DESC
             LIMIT 10
             '''
- resulte3=pd.read_sql_query(querye3, conn)
- print("\nTop 10 Bowler-Batter Combinations by Dismissals:")
- print(resulte3)
+ registry.add("querye3", "Top 10 Bowler-Batter Combinations by Dismissals:", sql=querye3, tags=("dismissals",), requires=("matchups",))
 
  #Partnership trends
- queryf1='''SELECT IPL.match_id,
-            IPL.inning,
-            CASE WHEN IPL.batter < IPL.non_striker THEN IPL.batter ||"-"||IPL.non_striker ELSE IPL.non_striker ||"-"||IPL.batter END AS partnership_key,
-            SUM(total_runs) AS Partnership,
-            IPL.batting_team AS Batting_Team,
-            IPL.bowling_team AS Bowling_Team,
+ queryf1='''SELECT p.match_id,
+            p.inning,
+            p.player1 ||'-'|| p.player2 AS partnership_key,
+            p.runs AS Partnership,
+            p.batting_team AS Batting_Team,
+            p.bowling_team AS Bowling_Team,
             Matches.winner,
             Matches.player_of_match
-            FROM IPL
-            JOIN Matches ON IPL.match_id = Matches.id
-            GROUP BY IPL.match_id, IPL.inning, partnership_key
+            FROM partnerships AS p
+            JOIN Matches ON p.match_id = Matches.id
             ORDER BY Partnership DESC
             LIMIT 10
             '''
- resultf1=pd.read_sql_query(queryf1, conn)
- print("\nTop 10 Partnerships by Runs:")
- print(resultf1)
+ registry.add("queryf1", "Top 10 Partnerships by Runs:", sql=queryf1, tags=("partnerships",), requires=("partnerships",))
 
- queryf2='''SELECT 
-            CASE WHEN IPL.batter < IPL.non_striker THEN IPL.batter ||"-"||IPL.non_striker ELSE IPL.non_striker ||"-"||IPL.batter END AS partnership_key,
-            SUM(total_runs) AS Partnership   
-            FROM IPL
-            GROUP BY CASE WHEN IPL.batter < IPL.non_striker THEN IPL.batter ||"-"||IPL.non_striker ELSE IPL.non_striker ||"-"||IPL.batter END
+ queryf2='''SELECT
+            player1 ||'-'|| player2 AS partnership_key,
+            SUM(runs) AS Partnership
+            FROM partnerships
+            GROUP BY player1, player2
             ORDER BY Partnership DESC
             LIMIT 10
             '''
- resultf2=pd.read_sql_query(queryf2, conn)
- print("\nTop 10 Partnerships by Runs (All Matches):")
- print(resultf2)
-            
-if __name__ == "__main__":
-    main()
-      
-           
-
-
-
-
-
-
+ registry.add("queryf2", "Top 10 Partnerships by Runs (All Matches):", sql=queryf2, tags=("partnerships",), requires=("partnerships",))
 
+ selected=registry.select(only, tags)
+ if list_queries:
+     print(registry.listing(selected).to_string(index=False))
+     return
 
+ use_sql=engine=="sql" or check_parity
+ use_pandas=engine=="pandas" or check_parity
+ file_path1 = Path("deliveries.csv")
+ file_path2 = Path("matches.csv")
+ profiler=QueryProfiler(enabled=profile or profile_json is not None)
+ start=time.perf_counter()
+ conn=None
+ frames=None
+ if use_sql:
+     rollups=[name for name in registry.required(selected) if name in ROLLUPS]
+     conn=open_database(file_path1, file_path2, cache=cache, player_ids=player_ids,
+                       partition_seasons=partition_seasons, loader=loader, incremental=incremental,
+                       rollups=rollups)
+     decode=player_decoder(conn)
+     if profiler.enabled:
+         # The whole load stage: CSVs or cache, rollups included.
+         rows=conn.execute("SELECT COUNT(*) FROM IPL").fetchone()[0]
+         profiler.record_load(LoadStats("IPL", rows, time.perf_counter()-start, f"{loader} loader"))
+ if use_pandas:
+     frames=IPLFrames.from_csv(file_path1, file_path2, loader=loader)
+ loaded=time.perf_counter()
+ if conn is not None:
+     if indexes:
+         create_indexes(conn)
+     else:
+         drop_indexes(conn)
+ indexed=time.perf_counter()
+
+ parity=[]
+
+ def run(name, query, db, **params):
+     """Run one report query on the selected engine (both with check_parity)."""
+     if use_sql:
+         t=time.perf_counter()
+         if callable(query):
+             sql_result=profiler.call("query"+name, lambda: query(db))
+         else:
+             sql_result=decode(profiler.read_sql_query(query, db, name="query"+name))
+         sql_seconds=time.perf_counter()-t
+     if use_pandas:
+         t=time.perf_counter()
+         pandas_result=run_query(frames, name, **params)
+         pandas_seconds=time.perf_counter()-t
+     if check_parity:
+         parity.append((name, sql_seconds, pandas_seconds, compare_results(name, sql_result, pandas_result)))
+     return sql_result if use_sql else pandas_result
+
+ # Extra arguments of the pandas engine, filled in by the prerequisites.
+ params={"a5": {"seasons": recent}}
+
+ def execute(query, db):
+     name=query.name[len("query"):]
+     source=query.fn or query.sql
+     if query.fn is None and callable(query.sql) and use_sql:
+         source=query.sql(db)
+     return run(name, source, db, **params.get(name, {}))
+
+ if export_dir:
+     export_queries(registry, selected, conn, export_dir, export_format, compression, jobs=jobs,
+                    transform=player_row_decoder(conn))
+ else:
+     # The pandas engine and the parity check run serially, so their timings compare.
+     registry.run(selected, conn, profiler, execute=execute, jobs=jobs if engine=="sql" and not check_parity else 1)
+ finished=time.perf_counter()
+
+ if profile:
+     profiler.print_report()
+ if profile_json:
+     profiler.write_jsonl(profile_json)
+
+ if check_parity:
+     print("\nEngine parity (SQL vs pandas):")
+     print(parity_report(parity).to_string(index=False))
+
+ print("\nTimings (engine %s, indexes %s):" % (engine, "on" if indexes else "off"))
+ print(f"Load: {loaded-start:.2f}s  Index stage: {indexed-loaded:.2f}s  Queries: {finished-indexed:.2f}s")
 
+if __name__ == "__main__":
+    import argparse
+    from sqlkit.registry import UnknownQueryError, add_arguments
+
+    parser = argparse.ArgumentParser(description="IPL SQL Analysis")
+    parser.add_argument("--cache", metavar="DB",
+                        help="reuse (or build) a fingerprinted on-disk database at this path")
+    parser.add_argument("--no-indexes", dest="indexes", action="store_false",
+                        help="skip the index stage (drops the indexes from a cached database)")
+    parser.add_argument("--player-ids", action="store_true",
+                        help="dictionary-encode player names as integer ids in the IPL table")
+    parser.add_argument("--partition-seasons", action="store_true",
+                        help="store deliveries in one table per season behind an IPL view")
+    parser.add_argument("--loader", choices=["pandas", "chunked", "bulk", "columnar"], default="pandas",
+                        help="how deliveries.csv is read when the database is (re)built")
+    parser.add_argument("--incremental", action="store_true",
+                        help="with --cache, append new matches to the cached database instead of rebuilding it")
+    parser.add_argument("--engine", choices=["sql", "pandas"], default="sql",
+                        help="compute the report with SQLite queries or in-process pandas")
+    parser.add_argument("--check-parity", action="store_true",
+                        help="run both engines and report per-query timings and parity")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every query and print a report with full scans and temp b-trees flagged")
+    parser.add_argument("--profile-json", metavar="FILE",
+                        help="write the per-query profile (including plans) as JSON lines ('-' for stdout)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.incremental and not args.cache:
+        parser.error("--incremental requires --cache")
+    if args.export_dir and (args.engine != "sql" or args.check_parity):
+        parser.error("--export writes the SQL results; it cannot be combined with --engine pandas or --check-parity")
+    try:
+        main(cache=args.cache, indexes=args.indexes, player_ids=args.player_ids,
+             partition_seasons=args.partition_seasons, loader=args.loader, incremental=args.incremental,
+             engine=args.engine, check_parity=args.check_parity, profile=args.profile,
+             profile_json=args.profile_json, only=args.only, tags=args.tags,
+             list_queries=args.list_queries, jobs=args.jobs, export_dir=args.export_dir,
+             export_format=args.export_format, compression=args.compression)
+    except UnknownQueryError as exc:
+        parser.error(str(exc))
@@ -0,0 +1,69 @@
+"""
+🏁 Balls-to-milestone engine
+
+Walks the deliveries once in (match_id, inning, over, ball) order and records
+how many balls each batter took to reach every configured run threshold
+(30/50/100 by default) within one innings.  Only batters still chasing a
+threshold are tracked, and the state is reset at every new innings, so
+memory is bounded by the number of batters in one innings rather than by
+the size of `IPL`; a batter who also bats in a super over starts again.
+
+Balls are counted the same way the original window-function query counted
+them: every delivery on which the player was on strike.
+"""
+
+import pandas as pd
+
+DEFAULT_THRESHOLDS = (30, 50, 100)
+MILESTONE_NAMES = {30: "thirty", 50: "fifty", 100: "hundred"}
+
+COLUMNS = ["match_id", "inning", "batter", "batting_team", "milestone", "balls"]
+
+
+def iter_milestones(conn, thresholds=DEFAULT_THRESHOLDS):
+    """
+    Yield (match_id, inning, batter, batting_team, milestone, balls) tuples
+    as each batter crosses each threshold.
+    """
+    thresholds = sorted(set(thresholds))
+    cursor = conn.execute(
+        """SELECT match_id, inning, batter, batting_team, batsman_runs
+        FROM IPL
+        ORDER BY match_id, inning, over, ball"""
+    )
+    current_innings = None
+    active = {}
+    finished = set()
+    for match_id, inning, batter, batting_team, runs in cursor:
+        if (match_id, inning) != current_innings:
+            current_innings = (match_id, inning)
+            active.clear()
+            finished.clear()
+        if batter in finished:
+            continue
+        state = active.get(batter)
+        if state is None:
+            state = active[batter] = [0, 0, 0]  # runs, balls, next threshold index
+        state[0] += runs or 0
+        state[1] += 1
+        while state[2] < len(thresholds) and state[0] >= thresholds[state[2]]:
+            yield match_id, inning, batter, batting_team, thresholds[state[2]], state[1]
+            state[2] += 1
+        if state[2] == len(thresholds):
+            del active[batter]
+            finished.add(batter)
+
+
+def balls_to_milestones(conn, thresholds=DEFAULT_THRESHOLDS):
+    """Run the engine once and return every milestone reached as a DataFrame."""
+    return pd.DataFrame(list(iter_milestones(conn, thresholds)), columns=COLUMNS)
+
+
+def fastest(milestones, threshold, top_n=10):
+    """Top `top_n` quickest innings to `threshold` from `balls_to_milestones`."""
+    label = "balls_to_" + MILESTONE_NAMES.get(threshold, str(threshold))
+    reached = milestones[milestones["milestone"] == threshold]
+    reached = reached.sort_values(["balls", "match_id"], kind="stable").head(top_n)
+    return (reached[["match_id", "batter", "batting_team", "balls"]]
+            .rename(columns={"balls": label})
+            .reset_index(drop=True))
@@ -0,0 +1,481 @@
+"""
+🐼 In-process pandas engine for the IPL report
+
+Computes the same result tables as the SQL queries in `SQL_IPL.py`
+(`querya1`–`queryf2`, plus the milestone leaderboards) with vectorized
+groupby operations on the DataFrames read from the CSVs, without copying
+anything into SQLite.
+
+`IPLFrames` holds the two input frames and derives the pandas counterparts of
+the `ipl_rollups` tables lazily, so each one is computed once and only if a
+query needs it.  Every query function takes an `IPLFrames` and returns a
+DataFrame with the column names, row order and values the SQL engine
+produces; `QUERIES` maps the query names used in `SQL_IPL.py` to them and
+`compare_results` is the parity check used by `--check-parity`.
+
+Ordering follows SQLite's, ties included: rows of an aggregate query that
+tie on the ORDER BY columns come out by group key in the ORDER BY direction
+(so reversed under DESC), rows of a plain scan in their stored order.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from ipl_milestones import COLUMNS as MILESTONE_COLUMNS
+from ipl_milestones import fastest
+from ipl_rollups import PHASES
+
+NON_BOWLER_DISMISSALS = ("run out", "retired hurt", "obstructing the field", "retired out")
+PHASE_ORDER = [name for name, _, _ in PHASES]
+
+
+def _round(values, digits=2):
+    """SQLite's ROUND: halves go away from zero (numpy rounds them to even)."""
+    values = values.astype("float64")
+    scale = 10.0 ** digits
+    return np.sign(values) * np.floor(np.abs(values) * scale + 0.5) / scale
+
+
+def _top(df, by, ascending=False, limit=10, keys=()):
+    """
+    ORDER BY `by` LIMIT `limit`.  For aggregate queries pass the GROUP BY
+    `keys`: SQLite then orders ties by the group key in the same direction as
+    `by`; otherwise ties keep their incoming order.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    df = df.sort_values(by + list(keys), ascending=ascending, kind="stable")
+    if limit is not None:
+        df = df.head(limit)
+    return df.reset_index(drop=True)
+
+
+class IPLFrames:
+    """The deliveries and matches frames plus lazily derived rollups."""
+
+    def __init__(self, deliveries, matches):
+        self.deliveries = deliveries
+        self.matches = matches
+
+    @classmethod
+    def from_csv(cls, deliveries, matches, loader="pandas"):
+        """Read both CSVs (through the Feather cache with `loader="columnar"`)."""
+        if loader == "columnar":
+            from sqlkit.columnar import read_csv_cached as read
+        else:
+            read = pd.read_csv
+        return cls(read(deliveries), read(matches))
+
+    @cached_property
+    def batting_scorecard(self):
+        """Per (match_id, inning, batting_team, batter) runs, balls and boundaries."""
+        d = self.deliveries
+        d = d.assign(
+            legal=(d["extras_type"] != "wides"),
+            four=(d["batsman_runs"] == 4),
+            six=(d["batsman_runs"] == 6),
+        )
+        return (d.groupby(["match_id", "inning", "batting_team", "batter"])
+                .agg(runs=("batsman_runs", "sum"),
+                     balls=("legal", "sum"),
+                     deliveries=("batsman_runs", "size"),
+                     fours=("four", "sum"),
+                     sixes=("six", "sum"))
+                .reset_index())
+
+    @cached_property
+    def bowler_deliveries(self):
+        """Deliveries with the bowler-credited wicket, economy and dot flags."""
+        d = self.deliveries
+        counted = ~d["extras_type"].isin(["byes", "legbyes", "penalty"])
+        return d.assign(
+            counted=counted,
+            conceded=d["total_runs"].where(counted, 0),
+            wicket=d["dismissal_kind"].notna() & ~d["dismissal_kind"].isin(NON_BOWLER_DISMISSALS),
+            dot=(d["total_runs"] == 0),
+        )
+
+    @cached_property
+    def bowling_scorecard(self):
+        return (self.bowler_deliveries
+                .groupby(["match_id", "inning", "bowling_team", "bowler"])
+                .agg(runs_conceded=("conceded", "sum"),
+                     balls=("counted", "sum"),
+                     wickets=("wicket", "sum"),
+                     dots=("dot", "sum"))
+                .reset_index())
+
+    @cached_property
+    def matchups(self):
+        return (self.bowler_deliveries
+                .groupby(["bowler", "batter"])
+                .agg(dismissals=("wicket", "sum"))
+                .reset_index())
+
+    @cached_property
+    def innings_phases(self):
+        d = self.deliveries
+        phase = pd.Series(PHASE_ORDER[-1], index=d.index)
+        for name, first, last in PHASES:
+            phase = phase.mask(d["over"].between(first, last), name)
+        d = d.assign(
+            phase=phase,
+            legal=~d["extras_type"].isin(["wides", "noballs"]),
+            boundary=d["batsman_runs"].isin([4, 6]),
+        )
+        return (d.groupby(["match_id", "inning", "batting_team", "bowling_team", "phase"])
+                .agg(runs=("total_runs", "sum"),
+                     wickets=("dismissal_kind", "count"),
+                     balls=("legal", "sum"),
+                     boundaries=("boundary", "sum"))
+                .reset_index())
+
+    @cached_property
+    def partnerships(self):
+        d = self.deliveries
+        first = d["batter"] <= d["non_striker"]
+        d = d.assign(
+            player1=d["batter"].where(first, d["non_striker"]),
+            player2=d["non_striker"].where(first, d["batter"]),
+        )
+        return (d.groupby(["match_id", "inning", "batting_team", "bowling_team",
+                           "player1", "player2"])
+                .agg(runs=("total_runs", "sum"))
+                .reset_index())
+
+    @cached_property
+    def milestones(self):
+        return balls_to_milestones(self)
+
+    def season_of(self, df):
+        """`df` with the season of each match_id (LEFT JOIN Matches)."""
+        return df.merge(self.matches[["id", "season"]], how="left",
+                        left_on="match_id", right_on="id")
+
+    def latest_seasons(self, n):
+        return sorted(self.matches["season"].dropna().unique())[-n:]
+
+
+def top_run_scorers(f):
+    runs = f.batting_scorecard.groupby("batter")["runs"].sum().rename("Total Run").reset_index()
+    return _top(runs, "Total Run", keys=["batter"])
+
+
+def top_strike_rates(f):
+    b = f.batting_scorecard.groupby("batter")[["runs", "deliveries"]].sum().reset_index()
+    b = b[b["deliveries"] > 500]
+    out = pd.DataFrame({
+        "batter": b["batter"],
+        "Total Run": b["runs"],
+        "Total Ball": b["deliveries"],
+        "Strike Rate": _round(b["runs"] * 100.0 / b["deliveries"]),
+    })
+    return _top(out, "Strike Rate", keys=["batter"])
+
+
+def top_boundary_hitters(f):
+    b = f.batting_scorecard.groupby("batter")[["fours", "sixes"]].sum().reset_index()
+    b["Total Boundries"] = b["fours"] + b["sixes"]
+    b = b[b["Total Boundries"] > 0].rename(columns={"fours": "Fours", "sixes": "Sixes"})
+    return _top(b, "Total Boundries", keys=["batter"])
+
+
+def season_top_scorer(f):
+    """Top run scorer per season, ties included (the `season_leaders_query("runs")` result)."""
+    b = f.season_of(f.batting_scorecard)
+    season = (b.groupby(["season", "batter"], dropna=False)["runs"].sum()
+              .rename("Total Run").reset_index())
+    best = season.groupby("season", dropna=False)["Total Run"].transform("max")
+    leaders = season[season["Total Run"] == best]
+    return (leaders.sort_values("season", kind="stable", na_position="first")
+            [["batter", "season", "Total Run"]].reset_index(drop=True))
+
+
+def season_run_scorers(f, seasons):
+    d = f.deliveries
+    ids = f.matches.loc[f.matches["season"].isin(seasons), "id"]
+    d = d[d["match_id"].isin(ids)]
+    out = (d.groupby("batter")["batsman_runs"].agg(["sum", "size"]).reset_index()
+           .rename(columns={"sum": "Total Run", "size": "Total Ball"}))
+    return _top(out, "Total Run", keys=["batter"])
+
+
+def top_wicket_takers(f):
+    w = f.bowling_scorecard.groupby("bowler")["wickets"].sum().rename("Total Wicket").reset_index()
+    return _top(w[w["Total Wicket"] > 0], "Total Wicket", keys=["bowler"])
+
+
+def best_economy(f):
+    b = f.bowling_scorecard.groupby("bowler")[["runs_conceded", "balls"]].sum().reset_index()
+    b = b[b["balls"] > 50]
+    out = pd.DataFrame({
+        "bowler": b["bowler"],
+        "Total Run Given": b["runs_conceded"],
+        "Total Ball": b["balls"],
+        "Economy Rate": _round(b["runs_conceded"] * 1.0 / (b["balls"] / 6.0)),
+    })
+    return _top(out, "Economy Rate", ascending=True, keys=["bowler"])
+
+
+def most_dot_balls(f):
+    dots = f.bowling_scorecard.groupby("bowler")["dots"].sum().rename("Total Dots").reset_index()
+    return _top(dots[dots["Total Dots"] > 0], "Total Dots", keys=["bowler"])
+
+
+def innings_totals(f):
+    p = f.innings_phases
+    totals = (p.groupby(["match_id", "inning", "batting_team", "bowling_team"])["runs"].sum()
+              .rename("Total Run").reset_index())
+    totals = totals.merge(f.matches[["id", "result", "result_margin"]], how="left",
+                          left_on="match_id", right_on="id").drop(columns="id")
+    return _top(totals, "match_id", ascending=True, limit=None)
+
+
+def powerplay(f):
+    p = f.innings_phases
+    p = p[p["phase"] == "powerplay"]
+    out = pd.DataFrame({
+        "match_id": p["match_id"],
+        "inning": p["inning"],
+        "batting_team": p["batting_team"],
+        "Powerplay Runs": p["runs"],
+        "Wickets lost": p["wickets"],
+        "RUN RATE": _round(p["runs"] * 1.0 / 6.0),
+    })
+    return _top(out, ["match_id", "inning"], ascending=True, limit=None)
+
+
+def phase_scoring(f):
+    g = f.innings_phases.groupby(["batting_team", "phase"])
+    sums = g[["runs", "balls", "boundaries"]].sum()
+    out = pd.DataFrame({
+        "Avg Runs": _round(g["runs"].mean()),
+        "Avg Wickets": _round(g["wickets"].mean()),
+        "RUN RATE": _round(sums["runs"] * 6.0 / sums["balls"]),
+        "Boundary %": _round(sums["boundaries"] * 100.0 / sums["balls"]),
+    }).reset_index()
+    out["order"] = out["phase"].map(PHASE_ORDER.index)
+    out = out.sort_values(["batting_team", "order"], kind="stable").drop(columns="order")
+    return out.reset_index(drop=True)[["batting_team", "phase", "Avg Runs", "Avg Wickets",
+                                       "RUN RATE", "Boundary %"]]
+
+
+def max_sixes_in_match(f):
+    b = f.batting_scorecard
+    sixes = (b.groupby(["match_id", "batter"])
+             .agg(batting_team=("batting_team", "first"), sixes=("sixes", "sum"))
+             .reset_index())
+    sixes = sixes[sixes["sixes"] > 0]
+    sixes = sixes[sixes["sixes"] == sixes.groupby("match_id")["sixes"].transform("max")]
+    m = f.matches[["id", "winner", "season", "city", "player_of_match"]]
+    out = sixes.merge(m, how="left", left_on="match_id", right_on="id")
+    out = pd.DataFrame({
+        "match_id": out["match_id"],
+        "batter": out["batter"],
+        "Batter Team": out["batting_team"],
+        "Winning Team": out["winner"],
+        "Maximum Sixes": out["sixes"],
+        "season": out["season"],
+        "city": out["city"],
+        "player_of_match": out["player_of_match"],
+    })
+    return _top(out, "Maximum Sixes")
+
+
+def balls_to_milestones(f, thresholds=(50, 100)):
+    """
+    Vectorized `ipl_milestones.balls_to_milestones`: running runs and balls
+    per (match, innings, batter) in ball order, keeping the first ball at or
+    past each threshold.
+    """
+    d = f.deliveries.sort_values(["match_id", "inning", "over", "ball"], kind="stable")
+    keys = [d["match_id"], d["inning"], d["batter"]]
+    runs = d["batsman_runs"].fillna(0).groupby(keys).cumsum()
+    balls = d.groupby(keys).cumcount() + 1
+    found = []
+    for threshold in sorted(set(thresholds)):
+        reached = d[runs >= threshold]
+        first = ~reached.duplicated(["match_id", "inning", "batter"])
+        hit = reached[first]
+        found.append(pd.DataFrame({
+            "position": d.index.get_indexer(hit.index),
+            "match_id": hit["match_id"],
+            "inning": hit["inning"],
+            "batter": hit["batter"],
+            "batting_team": hit["batting_team"],
+            "milestone": threshold,
+            "balls": balls[hit.index],
+        }))
+    out = pd.concat(found).sort_values(["position", "milestone"], kind="stable")
+    return out[MILESTONE_COLUMNS].reset_index(drop=True)
+
+
+def boundary_percentage(f):
+    b = f.batting_scorecard.groupby("batter")[["fours", "sixes", "balls"]].sum().reset_index()
+    b = b[b["balls"] > 100]
+    boundaries = b["fours"] + b["sixes"]
+    out = pd.DataFrame({
+        "batter": b["batter"],
+        "Total Boundries": boundaries,
+        "Total balls Played": b["balls"],
+        "Percentage of Boundries": _round(boundaries * 100.0 / b["balls"]),
+    })
+    return _top(out, "Percentage of Boundries", keys=["batter"])
+
+
+def dismissal_kinds(f):
+    kinds = (f.deliveries["dismissal_kind"].dropna().value_counts(sort=False)
+             .sort_index().rename("Total Dismissal").rename_axis("dismissal_kind").reset_index())
+    return _top(kinds, "Total Dismissal", limit=None, keys=["dismissal_kind"])
+
+
+def top_fielders(f):
+    d = f.deliveries
+    d = d[d["dismissal_kind"].isin(["run out", "caught", "stumped", "caught and bowled"])
+          & d["fielder"].notna()]
+    kind = d["dismissal_kind"]
+    d = d.assign(catches=(kind == "caught"), run_outs=(kind == "run out"),
+                 stumpings=(kind == "stumped"))
+    out = (d.groupby("fielder")
+           .agg(catches=("catches", "sum"), run_outs=("run_outs", "sum"),
+                stumpings=("stumpings", "sum"), Total=("dismissal_kind", "size"))
+           .reset_index())
+    return _top(out, "Total", keys=["fielder"])
+
+
+def top_matchups(f):
+    m = f.matchups
+    m = m[m["dismissals"] > 0].rename(columns={"dismissals": "Total Dismissal"})
+    return _top(m, "Total Dismissal")
+
+
+def top_partnerships(f):
+    p = f.partnerships.merge(f.matches[["id", "winner", "player_of_match"]],
+                             left_on="match_id", right_on="id")
+    out = pd.DataFrame({
+        "match_id": p["match_id"],
+        "inning": p["inning"],
+        "partnership_key": p["player1"] + "-" + p["player2"],
+        "Partnership": p["runs"],
+        "Batting_Team": p["batting_team"],
+        "Bowling_Team": p["bowling_team"],
+        "winner": p["winner"],
+        "player_of_match": p["player_of_match"],
+    })
+    return _top(out, "Partnership")
+
+
+def top_pairs(f):
+    p = f.partnerships.groupby(["player1", "player2"])["runs"].sum().reset_index()
+    p = _top(p, "runs", keys=["player1", "player2"])
+    return pd.DataFrame({
+        "partnership_key": p["player1"] + "-" + p["player2"],
+        "Partnership": p["runs"],
+    })
+
+
+QUERIES = {
+    "a1": top_run_scorers,
+    "a2": top_strike_rates,
+    "a3": top_boundary_hitters,
+    "a4": season_top_scorer,
+    "a5": season_run_scorers,
+    "b1": top_wicket_takers,
+    "b2": best_economy,
+    "b3": most_dot_balls,
+    "c1": innings_totals,
+    "c2": powerplay,
+    "c3": phase_scoring,
+    "d1": max_sixes_in_match,
+    "d2": lambda f: fastest(f.milestones, 50),
+    "d2b": lambda f: fastest(f.milestones, 100),
+    "d3": boundary_percentage,
+    "e1": dismissal_kinds,
+    "e2": top_fielders,
+    "e3": top_matchups,
+    "f1": top_partnerships,
+    "f2": top_pairs,
+}
+
+
+def run_query(frames, name, **params):
+    """Compute query `name` (see `QUERIES`) with the pandas engine."""
+    return QUERIES[name](frames, **params)
+
+
+# The ORDER BY columns of each query's result.  Rows that tie on them may come
+# back in any order (SQLite's tie order changes with the plan, e.g. when an
+# index drives the GROUP BY), so parity only requires the same tied rows.
+ORDER_BY = {
+    "a1": ["Total Run"],
+    "a2": ["Strike Rate"],
+    "a3": ["Total Boundries"],
+    "a4": ["season"],
+    "a5": ["Total Run"],
+    "b1": ["Total Wicket"],
+    "b2": ["Economy Rate"],
+    "b3": ["Total Dots"],
+    "c1": ["match_id"],
+    "c2": ["match_id", "inning"],
+    "c3": ["batting_team", "phase"],
+    "d1": ["Maximum Sixes"],
+    "d2": ["balls_to_fifty", "match_id"],
+    "d2b": ["balls_to_hundred", "match_id"],
+    "d3": ["Percentage of Boundries"],
+    "e1": ["Total Dismissal"],
+    "e2": ["Total"],
+    "e3": ["Total Dismissal"],
+    "f1": ["Partnership"],
+    "f2": ["Partnership"],
+}
+
+# Queries cut to their top rows by LIMIT.  When a result is cut inside a run
+# of rows tied on ORDER BY, SQLite may keep any of the tied rows.
+LIMITS = {name: 10 for name in ("a1", "a2", "a3", "a5", "b1", "b2", "b3", "d1", "d3", "e2",
+                                "e3", "f1", "f2")}
+
+
+def _difference(left, right):
+    try:
+        pd.testing.assert_frame_equal(left.reset_index(drop=True), right.reset_index(drop=True),
+                                      check_dtype=False, check_column_type=False,
+                                      check_index_type=False)
+    except AssertionError as exc:
+        return str(exc).strip().splitlines()[0]
+    return None
+
+
+def compare_results(name, sql_result, pandas_result):
+    """
+    Return None when the pandas result of query `name` matches the SQL one
+    (values, column names and row order up to ties on `ORDER_BY[name]`, and
+    which tied rows made the cut when the result stops at `LIMITS[name]`;
+    integer vs float dtypes are not distinguished), otherwise a short
+    description of the first difference.
+    """
+    difference = _difference(sql_result, pandas_result)
+    if difference is None or list(sql_result.columns) != list(pandas_result.columns):
+        return difference
+    order_by = ORDER_BY.get(name, [])
+    if not order_by or _difference(sql_result[order_by], pandas_result[order_by]):
+        return difference
+    columns = order_by + [col for col in sql_result.columns if col not in order_by]
+    if len(sql_result) and len(sql_result) == LIMITS.get(name):
+        keys = sql_result[order_by].reset_index(drop=True)
+        cut = (keys == keys.iloc[-1]).all(axis=1).to_numpy()
+        sql_result = sql_result[~cut]
+        pandas_result = pandas_result[~cut]
+    return _difference(sql_result.sort_values(columns, kind="stable"),
+                       pandas_result.sort_values(columns, kind="stable"))
+
+
+def parity_report(rows):
+    """
+    Tabulate (query, sql seconds, pandas seconds, difference) rows collected
+    while running both engines.
+    """
+    report = pd.DataFrame(rows, columns=["query", "sql_s", "pandas_s", "difference"])
+    report["faster"] = np.where(report["pandas_s"] < report["sql_s"], "pandas", "sql")
+    report["parity"] = np.where(report["difference"].isna(), "ok", "MISMATCH")
+    return report[["query", "sql_s", "pandas_s", "faster", "parity", "difference"]].round(4)
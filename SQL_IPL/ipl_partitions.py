@@ -0,0 +1,185 @@
+"""
+🗂️ Season partitions for the IPL deliveries
+
+With partitioning enabled the deliveries are stored in one table per season
+(`IPL_2008`, `IPL_2007_08`, …) instead of a single `IPL` table, and `IPL`
+becomes a UNION ALL view over the partitions so every existing query keeps
+working unchanged.  The `ipl_partitions` catalog maps each season to its
+table.
+
+`deliveries_source` is the pruning helper: given the seasons a query is about
+it returns a FROM-clause source that reads only those partitions (or, on an
+unpartitioned database, the equivalent season filter through `Matches`).
+
+Partitions of finished seasons can be frozen: triggers make them reject
+INSERT, UPDATE and DELETE, so only the current season stays writable.
+"""
+
+import re
+
+CATALOG_TABLE = "ipl_partitions"
+PARTITION_PREFIX = "IPL_"
+
+
+def partition_name(season):
+    """Table name of the partition holding `season` (None for unknown matches)."""
+    if season is None:
+        return PARTITION_PREFIX + "unknown"
+    return PARTITION_PREFIX + re.sub(r"\W", "_", str(season))
+
+
+def _quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def is_partitioned(conn):
+    """True when the deliveries are stored per season behind the `IPL` view."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CATALOG_TABLE,)
+    ).fetchone() is not None
+
+
+def partitions(conn, seasons=None):
+    """
+    Return [(season, table)] in season order, restricted to `seasons` when
+    given.  Seasons without a partition are simply skipped.
+    """
+    rows = conn.execute(
+        f"SELECT season, table_name FROM {CATALOG_TABLE} ORDER BY season"
+    ).fetchall()
+    if seasons is None:
+        return rows
+    wanted = {_season_key(season) for season in seasons}
+    return [(season, table) for season, table in rows if season in wanted]
+
+
+def _season_key(season):
+    """Catalog key of `season`: seasons are stored as text, whatever type `Matches` gives them."""
+    return None if season is None else str(season)
+
+
+def _create_view(conn, schema):
+    tables = [table for _, table in partitions(conn)]
+    conn.execute("DROP VIEW IF EXISTS IPL")
+    if tables:
+        select = " UNION ALL ".join(f"SELECT * FROM {table}" for table in tables)
+    else:
+        # No deliveries yet: an empty view with the deliveries' columns.
+        select = "SELECT " + ", ".join(f"NULL AS [{name}]" for name, _ in schema) + " WHERE 0"
+    conn.execute("CREATE VIEW IPL AS " + select)
+
+
+def _create_partition(conn, season, schema):
+    table = partition_name(season)
+    conn.execute(f"CREATE TABLE {table} ({schema})")
+    conn.execute(f"INSERT INTO {CATALOG_TABLE} (season, table_name) VALUES (?, ?)",
+                 (_season_key(season), table))
+    return table
+
+
+def _route(conn, source, schema):
+    """Copy the rows of `source` into their season partitions, creating any missing."""
+    known = dict(partitions(conn))
+    columns = ", ".join(f"[{name}]" for name, _ in schema)
+    schema_sql = ", ".join(f"[{name}] {col_type}".rstrip() for name, col_type in schema)
+    seasons = conn.execute(
+        f"""SELECT DISTINCT Matches.season
+        FROM (SELECT DISTINCT match_id FROM {source}) AS s
+        LEFT JOIN Matches ON s.match_id = Matches.id"""
+    ).fetchall()
+    for (season,) in seasons:
+        table = known.get(_season_key(season)) or _create_partition(conn, season, schema_sql)
+        where = (
+            "match_id NOT IN (SELECT id FROM Matches)" if season is None
+            else f"match_id IN (SELECT id FROM Matches WHERE season = {_quote(season)})"
+        )
+        conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {source} WHERE {where}")
+
+
+def partition_deliveries(conn):
+    """
+    Split the `IPL` table into per-season partitions and replace it with a
+    UNION ALL view over them.  Every season but the latest is frozen.
+    """
+    schema = [(row[1], row[2]) for row in conn.execute("PRAGMA table_info(IPL)")]
+    conn.execute(f"DROP TABLE IF EXISTS {CATALOG_TABLE}")
+    conn.execute(
+        f"""CREATE TABLE {CATALOG_TABLE} (
+            season TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL UNIQUE,
+            frozen INTEGER NOT NULL DEFAULT 0)"""
+    )
+    conn.execute("ALTER TABLE IPL RENAME TO _ipl_unpartitioned")
+    _route(conn, "_ipl_unpartitioned", schema)
+    conn.execute("DROP TABLE _ipl_unpartitioned")
+    _create_view(conn, schema)
+    freeze_partitions(conn)
+    conn.commit()
+
+
+def append_to_partitions(conn, source):
+    """
+    Route newly loaded deliveries in table `source` to their partitions and
+    refresh the `IPL` view.  A season that was the latest until now is frozen
+    once a newer one arrives.  Does not commit.
+    """
+    schema = [(row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({source})")]
+    _route(conn, source, schema)
+    _create_view(conn, schema)
+    freeze_partitions(conn)
+
+
+def frozen_seasons(conn):
+    """Seasons whose partitions are read-only."""
+    return {season for (season,) in conn.execute(
+        f"SELECT season FROM {CATALOG_TABLE} WHERE frozen"
+    )}
+
+
+def freeze_partitions(conn, seasons=None):
+    """
+    Make the partitions of `seasons` read-only (default: every season except
+    the most recent one).  Does not commit.
+    """
+    rows = partitions(conn, seasons)
+    if seasons is None:
+        rows = rows[:-1]
+    for season, table in rows:
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS {table}_frozen_{op.lower()}
+                BEFORE {op} ON {table}
+                BEGIN SELECT RAISE(ABORT, {_quote(f'season {season} is frozen')}); END"""
+            )
+        conn.execute(f"UPDATE {CATALOG_TABLE} SET frozen = 1 WHERE season = ?", (season,))
+
+
+def thaw_partitions(conn, seasons):
+    """Make frozen partitions writable again.  Does not commit."""
+    for season, table in partitions(conn, seasons):
+        for op in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {table}_frozen_{op}")
+        conn.execute(f"UPDATE {CATALOG_TABLE} SET frozen = 0 WHERE season = ?", (season,))
+
+
+def deliveries_source(conn, seasons=None):
+    """
+    FROM-clause source for the deliveries of `seasons` (all when None).
+
+    On a partitioned database only the matching partitions are read; on an
+    unpartitioned one the same rows are selected through `Matches.season`.
+    """
+    if seasons is None:
+        return "IPL"
+    if not is_partitioned(conn):
+        season_list = ", ".join(_quote(season) for season in seasons)
+        return (
+            "(SELECT * FROM IPL WHERE match_id IN "
+            f"(SELECT id FROM Matches WHERE season IN ({season_list})))"
+        )
+    tables = [table for _, table in partitions(conn, seasons)]
+    if not tables:
+        return "(SELECT * FROM IPL WHERE 0)"
+    if len(tables) == 1:
+        return tables[0]
+    return "(" + " UNION ALL ".join(f"SELECT * FROM {table}" for table in tables) + ")"
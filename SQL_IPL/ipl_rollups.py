@@ -0,0 +1,370 @@
+"""
+📦 IPL rollup tables
+
+Small, materialized summaries of the ball-by-ball `IPL` table.  Each one is
+built with a single aggregate pass at load time so the report queries in
+`SQL_IPL.py` read a few thousand scorecard rows instead of rescanning every
+delivery.  A run limited to some queries builds only the rollups they read;
+`ensure_rollups` adds any others later, when a query first needs them.
+
+- `batting_scorecard` — one row per (match_id, inning, batter):
+  runs, balls (excluding wides), deliveries (every ball on strike, the
+  denominator the original strike-rate query used), fours, sixes and the
+  dismissal kind (NULL when not out).
+- `bowling_scorecard` — one row per (match_id, inning, bowler):
+  deliveries, runs conceded and balls over deliveries that are not
+  byes/leg-byes/penalties (the economy-rate basis), bowler-credited wickets
+  and dot balls.
+- `matchups` — one row per (bowler, batter) across all matches:
+  deliveries, runs scored by the batter and bowler-credited dismissals.
+- `season_batting` / `season_bowling` — the scorecards rolled up to one row
+  per (season, batter) and (season, bowler).  `season_leaders` ranks them
+  with a window function to return the top-N per season for runs, wickets
+  or strike rate.
+- `partnerships` — one row per (match_id, inning, player1, player2) where
+  the pair is ordered (player1 < player2), so both batters share one key.
+- `innings_phases` — one row per (match_id, inning, batting_team,
+  bowling_team, phase) for the powerplay, middle and death overs: runs,
+  wickets, legal balls, boundaries and extras.  Innings totals are the sum
+  of the three rows.
+
+Player columns carry no declared type: they hold names, or integer ids when
+the deliveries were loaded with dictionary-encoded players (see
+`ipl_store.encode_players`), and must keep whichever they were given.
+"""
+
+import pandas as pd
+
+# Dismissals that are not credited to the bowler.
+NON_BOWLER_DISMISSALS = "('run out', 'retired hurt', 'obstructing the field', 'retired out')"
+
+# (phase, first over, last over) with overs numbered from 0 as in deliveries.csv.
+PHASES = (("powerplay", 0, 5), ("middle", 6, 14), ("death", 15, 19))
+
+
+# Each rollup is a CREATE statement plus the statements that fold a source of
+# deliveries into it.  The source is `IPL` for a full build, or a table holding
+# only the deliveries of newly appended matches for an incremental update, so
+# every statement must be correct when applied to a delta.  Per-match tables
+# simply gain rows for the new matches; career tables add to existing rows.
+# Statements run one at a time through `conn.execute` (never `executescript`,
+# which commits) so callers can wrap a whole update in one transaction.
+
+BATTING_SCORECARD = (
+    """CREATE TABLE batting_scorecard (
+        match_id INTEGER,
+        inning INTEGER,
+        batting_team TEXT,
+        batter,
+        runs INTEGER,
+        balls INTEGER,
+        deliveries INTEGER,
+        fours INTEGER,
+        sixes INTEGER,
+        dismissal TEXT,
+        PRIMARY KEY (match_id, inning, batter)
+    )""",
+    """INSERT INTO batting_scorecard
+    SELECT match_id,
+           inning,
+           batting_team,
+           batter,
+           SUM(batsman_runs),
+           SUM(CASE WHEN extras_type IS NULL OR extras_type != 'wides' THEN 1 ELSE 0 END),
+           COUNT(*),
+           SUM(CASE WHEN batsman_runs = 4 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN batsman_runs = 6 THEN 1 ELSE 0 END),
+           MAX(CASE WHEN player_dismissed = batter THEN dismissal_kind END)
+    FROM {source}
+    GROUP BY match_id, inning, batting_team, batter""",
+    # Non-strikers run out (possibly without facing a ball).
+    """INSERT INTO batting_scorecard
+           (match_id, inning, batting_team, batter, runs, balls, deliveries, fours, sixes, dismissal)
+    SELECT match_id, inning, batting_team, player_dismissed, 0, 0, 0, 0, 0, dismissal_kind
+    FROM {source}
+    WHERE player_dismissed IS NOT NULL AND player_dismissed != batter
+    ON CONFLICT (match_id, inning, batter) DO UPDATE SET dismissal = excluded.dismissal""",
+)
+
+BOWLING_SCORECARD = (
+    """CREATE TABLE bowling_scorecard (
+        match_id INTEGER,
+        inning INTEGER,
+        bowling_team TEXT,
+        bowler,
+        deliveries INTEGER,
+        runs_conceded INTEGER,
+        balls INTEGER,
+        wickets INTEGER,
+        dots INTEGER,
+        PRIMARY KEY (match_id, inning, bowler)
+    )""",
+    f"""INSERT INTO bowling_scorecard
+    SELECT match_id,
+           inning,
+           bowling_team,
+           bowler,
+           COUNT(*),
+           SUM(CASE WHEN extras_type IS NULL OR extras_type NOT IN ('byes', 'legbyes', 'penalty')
+                    THEN total_runs ELSE 0 END),
+           SUM(CASE WHEN extras_type IS NULL OR extras_type NOT IN ('byes', 'legbyes', 'penalty')
+                    THEN 1 ELSE 0 END),
+           SUM(CASE WHEN dismissal_kind IS NOT NULL AND dismissal_kind NOT IN {NON_BOWLER_DISMISSALS}
+                    THEN 1 ELSE 0 END),
+           SUM(CASE WHEN total_runs = 0 THEN 1 ELSE 0 END)
+    FROM {{source}}
+    GROUP BY match_id, inning, bowling_team, bowler""",
+)
+
+MATCHUPS = (
+    """CREATE TABLE matchups (
+        bowler,
+        batter,
+        deliveries INTEGER,
+        runs INTEGER,
+        dismissals INTEGER,
+        PRIMARY KEY (bowler, batter)
+    )""",
+    f"""INSERT INTO matchups
+    SELECT bowler,
+           batter,
+           COUNT(*),
+           SUM(batsman_runs),
+           SUM(CASE WHEN dismissal_kind IS NOT NULL AND dismissal_kind NOT IN {NON_BOWLER_DISMISSALS}
+                    THEN 1 ELSE 0 END)
+    FROM {{source}}
+    WHERE true
+    GROUP BY bowler, batter
+    ON CONFLICT (bowler, batter) DO UPDATE SET
+        deliveries = deliveries + excluded.deliveries,
+        runs = runs + excluded.runs,
+        dismissals = dismissals + excluded.dismissals""",
+)
+
+PARTNERSHIPS = (
+    """CREATE TABLE partnerships (
+        match_id INTEGER,
+        inning INTEGER,
+        batting_team TEXT,
+        bowling_team TEXT,
+        player1,
+        player2,
+        runs INTEGER,
+        PRIMARY KEY (match_id, inning, player1, player2)
+    )""",
+    """INSERT INTO partnerships
+    SELECT match_id,
+           inning,
+           batting_team,
+           bowling_team,
+           MIN(batter, non_striker) AS player1,
+           MAX(batter, non_striker) AS player2,
+           SUM(total_runs)
+    FROM {source}
+    GROUP BY match_id, inning, batting_team, bowling_team, player1, player2""",
+)
+
+INNINGS_PHASES = (
+    """CREATE TABLE innings_phases (
+        match_id INTEGER,
+        inning INTEGER,
+        batting_team TEXT,
+        bowling_team TEXT,
+        phase TEXT,
+        runs INTEGER,
+        wickets INTEGER,
+        balls INTEGER,
+        boundaries INTEGER,
+        extras INTEGER,
+        PRIMARY KEY (match_id, inning, batting_team, bowling_team, phase)
+    )""",
+    """INSERT INTO innings_phases
+    SELECT match_id,
+           inning,
+           batting_team,
+           bowling_team,
+           CASE {phase} ELSE 'death' END AS phase,
+           SUM(total_runs),
+           COUNT(dismissal_kind),
+           SUM(CASE WHEN extras_type IS NULL OR extras_type NOT IN ('wides', 'noballs')
+                    THEN 1 ELSE 0 END),
+           SUM(CASE WHEN batsman_runs IN (4, 6) THEN 1 ELSE 0 END),
+           SUM(extra_runs)
+    FROM {{source}}
+    GROUP BY match_id, inning, batting_team, bowling_team, phase""".format(
+        phase=" ".join(
+            f"WHEN over BETWEEN {first} AND {last} THEN '{name}'" for name, first, last in PHASES
+        )
+    ),
+)
+
+# The season rollups are derived from the scorecards rather than from the
+# deliveries, so a delta recomputes just the seasons its matches belong to
+# (`{scope}` below; every season for a full build).
+SEASON_ROLLUPS = (
+    """CREATE TABLE season_batting (
+        season TEXT,
+        batter,
+        runs INTEGER,
+        balls INTEGER,
+        deliveries INTEGER,
+        PRIMARY KEY (season, batter)
+    )""",
+    """CREATE TABLE season_bowling (
+        season TEXT,
+        bowler,
+        wickets INTEGER,
+        runs_conceded INTEGER,
+        balls INTEGER,
+        PRIMARY KEY (season, bowler)
+    )""",
+    "DELETE FROM season_batting WHERE {scope}",
+    "DELETE FROM season_bowling WHERE {scope}",
+    """INSERT INTO season_batting
+    SELECT Matches.season,
+           b.batter,
+           SUM(b.runs),
+           SUM(b.balls),
+           SUM(b.deliveries)
+    FROM batting_scorecard AS b
+    LEFT JOIN Matches ON b.match_id = Matches.id
+    WHERE {scope}
+    GROUP BY Matches.season, b.batter""",
+    """INSERT INTO season_bowling
+    SELECT Matches.season,
+           b.bowler,
+           SUM(b.wickets),
+           SUM(b.runs_conceded),
+           SUM(b.balls)
+    FROM bowling_scorecard AS b
+    LEFT JOIN Matches ON b.match_id = Matches.id
+    WHERE {scope}
+    GROUP BY Matches.season, b.bowler""",
+)
+
+# Build order matters: the season rollups read the scorecards.
+ROLLUPS = {
+    "batting_scorecard": BATTING_SCORECARD,
+    "bowling_scorecard": BOWLING_SCORECARD,
+    "matchups": MATCHUPS,
+    "partnerships": PARTNERSHIPS,
+    "innings_phases": INNINGS_PHASES,
+    "season_rollups": SEASON_ROLLUPS,
+}
+
+
+def _statements(spec):
+    """Split a rollup spec into (CREATE statements, fold statements)."""
+    creates = [sql for sql in spec if sql.lstrip().upper().startswith("CREATE")]
+    folds = [sql for sql in spec if sql not in creates]
+    return creates, folds
+
+
+def create_rollup(conn, name):
+    """(Re)create the empty tables of rollup `name`."""
+    creates, _ = _statements(ROLLUPS[name])
+    for sql in creates:
+        table = sql.split()[2]
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(sql)
+
+
+def fold_into_rollup(conn, name, source="IPL"):
+    """Fold the deliveries in `source` into the existing tables of rollup `name`."""
+    if source == "IPL":
+        scope = "1"
+    else:
+        scope = f"season IN (SELECT season FROM Matches WHERE id IN (SELECT match_id FROM {source}))"
+    _, folds = _statements(ROLLUPS[name])
+    for sql in folds:
+        conn.execute(sql.format(source=source, scope=scope))
+
+
+# Rollups built from other rollups rather than from the deliveries.
+DEPENDENCIES = {"season_rollups": ("batting_scorecard", "bowling_scorecard")}
+
+
+def _with_dependencies(names):
+    """`names` plus the rollups they read, in build order."""
+    wanted = set(names)
+    for name in names:
+        wanted.update(DEPENDENCIES.get(name, ()))
+    return [name for name in ROLLUPS if name in wanted]
+
+
+def existing_rollups(conn):
+    """Names of the rollups whose tables are all present."""
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [
+        name for name, spec in ROLLUPS.items()
+        if all(sql.split()[2] in tables for sql in _statements(spec)[0])
+    ]
+
+
+def build_rollups(conn, names=None):
+    """Build the rollups in `names` (default: all) from scratch; called once per load."""
+    for name in _with_dependencies(ROLLUPS if names is None else names):
+        create_rollup(conn, name)
+        fold_into_rollup(conn, name)
+    conn.commit()
+
+
+def ensure_rollups(conn, names):
+    """
+    Build whichever of the rollups in `names` (and the rollups they read) do
+    not exist yet, e.g. on a database loaded for a narrower set of queries.
+    Returns the names built.
+    """
+    existing = existing_rollups(conn)
+    missing = [name for name in _with_dependencies(names) if name not in existing]
+    if missing:
+        build_rollups(conn, missing)
+    return missing
+
+
+def update_rollups(conn, source):
+    """
+    Fold the deliveries of newly appended matches (held in table `source`)
+    into every rollup the database has.  Does not commit, so it can share the
+    caller's transaction.
+    """
+    for name in existing_rollups(conn):
+        fold_into_rollup(conn, name, source)
+
+
+# metric -> (rollup table, player column, value expression, qualifying
+# expression compared against min_balls, output column label)
+SEASON_METRICS = {
+    "runs": ("season_batting", "batter", "runs", None, "Total Run"),
+    "wickets": ("season_bowling", "bowler", "wickets", None, "Total Wicket"),
+    "strike_rate": ("season_batting", "batter",
+                    "ROUND(runs*100.0/deliveries,2)", "deliveries", "Strike Rate"),
+}
+
+
+def season_leaders_query(metric="runs", top_n=1, min_balls=100):
+    """
+    SQL for the top `top_n` players per season by `metric`.
+
+    Ties share a rank (RANK()), so a season can return more than `top_n`
+    rows.  `min_balls` only applies to rate metrics.
+    """
+    if metric not in SEASON_METRICS:
+        raise ValueError(f"unknown metric {metric!r}; choose from {sorted(SEASON_METRICS)}")
+    table, player, value, qualifier, label = SEASON_METRICS[metric]
+    where = f"WHERE {qualifier} >= {int(min_balls)}" if qualifier else ""
+    return f"""SELECT {player}, season, [{label}]
+            FROM
+            (SELECT {player},
+            season,
+            {value} AS [{label}],
+            RANK() OVER (PARTITION BY season ORDER BY {value} DESC) AS season_rank
+            FROM {table}
+            {where}) AS ranked
+            WHERE season_rank <= {int(top_n)}
+            ORDER BY season, season_rank"""
+
+
+def season_leaders(conn, metric="runs", top_n=1, min_balls=100):
+    """Return the per-season leaderboard for `metric` as a DataFrame."""
+    return pd.read_sql_query(season_leaders_query(metric, top_n, min_balls), conn)
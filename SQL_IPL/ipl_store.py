@@ -0,0 +1,562 @@
+"""
+🗄️ IPL database loader
+
+Builds the SQLite database used by `SQL_IPL.py` from `deliveries.csv` and
+`matches.csv`.
+
+By default everything is loaded into a fresh in-memory database, exactly like
+the original script.  When a cache path is given the database is built on disk
+once and stamped with a fingerprint of the source CSVs (size, mtime and a
+SHA-256 of the content).  Later runs open the cached file directly and only
+rebuild it when one of the inputs has changed.
+
+The rollup tables from `ipl_rollups` are built right after the raw tables, so
+a cached database carries them too.  `rollups` narrows that to the rollups a
+run needs; the others are added to the database when first asked for.
+
+With `player_ids=True` the player name columns of `IPL` are moved into a
+`players` dimension and replaced by integer ids; `player_decoder` maps ids in
+query results back to names.
+
+With `partition_seasons=True` the deliveries are split into one table per
+season behind an `IPL` view (see `ipl_partitions`), so season-scoped queries
+can read just the partitions they need.
+
+With `incremental=True` a cache whose CSVs only gained new matches (a new
+season, say) is brought up to date by `append_new_matches`, which loads just
+the new deliveries and folds them into the rollups, instead of being rebuilt.
+
+After loading, `create_indexes` adds the covering indexes used by the report
+queries and refreshes the planner statistics with `ANALYZE`.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from ipl_partitions import (
+    append_to_partitions,
+    frozen_seasons,
+    is_partitioned,
+    partition_deliveries,
+    partitions,
+)
+from ipl_rollups import build_rollups, update_rollups
+from sqlkit.bulkload import append_frame, bulk_load_csv, csv_to_sql
+from sqlkit.columnar import columnar_load
+
+# Bump whenever the layout of the cached database changes so stale caches
+# written by an older version of this module are rebuilt automatically.
+CACHE_VERSION = 8
+
+FINGERPRINT_TABLE = "_fingerprint"
+OPTIONS_TABLE = "_build_options"
+
+# Columns of `IPL` that hold player names (and ids once encoded).
+PLAYER_COLUMNS = ("batter", "non_striker", "bowler", "fielder", "player_dismissed")
+
+# Declared dtypes for the chunked loader: small ints for the ball/run counters,
+# categoricals for the low-cardinality team and dismissal columns.  The second
+# element is the column type used for the `IPL` table.
+DELIVERY_COLUMNS = {
+    "match_id": ("int64", "INTEGER"),
+    "inning": ("int8", "INTEGER"),
+    "batting_team": ("category", "TEXT"),
+    "bowling_team": ("category", "TEXT"),
+    "over": ("int8", "INTEGER"),
+    "ball": ("int8", "INTEGER"),
+    "batter": ("object", "TEXT"),
+    "bowler": ("object", "TEXT"),
+    "non_striker": ("object", "TEXT"),
+    "batsman_runs": ("int8", "INTEGER"),
+    "extra_runs": ("int8", "INTEGER"),
+    "total_runs": ("int8", "INTEGER"),
+    "extras_type": ("category", "TEXT"),
+    "is_wicket": ("int8", "INTEGER"),
+    "player_dismissed": ("object", "TEXT"),
+    "dismissal_kind": ("category", "TEXT"),
+    "fielder": ("object", "TEXT"),
+}
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Covering indexes for the report queries: the join key on both tables, the
+# per-batter / per-bowler leaderboards, the dismissal breakdowns and the
+# ball-order scan of the milestone engine.
+INDEXES = {
+    "idx_ipl_match_id": "IPL (match_id)",
+    "idx_ipl_batter": "IPL (batter, batsman_runs, ball, extras_type)",
+    "idx_ipl_bowler": "IPL (bowler, total_runs, ball, extras_type, dismissal_kind)",
+    "idx_ipl_ball_order": "IPL (match_id, inning, over, ball, batter, batting_team, batsman_runs)",
+    "idx_ipl_dismissal": "IPL (dismissal_kind, bowler, batter, fielder)",
+    "idx_matches_id": "Matches (id)",
+}
+
+
+def file_fingerprint(path, with_hash=True):
+    """Return (size, mtime_ns, sha256) for a source file."""
+    stat = os.stat(path)
+    digest = None
+    if with_hash:
+        sha = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                sha.update(block)
+        digest = sha.hexdigest()
+    return stat.st_size, stat.st_mtime_ns, digest
+
+
+def load_deliveries_chunked(conn, deliveries, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream `deliveries.csv` into `IPL` one chunk at a time.
+
+    The table is created up front from `DELIVERY_COLUMNS` so every chunk
+    lands in the same schema, and each chunk is inserted in its own
+    transaction.  Peak memory stays around a single chunk instead of the whole
+    file plus SQLite's copy of it.
+    """
+    columns = pd.read_csv(deliveries, nrows=0).columns
+    dtypes = {col: DELIVERY_COLUMNS[col][0] for col in columns if col in DELIVERY_COLUMNS}
+    schema = ", ".join(
+        f"[{col}] {DELIVERY_COLUMNS[col][1] if col in DELIVERY_COLUMNS else ''}".rstrip()
+        for col in columns
+    )
+    conn.execute("DROP TABLE IF EXISTS IPL")
+    conn.execute(f"CREATE TABLE IPL ({schema})")
+    conn.commit()
+    for chunk in pd.read_csv(deliveries, dtype=dtypes, chunksize=chunksize):
+        with conn:
+            chunk.to_sql("IPL", conn, index=False, if_exists="append")
+
+
+def load_tables(conn, deliveries, matches, loader="pandas", chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Parse both CSVs and load them as the `IPL` and `Matches` tables.
+
+    `loader="pandas"` reads each file whole, as the original script did;
+    `loader="chunked"` streams the deliveries via `load_deliveries_chunked`;
+    `loader="bulk"` bypasses pandas and feeds both files to `executemany`
+    through `sqlkit.bulkload`; `loader="columnar"` reads both through the
+    Feather cache of `sqlkit.columnar` (deliveries with the declared dtypes).
+    """
+    if loader == "columnar":
+        dtypes = {col: dtype for col, (dtype, _) in DELIVERY_COLUMNS.items()}
+        columnar_load(conn, "IPL", deliveries, dtype=dtypes)
+        columnar_load(conn, "Matches", matches)
+        return
+    if loader == "bulk":
+        schema = {col: sql_type for col, (_, sql_type) in DELIVERY_COLUMNS.items()}
+        bulk_load_csv(conn, "IPL", deliveries, schema=schema)
+        bulk_load_csv(conn, "Matches", matches)
+        return
+    if loader == "chunked":
+        load_deliveries_chunked(conn, deliveries, chunksize)
+    elif loader == "pandas":
+        csv_to_sql(conn, "IPL", deliveries)
+    else:
+        raise ValueError(f"unknown loader {loader!r}")
+    csv_to_sql(conn, "Matches", matches)
+
+
+def _add_players(conn, table):
+    """Give every player name in `table` that is not in `players` yet an id."""
+    union = " UNION ".join(f"SELECT {col} AS name FROM {table}" for col in PLAYER_COLUMNS)
+    conn.execute(
+        f"""INSERT OR IGNORE INTO players (name)
+        SELECT name FROM ({union}) WHERE name IS NOT NULL ORDER BY name"""
+    )
+
+
+def _encode_table(conn, table):
+    """Rebuild `table` with player ids in place of the player names."""
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    select = ", ".join(
+        f"(SELECT id FROM players WHERE name = {table}.[{col}]) AS [{col}]"
+        if col in PLAYER_COLUMNS else f"[{col}]"
+        for col in columns
+    )
+    conn.execute(f"CREATE TABLE {table}_encoded AS SELECT {select} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_encoded RENAME TO {table}")
+
+
+def encode_players(conn):
+    """
+    Dictionary-encode the player columns of `IPL`.
+
+    Every distinct name goes into `players(id, name)`; ids are handed out in
+    name order so MIN/MAX over ids orders a pair exactly like the names did.
+    `IPL` is then rebuilt with the ids in place of the names.  Players first
+    seen in an incremental append get the next free ids instead, so only a
+    full rebuild restores the strict name order.
+    """
+    conn.execute("DROP TABLE IF EXISTS players")
+    conn.execute("CREATE TABLE players (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+    _add_players(conn, "IPL")
+    _encode_table(conn, "IPL")
+    conn.commit()
+
+
+def player_decoder(conn):
+    """
+    Return a function that maps player ids in a result DataFrame back to
+    names.  When the database is not encoded the function returns its input
+    unchanged.
+    """
+    has_players = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'"
+    ).fetchone()
+    if not has_players:
+        return lambda df: df
+    names = dict(conn.execute("SELECT id, name FROM players"))
+
+    def decode_key(key):
+        return "-".join(names.get(int(part), part) for part in str(key).split("-"))
+
+    def decode(df):
+        df = df.copy()
+        for col in df.columns:
+            if col in PLAYER_COLUMNS:
+                df[col] = df[col].map(names)
+            elif col == "partnership_key":
+                df[col] = df[col].map(decode_key)
+        return df
+
+    return decode
+
+
+def player_row_decoder(conn):
+    """
+    Like `player_decoder`, for result rows streamed from a cursor: returns
+    `transform(columns, rows)` mapping ids back to names, or None when the
+    database is not encoded.
+    """
+    has_players = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'"
+    ).fetchone()
+    if not has_players:
+        return None
+    names = dict(conn.execute("SELECT id, name FROM players"))
+
+    def decode_value(column, value):
+        if column in PLAYER_COLUMNS:
+            return names.get(value, value)
+        if column == "partnership_key" and value is not None:
+            return "-".join(names.get(int(part), part) for part in str(value).split("-"))
+        return value
+
+    def transform(columns, rows):
+        if not any(col in PLAYER_COLUMNS or col == "partnership_key" for col in columns):
+            return rows
+        return [tuple(decode_value(col, value) for col, value in zip(columns, row)) for row in rows]
+
+    return transform
+
+
+def build_database(conn, deliveries, matches, player_ids=False, partition_seasons=False,
+                   loader="pandas", rollups=None):
+    """
+    Load the raw tables and materialize the rollups derived from them (the
+    ones named in `rollups`, default all).
+    """
+    load_tables(conn, deliveries, matches, loader)
+    if player_ids:
+        encode_players(conn)
+    if partition_seasons:
+        partition_deliveries(conn)
+    build_rollups(conn, rollups)
+
+
+def stamp_fingerprint(conn, sources, options):
+    """Record the fingerprint of every source file and the build options."""
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} (
+            source TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime_ns INTEGER,
+            sha256 TEXT)"""
+    )
+    rows = [(Path(src).name, *file_fingerprint(src)) for src in sources]
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {FINGERPRINT_TABLE} VALUES (?, ?, ?, ?)", rows
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {OPTIONS_TABLE} (name TEXT PRIMARY KEY, value TEXT)")
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {OPTIONS_TABLE} VALUES (?, ?)",
+        [(name, json.dumps(value)) for name, value in options.items()],
+    )
+    conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+    conn.commit()
+
+
+def _read_build(conn):
+    """
+    Return ({source: (size, mtime_ns, sha256)}, build options) recorded in a
+    cached database, or None when it was written by another `CACHE_VERSION`
+    or is not a cache at all.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        return None
+    try:
+        stored = {
+            source: (size, mtime_ns, sha256)
+            for source, size, mtime_ns, sha256 in conn.execute(
+                f"SELECT source, size, mtime_ns, sha256 FROM {FINGERPRINT_TABLE}"
+            )
+        }
+        built_with = {
+            name: json.loads(value)
+            for name, value in conn.execute(f"SELECT name, value FROM {OPTIONS_TABLE}")
+        }
+    except sqlite3.DatabaseError:
+        return None
+    return stored, built_with
+
+
+def cache_is_fresh(conn, sources, options):
+    """
+    Check a cached database against the current source files and the
+    requested build options.
+
+    Size and mtime are compared first; the content hash is only computed when
+    the size matches but the mtime moved (e.g. after a fresh checkout), in
+    which case the stored mtime is refreshed so the next check is cheap again.
+    """
+    build = _read_build(conn)
+    if build is None or build[1] != options:
+        return False
+    stored = build[0]
+
+    touched = []
+    for src in sources:
+        name = Path(src).name
+        if name not in stored:
+            return False
+        size, mtime_ns, sha256 = stored[name]
+        current_size, current_mtime, _ = file_fingerprint(src, with_hash=False)
+        if current_size != size:
+            return False
+        if current_mtime == mtime_ns:
+            continue
+        if file_fingerprint(src)[2] != sha256:
+            return False
+        touched.append((current_mtime, name))
+
+    if touched:
+        conn.executemany(
+            f"UPDATE {FINGERPRINT_TABLE} SET mtime_ns = ? WHERE source = ?", touched
+        )
+        conn.commit()
+    return True
+
+
+def _appended_tail(path, size, sha256):
+    """
+    If `path` is the file fingerprinted as (size, sha256) with lines added to
+    the end, return the CSV header followed by just the added bytes.
+    Otherwise return None.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        fh.seek(0)
+        remaining, last = size, b""
+        while remaining:
+            block = fh.read(min(1 << 20, remaining))
+            if not block:
+                return None
+            sha.update(block)
+            remaining -= len(block)
+            last = block[-1:]
+        if sha.hexdigest() != sha256 or last != b"\n":
+            return None
+        return header + fh.read()
+
+
+DELTA_TABLE = "_new_deliveries"
+
+
+class _NotAnAppend(Exception):
+    """Raised inside the append transaction when the delta touches a cached match."""
+
+
+def append_new_matches(conn, deliveries, matches, stored=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Append the matches in `matches.csv` that the database does not hold yet,
+    together with their deliveries, and fold them into the rollups.
+
+    `stored` is the fingerprint recorded for each source, {file name:
+    (size, mtime_ns, sha256)}.  Both CSVs must be exactly the fingerprinted
+    files with lines added to the end, and every added delivery must belong
+    to a new match; only those added bytes are parsed.  Returns the number of
+    matches appended, or None when the CSVs are not such a pure append (a
+    cached row was edited or removed, deliveries were added to a cached
+    match, the file changed without adding a match, or new matches belong to
+    a frozen season partition) and a full rebuild is needed.
+
+    The new deliveries are staged in `_new_deliveries`, encoded if the
+    database uses player ids, and copied into `IPL` (or routed to the season
+    partitions); `update_rollups` then
+    folds that table alone.  Everything runs in one transaction, so a failure
+    or a fallback to a rebuild leaves the cache exactly as it was.
+    """
+    stored = stored or {}
+    tails = {}
+    for path in (deliveries, matches):
+        fingerprint = stored.get(Path(path).name)
+        if fingerprint is None:
+            return None
+        tails[path] = _appended_tail(path, fingerprint[0], fingerprint[2])
+        if tails[path] is None:
+            return None
+    header = pd.read_csv(io.BytesIO(tails[deliveries]), nrows=0)
+
+    new_matches = pd.read_csv(io.BytesIO(tails[matches]))
+    known = {match_id for (match_id,) in conn.execute("SELECT id FROM Matches")}
+    if new_matches["id"].isin(known).any():
+        return None
+    new_ids = set(new_matches["id"])
+    added_deliveries = bool(tails[deliveries].partition(b"\n")[2].strip())
+    if new_matches.empty:
+        # Nothing new to account for a change to deliveries.csv: rebuild.
+        return None if added_deliveries else 0
+    if is_partitioned(conn) and set(new_matches["season"].astype(str)) & frozen_seasons(conn):
+        return None
+
+    columns = header.columns
+    dtypes = {col: DELIVERY_COLUMNS[col][0] for col in columns if col in DELIVERY_COLUMNS}
+    ipl_columns = ", ".join(
+        f"[{row[1]}]" for row in conn.execute("PRAGMA table_info(IPL)")
+    )
+    encoded = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'"
+    ).fetchone()
+
+    conn.execute("BEGIN")
+    try:
+        append_frame(conn, "Matches", new_matches)
+        conn.execute(f"DROP TABLE IF EXISTS {DELTA_TABLE}")
+        conn.execute(f"CREATE TABLE {DELTA_TABLE} AS SELECT {ipl_columns} FROM IPL WHERE 0")
+        if added_deliveries:
+            for chunk in pd.read_csv(io.BytesIO(tails[deliveries]), dtype=dtypes, chunksize=chunksize):
+                if not chunk["match_id"].isin(new_ids).all():
+                    raise _NotAnAppend
+                append_frame(conn, DELTA_TABLE, chunk)
+        if encoded:
+            _add_players(conn, DELTA_TABLE)
+            _encode_table(conn, DELTA_TABLE)
+        if is_partitioned(conn):
+            append_to_partitions(conn, DELTA_TABLE)
+        else:
+            conn.execute(
+                f"INSERT INTO IPL ({ipl_columns}) SELECT {ipl_columns} FROM {DELTA_TABLE}"
+            )
+        update_rollups(conn, DELTA_TABLE)
+        conn.execute(f"DROP TABLE {DELTA_TABLE}")
+        conn.commit()
+    except _NotAnAppend:
+        conn.rollback()
+        return None
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(new_matches)
+
+
+def open_database(deliveries, matches, cache=None, player_ids=False, partition_seasons=False,
+                  loader="pandas", incremental=False, rollups=None):
+    """
+    Return a connection with the `IPL` and `Matches` tables loaded.
+
+    Without `cache` the CSVs are parsed into a new in-memory database.  With
+    `cache` the on-disk database at that path is reused when its fingerprint
+    still matches the CSVs, and rebuilt (atomically, via a temporary file)
+    when it does not, or when it was built with different options.
+    `loader` only affects how a (re)build reads the CSVs, see `load_tables`,
+    and `rollups` which rollups it materializes up front.
+
+    With `incremental=True` a stale cache built with the same options is
+    first offered to `append_new_matches`, so a new season only costs its own
+    rows; the full rebuild remains the fallback when the CSVs changed in any
+    other way.
+    """
+    sources = [Path(deliveries), Path(matches)]
+    options = {"player_ids": player_ids, "partition_seasons": partition_seasons}
+    if cache is None:
+        conn = sqlite3.connect(":memory:")
+        build_database(conn, *sources, loader=loader, rollups=rollups, **options)
+        return conn
+
+    cache = Path(cache)
+    if cache.exists():
+        conn = sqlite3.connect(cache)
+        if cache_is_fresh(conn, sources, options):
+            return conn
+        build = _read_build(conn) if incremental else None
+        if build is not None and build[1] == options:
+            appended = append_new_matches(conn, *sources, stored=build[0])
+            if appended is not None:
+                print(f"Appended {appended} new matches to {cache}")
+                stamp_fingerprint(conn, sources, options)
+                return conn
+        conn.close()
+
+    tmp = cache.with_name(cache.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    build_database(conn, *sources, loader=loader, rollups=rollups, **options)
+    stamp_fingerprint(conn, sources, options)
+    conn.close()
+    os.replace(tmp, cache)
+    return sqlite3.connect(cache)
+
+
+# Indexes created by earlier versions of this module that are no longer used.
+RETIRED_INDEXES = ("idx_ipl_match_batter_ball",)
+
+
+def _index_targets(conn):
+    """
+    Yield (index name, "table (columns)") for every report index.  On a
+    season-partitioned database each `IPL` index is created on every
+    partition instead, suffixed with the partition name.
+    """
+    tables = [table for _, table in partitions(conn)] if is_partitioned(conn) else None
+    for name, target in INDEXES.items():
+        table, columns = target.split(" ", 1)
+        if table == "IPL" and tables is not None:
+            for partition in tables:
+                yield f"{name}__{partition}", f"{partition} {columns}"
+        else:
+            yield name, target
+
+
+def create_indexes(conn):
+    """Create any missing report indexes and run ANALYZE if one was added."""
+    for name in RETIRED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    existing = {
+        name for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    missing = [(name, target) for name, target in _index_targets(conn) if name not in existing]
+    for name, target in missing:
+        conn.execute(f"CREATE INDEX {name} ON {target}")
+    if missing:
+        conn.execute("ANALYZE")
+    conn.commit()
+    return [name for name, _ in missing]
+
+
+def drop_indexes(conn):
+    """Drop the report indexes (used to time the queries without them)."""
+    for name, _ in list(_index_targets(conn)):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
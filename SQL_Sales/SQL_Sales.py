@@ -1,4 +1,13 @@
-def main():
+import sys
+from pathlib import Path
+
+# Make the shared `sqlkit` package at the repository root importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main(loader="pandas", profile=False, profile_json=None, only=None, tags=None,
+         list_queries=False, jobs=1, export_dir=None, export_format="csv", compression=None,
+         incremental=False):
     """
     📊 Project: SQL Sales Data Analysis with SQLite
     🧑‍💻 Author: Krishn Meena
@@ -19,6 +28,69 @@ def main():
     - SQL queries with insights stored in DataFrames
     - Ready for export, charting, or dashboard integration
 
+    ⚡ Loading:
+    `loader="bulk"` (`--loader bulk`) inserts the prepared frame with
+    `sqlkit.bulkload` instead of pandas `to_sql`; with `--profile` either
+    load is reported in rows/sec.
+    `loader="columnar"` also reads the CSV through `sqlkit.columnar`, which
+    keeps a typed `sales_data.feather` beside it and memory-maps that on
+    later runs instead of re-parsing the text.
+
+    📅 Calendar:
+    Dates are not parsed row by row: each distinct `Date` string is mapped
+    once to an integer `date_key` (YYYYMMDD) through `sqlkit.calendar`, and
+    `sales` stores only that key. Year, month, month name and period come
+    from the shared `calendar` table, generated once per date range.
+
+    🔁 Incremental load:
+    `incremental=True` (`--incremental`) keeps `sales_data.db` between runs
+    instead of replacing the `sales` table. Rows are matched on their natural
+    key (date key, customer age and gender, country, state, product) and only
+    new, changed or removed rows are written, by `sqlkit.upsert` in WAL mode,
+    so indexes and any tables built on `sales` survive. When the CSV has not
+    changed since the last load it is not read at all.
+
+    📦 Monthly rollup:
+    Month-over-month growth (query7) and cumulative / rolling 3, 6 and
+    12-month revenue (query7b) read `sales_monthly`, one row per month keyed
+    by the integer period `year*12 + month`, through window functions
+    (`sales_rollups`). The rollup is built on first use and then kept up to
+    date by triggers on `sales`, so incremental loads adjust only the months
+    they touch.
+
+    🧊 Sales cube:
+    The single-dimension and paired breakdowns (query1-6, query8, query9)
+    read `sales_cube`, which computes every grouping set they use over
+    Month, Product, State, Age_Group and Product_Category in one scan of
+    `sales`, instead of each query scanning and grouping `sales` again.
+    Changes to `sales` mark the cube stale and the next run rebuilds it.
+
+    🏆 Top-K series:
+    query10 (the best-selling product month by month) and query10b (the
+    top 3 states) come from `sales_rollups.top_k_series_query`, which ranks
+    the entities and returns their monthly series in one pass over a
+    per-(entity, month) rollup, for any K and for Product, State or
+    Product_Category.
+
+    ⏱️ Profiling:
+    `profile=True` (`--profile`) times every query and prints a report,
+    slowest first, with the full table scans and temp B-trees from
+    `EXPLAIN QUERY PLAN`; `--profile-json FILE` writes it as JSON lines.
+
+    🗃️ Query selection:
+    Every report query is registered in a `sqlkit.registry.QueryRegistry`
+    with a name and tags. `only=[...]` (`--only query3 query9`) or
+    `tags=[...]` (`--tag products`) runs just those queries, and
+    `list_queries=True` (`--list`) prints them without loading anything.
+    `jobs=N` (`--jobs N`) runs the selected queries on N read-only
+    connections in parallel (`sqlkit.parallel`); output order is unchanged.
+
+    📤 Export:
+    `export_dir=DIR` (`--export DIR`) writes each query's result to a file
+    in DIR instead of printing it, streamed from the cursor by
+    `sqlkit.export` as csv, jsonl or parquet (`--export-format`, optional
+    `--compression`), with a `manifest.json` describing the files.
+
     ▶️ How to Run:
     1. Place 'sales_data.csv' in your working directory
     2. Run the script or use it inside Jupyter/Colab
@@ -27,137 +99,165 @@ def main():
     import pandas as pd
     import sqlite3
     from pathlib import Path
+    from sqlkit.bulkload import bulk_load_frame, frame_to_sql
+    from sqlkit.instrument import QueryProfiler
+    from sqlkit.export import export_queries
+    from sqlkit.registry import QueryRegistry
+    from sqlkit.columnar import read_csv_cached
+    from sqlkit.calendar import date_keys, ensure_calendar
+    from sqlkit.upsert import forget_source, record_source, source_unchanged, upsert_frame
+    from sales_rollups import (SERIES_ENTITIES, ensure_cube, ensure_monthly, ensure_series, grouping_set,
+                               monthly_growth_query, rolling_revenue_query, series_table,
+                               top_k_series_query)
 
-    file_path = Path(
-        "sales_data.csv"
-    )
-    df = pd.read_csv(file_path)
-    df["Month_Num"] = pd.to_datetime(df["Month"], format="%B", errors="coerce").dt.month
-    conn = sqlite3.connect("sales_data.db")
-    df.to_sql("sales", conn, index=False, if_exists="replace")
+    registry = QueryRegistry()
+
+    # Queries 1-6, 8 and 9 read their grouping set of the one-scan sales_cube.
+    registry.prerequisite("sales_cube", lambda: ensure_cube(conn))
+    cube = ("sales_cube",)
 
     # monthwise revenue
-    query1 = """ SELECT Month,SUM(Revenue) AS [Total Revenue]
-    FROM sales
-    GROUP BY Month
+    query1 = f""" SELECT Month,revenue AS [Total Revenue]
+    FROM sales_cube
+    WHERE dims = '{grouping_set("Month")}'
     ORDER BY [Total Revenue] DESC"""
-    result1 = pd.read_sql_query(query1, conn)
-    print("\nMonthwise Revenue:")
-    print(result1)
+    registry.add("query1", "Monthwise Revenue:", query1, tags=("revenue",), requires=cube)
 
     # top 5 product
-    query2 = """SELECT Product,SUM(Revenue) AS [Total Revenue]
-          FROM sales
-          GROUP BY Product
+    query2 = f"""SELECT Product,revenue AS [Total Revenue]
+          FROM sales_cube
+          WHERE dims = '{grouping_set("Product")}'
           ORDER BY [Total Revenue] DESC
           LIMIT 5 """
-    result2 = pd.read_sql_query(query2, conn)
-    print("\nTop 5 product revenue wise")
-    print(result2)
+    registry.add("query2", "Top 5 product revenue wise", query2, tags=("products",), requires=cube)
 
     # top 10 state
-    query3 = """ SELECT State,SUM(Profit) AS [Total Profit] 
-           FROM sales
-           GROUP BY State
+    query3 = f""" SELECT State,profit AS [Total Profit] 
+           FROM sales_cube
+           WHERE dims = '{grouping_set("State")}'
            ORDER BY [Total Profit] DESC
            LIMIT 10"""
-    result3 = pd.read_sql_query(query3, conn)
-    print("\n Top 5 state profit wise")
-    print(result3)
+    registry.add("query3", " Top 5 state profit wise", query3, tags=("states",), requires=cube)
 
     # best age group
-    query4 = """ SELECT Age_group,SUM(order_Quantity) AS [Total Number of Order] 
-           FROM sales
-           GROUP BY Age_group
+    query4 = f""" SELECT Age_group,quantity AS [Total Number of Order] 
+           FROM sales_cube
+           WHERE dims = '{grouping_set("Age_Group")}'
            ORDER BY [Total Number of Order] DESC
            """
-    result4 = pd.read_sql_query(query4, conn)
-    print("\n Top age_group by number of order")
-    print(result4)
+    registry.add("query4", " Top age_group by number of order", query4, tags=("customers",), requires=cube)
 
     # best product category
-    query5 = """ SELECT Product_Category,SUM(Profit) AS [Total Profit] 
-           FROM sales
-           GROUP BY Product_Category
+    query5 = f""" SELECT Product_Category,profit AS [Total Profit] 
+           FROM sales_cube
+           WHERE dims = '{grouping_set("Product_Category")}'
            ORDER BY [Total Profit] DESC
            """
-    result5 = pd.read_sql_query(query5, conn)
-    print("\n Top product category profit wise")
-    print(result5)
+    registry.add("query5", " Top product category profit wise", query5, tags=("products",), requires=cube)
 
     # monthly revenue per category
-    query6 = """ SELECT Month,Product_Category,SUM(Revenue) AS [Total Revenue] 
-           FROM sales
-           GROUP BY Month,Product_Category
+    query6 = f""" SELECT Month,Product_Category,revenue AS [Total Revenue] 
+           FROM sales_cube
+           WHERE dims = '{grouping_set("Month", "Product_Category")}'
            ORDER BY Month
            """
-    result6 = pd.read_sql_query(query6, conn)
-    print("\n monthly revenue per product category")
-    print(result6)
-
-    # percentage revenue growth month wise
-    query7 = """SELECT curr.year,
-                 curr.month_num,
-                 curr.[Current Month Revenue ],
-                 prev.[Previous Month Revenue ],
-                 ROUND((curr.[Current Month Revenue ]-prev.[Previous Month Revenue ])*100/prev.[Previous Month Revenue ],2) AS [Percentage change]
-
-          FROM
-          (SELECT Year,Month_num,SUM(Revenue) AS [Current Month Revenue ]
-          FROM sales
-          GROUP BY year,Month_num) curr
-          LEFT JOIN
-          (
-          SELECT Year, Month_num,SUM(Revenue) AS [Previous Month Revenue ]
-          FROM sales
-          GROUP BY year,Month_num) prev
-
-          ON (curr.Year=prev.Year AND curr.month_num=prev.month_num+1)
-            OR (curr.Year=prev.Year+1 AND curr.Month_num=1 AND prev.month_num=12)"""
-    result7 = pd.read_sql_query(query7, conn)
-    print("\n percentage revenue growth month wise ")
-    print(result7)
+    registry.add("query6", " monthly revenue per product category", query6, tags=("revenue",), requires=cube)
+
+    # percentage revenue growth month wise, from the maintained monthly rollup
+    registry.prerequisite("sales_monthly", lambda: ensure_monthly(conn))
+    registry.add("query7", " percentage revenue growth month wise ", monthly_growth_query(),
+                 tags=("growth",), requires=("sales_monthly",))
+
+    # cumulative and rolling 3/6/12-month revenue
+    registry.add("query7b", " cumulative and rolling revenue month wise ", rolling_revenue_query(),
+                 tags=("growth", "revenue"), requires=("sales_monthly",))
 
     # Customer Behaviour
-    query8 = """SELECT Age_group,Product_Category,COUNT(*) AS [Toatal Order]
-          FROM sales 
-          GROUP BY Age_group,Product_Category
-          HAVING COUNT(*)>1
+    query8 = f"""SELECT Age_group,Product_Category,orders AS [Toatal Order]
+          FROM sales_cube 
+          WHERE dims = '{grouping_set("Age_Group", "Product_Category")}' AND orders>1
           ORDER BY [Toatal Order] DESC"""
-    result8 = pd.read_sql_query(query8, conn)
-    print("\n Customer Behaviour")
-    print(result8)
+    registry.add("query8", " Customer Behaviour", query8, tags=("customers",), requires=cube)
 
     # order size avg
-    query9 = """SELECT State,ROUND((SUM(Revenue)*1.0)/SUM(order_Quantity),2) AS [Avg. Order Value]
-          FROM sales 
-          GROUP BY State
+    query9 = f"""SELECT State,ROUND((revenue*1.0)/quantity,2) AS [Avg. Order Value]
+          FROM sales_cube 
+          WHERE dims = '{grouping_set("State")}'
           ORDER BY [Avg. Order Value] DESC"""
-    result9 = pd.read_sql_query(query9, conn)
-    print("\n order size avg ")
-    print(result9)
-
-    # top selling product performance
-    query10 = """WITH top_product AS
-        (SELECT Product, SUM(Revenue) AS total_revenue
-        FROM sales
-        GROUP BY Product
-        ORDER BY total_revenue DESC
-        LIMIT 1) 
-        
-        SELECT 
-        sales.year,
-        sales.Month_num,
-        sales.product,
-        SUM(Revenue) AS [Total Revenue]
-        FROM sales
-        JOIN top_product ON top_product.product=sales.product
-        GROUP BY sales.year,sales.Month_num,sales.product
-        ORDER BY sales.year, sales.Month_num"""
-    result10 = pd.read_sql_query(query10, conn)
-    print("\n top selling product performance ")
-    print(result10)
+    registry.add("query9", " order size avg ", query9, tags=("states",), requires=cube)
+
+    # top selling product performance: top-K entities with their monthly series,
+    # in one pass over a per-(entity, month) rollup
+    for entity in SERIES_ENTITIES:
+        registry.prerequisite(series_table(entity), lambda entity=entity: ensure_series(conn, entity))
+    registry.add("query10", " top selling product performance ", top_k_series_query("Product", k=1),
+                 tags=("products",), requires=(series_table("Product"),))
+
+    # top 3 states, month by month
+    registry.add("query10b", " top 3 states revenue month wise ", top_k_series_query("State", k=3),
+                 tags=("states",), requires=(series_table("State"),))
+
+    selected = registry.select(only, tags)
+    if list_queries:
+        print(registry.listing(selected).to_string(index=False))
+        return
 
+    file_path = Path(
+        "sales_data.csv"
+    )
+    # Natural key of a sale; repeats of the same key are numbered by sqlkit.upsert.
+    sales_key = ["date_key", "Customer_Age", "Customer_Gender", "Country", "State", "Product"]
+    conn = sqlite3.connect("sales_data.db")
+    profiler = QueryProfiler(enabled=profile or profile_json is not None)
+    if incremental and source_unchanged(conn, "sales", file_path):
+        print(f"sales is up to date with {file_path}")
+    else:
+        df = read_csv_cached(file_path) if loader == "columnar" else pd.read_csv(file_path)
+        # The date parts live in the calendar dimension; sales keeps only the key.
+        df["date_key"] = date_keys(df["Date"], format="%Y-%m-%d")
+        df = df.drop(columns=["Date", "Day", "Month", "Year"])
+        ensure_calendar(conn, df["date_key"])
+        if incremental:
+            upsert_frame(conn, "sales", df, key=sales_key)
+            record_source(conn, "sales", file_path)
+        else:
+            if loader in ("bulk", "columnar"):
+                profiler.record_load(bulk_load_frame(conn, "sales", df))
+            else:
+                profiler.record_load(frame_to_sql(conn, "sales", df))
+            forget_source(conn, "sales")
+
+    if export_dir:
+        export_queries(registry, selected, conn, export_dir, export_format, compression, jobs=jobs)
+    else:
+        registry.run(selected, conn, profiler, jobs=jobs)
+
+    if profile:
+        profiler.print_report()
+    if profile_json:
+        profiler.write_jsonl(profile_json)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from sqlkit.registry import UnknownQueryError, add_arguments
+
+    parser = argparse.ArgumentParser(description="SQL Sales Data Analysis")
+    parser.add_argument("--loader", choices=["pandas", "bulk", "columnar"], default="pandas",
+                        help="load with DataFrame.to_sql, the sqlkit bulk loader, or through a Feather "
+                             "cache of the CSV (--profile reports rows/sec)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every query and print a report with full scans and temp b-trees flagged")
+    parser.add_argument("--profile-json", metavar="FILE",
+                        help="write the per-query profile (including plans) as JSON lines ('-' for stdout)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="upsert only new or changed rows into the existing sales_data.db (WAL mode) "
+                             "instead of replacing the table")
+    add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        main(loader=args.loader, profile=args.profile, profile_json=args.profile_json,
+             only=args.only, tags=args.tags, list_queries=args.list_queries, jobs=args.jobs,
+             export_dir=args.export_dir, export_format=args.export_format, compression=args.compression,
+             incremental=args.incremental)
+    except UnknownQueryError as exc:
+        parser.error(str(exc))
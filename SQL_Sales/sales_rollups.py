@@ -0,0 +1,422 @@
+"""
+📦 Sales rollup tables
+
+Small, materialized summaries of the `sales` table that the report queries
+in `SQL_Sales.py` read instead of re-aggregating every order.
+
+- `sales_monthly` — one row per calendar month, keyed by the integer
+  `period = year*12 + month` (derived from each order's `date_key`, see
+  `sqlkit.calendar`): orders, quantity, revenue, profit and cost.
+  Consecutive months are consecutive periods, across year boundaries too, so
+  month-over-month growth, cumulative revenue and rolling 3/6/12-month
+  windows are window functions over an ordered key (`RANGE ... PRECEDING`)
+  rather than self-joins on `month+1 OR (year+1 AND month=1)`.
+- `sales_cube` — orders, quantity, revenue and profit for every grouping
+  set in `GROUPING_SETS` (Month, Product, State, Age_Group,
+  Product_Category and the Month/Age_Group x Product_Category pairs), one
+  row per group.  `dims` names the grouping set; columns outside it are
+  NULL.  Month is the month name from the `calendar` dimension.  SQLite
+  has no GROUPING SETS/ROLLUP, so one scan of `sales` aggregates it to the
+  finest grain (all five columns), and that small result is CROSS JOINed
+  to a VALUES list of the sets and rolled up to each.
+- `sales_monthly_by_product` / `_by_state` / `_by_product_category` — one
+  row per (entity, month) with orders, quantity, revenue and profit, built
+  on first use.  `top_k_series_query` returns the monthly series of the K
+  best entities from one of them in a single pass.
+
+`sales_monthly` is maintained, not rebuilt per run: it is built once with a
+single aggregate pass and then kept in step by triggers on `sales`, so an
+incremental load (`--incremental`) only adjusts the months whose rows were
+inserted, changed or removed.  Replacing the `sales` table drops its
+triggers, which is how `ensure_monthly` knows to rebuild.
+
+`sales_cube` is rebuilt rather than patched (a row touches one group per
+set): triggers on `sales` mark it stale in `sales_stale_rollups`, and
+`ensure_cube` rebuilds it when it is marked or its triggers are gone.
+SQLite triggers fire per row, so the mark is a single keyed row: the first
+changed row inserts it and the rest of an N-row load find it (one key
+lookup each) and write nothing.  The per-entity series rollups work the same way.
+"""
+
+import pandas as pd
+
+from sqlkit.calendar import month_sql, period_sql, year_sql
+
+MONTHLY_MEASURES = (
+    ("quantity", "Order_Quantity"),
+    ("revenue", "Revenue"),
+    ("profit", "Profit"),
+    ("cost", "Cost"),
+)
+
+MONTHLY_TABLE = """CREATE TABLE sales_monthly (
+    period INTEGER PRIMARY KEY,
+    year INTEGER,
+    month_num INTEGER,
+    orders INTEGER,
+    quantity INTEGER,
+    revenue INTEGER,
+    profit INTEGER,
+    cost INTEGER
+)"""
+
+MONTHLY_BUILD = f"""INSERT INTO sales_monthly
+    SELECT {period_sql("date_key")} AS period,
+           {year_sql("date_key")},
+           {month_sql("date_key")},
+           COUNT(*),
+           {", ".join(f"SUM({column})" for _, column in MONTHLY_MEASURES)}
+    FROM sales
+    WHERE date_key IS NOT NULL
+    GROUP BY period"""
+
+
+def _fold_row(row, sign):
+    """Trigger body folding the NEW/OLD `row` into its month: added for "+", removed for "-"."""
+    key = f"{row}.date_key"
+    period = period_sql(key)
+    if sign == "+":
+        values = ", ".join(f"IFNULL({row}.{column}, 0)" for _, column in MONTHLY_MEASURES)
+        added = ", ".join(f"{name} = {name} + excluded.{name}" for name, _ in MONTHLY_MEASURES)
+        return f"""INSERT INTO sales_monthly
+        VALUES ({period}, {year_sql(key)}, {month_sql(key)}, 1, {values})
+        ON CONFLICT (period) DO UPDATE SET orders = orders + 1, {added};"""
+    removed = ", ".join(
+        f"{name} = {name} - IFNULL({row}.{column}, 0)" for name, column in MONTHLY_MEASURES
+    )
+    return f"""UPDATE sales_monthly SET orders = orders - 1, {removed} WHERE period = {period};
+        DELETE FROM sales_monthly WHERE period = {period} AND orders = 0;"""
+
+
+def _when(row):
+    return f"{row}.date_key IS NOT NULL"
+
+
+MONTHLY_TRIGGERS = {
+    "sales_monthly_insert": f"""CREATE TRIGGER sales_monthly_insert AFTER INSERT ON sales
+    WHEN {_when("NEW")}
+    BEGIN
+        {_fold_row("NEW", "+")}
+    END""",
+    "sales_monthly_delete": f"""CREATE TRIGGER sales_monthly_delete AFTER DELETE ON sales
+    WHEN {_when("OLD")}
+    BEGIN
+        {_fold_row("OLD", "-")}
+    END""",
+    # An update moves the old row out of its month and the new row into its own.
+    "sales_monthly_update_old": f"""CREATE TRIGGER sales_monthly_update_old AFTER UPDATE ON sales
+    WHEN {_when("OLD")}
+    BEGIN
+        {_fold_row("OLD", "-")}
+    END""",
+    "sales_monthly_update_new": f"""CREATE TRIGGER sales_monthly_update_new AFTER UPDATE ON sales
+    WHEN {_when("NEW")}
+    BEGIN
+        {_fold_row("NEW", "+")}
+    END""",
+}
+
+
+def _existing(conn, kind):
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))
+    return {name for (name,) in rows}
+
+
+def monthly_is_current(conn):
+    """True when `sales_monthly` exists and its triggers still watch `sales`."""
+    return ("sales_monthly" in _existing(conn, "table")
+            and set(MONTHLY_TRIGGERS) <= _existing(conn, "trigger"))
+
+
+def build_monthly(conn):
+    """(Re)build `sales_monthly` from `sales` and install the triggers that maintain it."""
+    conn.execute("DROP TABLE IF EXISTS sales_monthly")
+    conn.execute(MONTHLY_TABLE)
+    conn.execute(MONTHLY_BUILD)
+    for name, sql in MONTHLY_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    conn.commit()
+
+
+def ensure_monthly(conn):
+    """Build `sales_monthly` unless it is already being maintained; returns True if built."""
+    if monthly_is_current(conn):
+        return False
+    build_monthly(conn)
+    return True
+
+
+# cube column -> expression over `sales AS s LEFT JOIN calendar AS c`
+CUBE_DIMENSIONS = {
+    "Month": "c.month_name",
+    "Product": "s.Product",
+    "State": "s.State",
+    "Age_Group": "s.Age_Group",
+    "Product_Category": "s.Product_Category",
+}
+
+GROUPING_SETS = (
+    ("Month",),
+    ("Product",),
+    ("State",),
+    ("Age_Group",),
+    ("Product_Category",),
+    ("Month", "Product_Category"),
+    ("Age_Group", "Product_Category"),
+)
+
+CUBE_TABLE = f"""CREATE TABLE sales_cube (
+    dims TEXT,
+    {", ".join(f"{dim} TEXT" for dim in CUBE_DIMENSIONS)},
+    orders INTEGER,
+    quantity INTEGER,
+    revenue INTEGER,
+    profit INTEGER
+)"""
+
+
+def grouping_set(*dims):
+    """The `dims` value identifying the grouping set over `dims` in `sales_cube`."""
+    if tuple(dims) not in GROUPING_SETS:
+        raise ValueError(f"{dims!r} is not one of the sales_cube grouping sets {GROUPING_SETS}")
+    return ",".join(dims)
+
+
+def _cube_build():
+    sets = ", ".join(f"('{grouping_set(*dims)}')" for dims in GROUPING_SETS)
+    dimensions = ",\n            ".join(f"{expr} AS {dim}" for dim, expr in CUBE_DIMENSIONS.items())
+    positions = ", ".join(str(i) for i in range(1, len(CUBE_DIMENSIONS) + 1))
+    columns = ",\n           ".join(
+        "CASE WHEN g.dims IN ({}) THEN b.{} END".format(
+            ", ".join(f"'{grouping_set(*dims)}'" for dims in GROUPING_SETS if dim in dims), dim)
+        for dim in CUBE_DIMENSIONS
+    )
+    return f"""INSERT INTO sales_cube
+    WITH base AS
+    (SELECT {dimensions},
+            COUNT(*) AS orders,
+            SUM(s.Order_Quantity) AS quantity,
+            SUM(s.Revenue) AS revenue,
+            SUM(s.Profit) AS profit
+    FROM sales AS s
+    LEFT JOIN calendar AS c ON c.date_key = s.date_key
+    GROUP BY {positions}),
+    grouping_sets(dims) AS (VALUES {sets})
+    SELECT g.dims,
+           {columns},
+           SUM(b.orders),
+           SUM(b.quantity),
+           SUM(b.revenue),
+           SUM(b.profit)
+    FROM base AS b
+    CROSS JOIN grouping_sets AS g
+    GROUP BY g.dims, {", ".join(str(i) for i in range(2, len(CUBE_DIMENSIONS) + 2))}"""
+
+
+STALE_TABLE = "CREATE TABLE IF NOT EXISTS sales_stale_rollups (name TEXT PRIMARY KEY)"
+
+
+def _invalidation_triggers(table):
+    """Triggers marking `table` stale on any change to `sales` (one key probe per row)."""
+    return {
+        f"{table}_{event.lower()}": f"""CREATE TRIGGER {table}_{event.lower()}
+    AFTER {event} ON sales
+    WHEN NOT EXISTS (SELECT 1 FROM sales_stale_rollups WHERE name = '{table}')
+    BEGIN
+        INSERT INTO sales_stale_rollups (name) VALUES ('{table}');
+    END"""
+        for event in ("INSERT", "UPDATE", "DELETE")
+    }
+
+
+def _is_current(conn, table, triggers):
+    """True when `table` is not marked stale and all of its `triggers` still watch `sales`."""
+    tables = _existing(conn, "table")
+    if ({table, "sales_stale_rollups"} - tables
+            or not set(triggers) <= _existing(conn, "trigger")):
+        return False
+    stale = conn.execute("SELECT 1 FROM sales_stale_rollups WHERE name = ?", (table,))
+    return stale.fetchone() is None
+
+
+def _rebuild(conn, table, statements, triggers):
+    conn.execute(f"DROP TABLE IF EXISTS {table}")
+    for sql in statements:
+        conn.execute(sql)
+    conn.execute(STALE_TABLE)
+    conn.execute("DELETE FROM sales_stale_rollups WHERE name = ?", (table,))
+    for name, sql in triggers.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(sql)
+    conn.commit()
+
+
+CUBE_TRIGGERS = _invalidation_triggers("sales_cube")
+
+
+def cube_is_current(conn):
+    """True when `sales_cube` is not marked stale and its triggers still watch `sales`."""
+    return _is_current(conn, "sales_cube", CUBE_TRIGGERS)
+
+
+def build_cube(conn):
+    """(Re)build `sales_cube` with one scan of `sales` and install its invalidation triggers."""
+    _rebuild(conn, "sales_cube",
+             [CUBE_TABLE, _cube_build(), "CREATE INDEX sales_cube_dims ON sales_cube (dims)"],
+             CUBE_TRIGGERS)
+
+
+def ensure_cube(conn):
+    """Build `sales_cube` unless it is current; returns True if built."""
+    if cube_is_current(conn):
+        return False
+    build_cube(conn)
+    return True
+
+
+# Entity columns with a per-(entity, month) series rollup.
+SERIES_ENTITIES = ("Product", "State", "Product_Category")
+
+# measure -> output column label
+SERIES_MEASURES = {
+    "revenue": "Total Revenue",
+    "profit": "Total Profit",
+    "quantity": "Total Quantity",
+    "orders": "Total Orders",
+}
+
+
+def series_table(entity):
+    """Name of the per-(entity, month) rollup for `entity`, e.g. `sales_monthly_by_product`."""
+    if entity not in SERIES_ENTITIES:
+        raise ValueError(f"unknown entity {entity!r}; choose from {SERIES_ENTITIES}")
+    return f"sales_monthly_by_{entity.lower()}"
+
+
+def _series_statements(entity):
+    table = series_table(entity)
+    return [
+        f"""CREATE TABLE {table} (
+    {entity} TEXT,
+    period INTEGER,
+    year INTEGER,
+    month INTEGER,
+    orders INTEGER,
+    quantity INTEGER,
+    revenue INTEGER,
+    profit INTEGER,
+    PRIMARY KEY ({entity}, period)
+)""",
+        f"""INSERT INTO {table}
+    SELECT {entity},
+           {period_sql("date_key")} AS period,
+           {year_sql("date_key")},
+           {month_sql("date_key")},
+           COUNT(*),
+           SUM(Order_Quantity),
+           SUM(Revenue),
+           SUM(Profit)
+    FROM sales
+    WHERE date_key IS NOT NULL
+    GROUP BY {entity}, period""",
+    ]
+
+
+def ensure_series(conn, entity):
+    """
+    Build the per-(entity, month) rollup of `entity` unless it is current;
+    returns True if built.  Like the cube, triggers mark it stale when
+    `sales` changes and it is rebuilt on next use.
+    """
+    table = series_table(entity)
+    triggers = _invalidation_triggers(table)
+    if _is_current(conn, table, triggers):
+        return False
+    _rebuild(conn, table, _series_statements(entity), triggers)
+    return True
+
+
+def top_k_series_query(entity="Product", k=1, measure="revenue"):
+    """
+    SQL for the monthly `measure` series of the top `k` values of `entity`
+    by their total `measure`, best first and in month order within each.
+
+    One pass over the entity's monthly rollup: a window sum gives each
+    entity's total on every row and DENSE_RANK over (total, name) ranks the
+    entities, so ties are broken by name and exactly `k` are returned.
+    """
+    if measure not in SERIES_MEASURES:
+        raise ValueError(f"unknown measure {measure!r}; choose from {sorted(SERIES_MEASURES)}")
+    table = series_table(entity)
+    return f"""SELECT year AS Year,
+           month AS Month_Num,
+           {entity},
+           {measure} AS [{SERIES_MEASURES[measure]}]
+    FROM
+    (SELECT *,
+            DENSE_RANK() OVER (ORDER BY entity_total DESC, {entity}) AS entity_rank
+    FROM
+    (SELECT *,
+            SUM({measure}) OVER (PARTITION BY {entity}) AS entity_total
+    FROM {table}) AS totals) AS ranked
+    WHERE entity_rank <= {int(k)}
+    ORDER BY entity_rank, period"""
+
+
+def top_k_series(conn, entity="Product", k=1, measure="revenue"):
+    """Return the top-`k` `entity` monthly series as a DataFrame, building its rollup if needed."""
+    ensure_series(conn, entity)
+    return pd.read_sql_query(top_k_series_query(entity, k, measure), conn)
+
+
+def monthly_growth_query():
+    """
+    SQL for month-over-month revenue growth.
+
+    The previous month is the row one period back (`RANGE 1 PRECEDING`), so a
+    month with no sales before it gets NULL rather than the last month that
+    had some.
+    """
+    return """SELECT year AS Year,
+           month_num AS Month_num,
+           revenue AS [Current Month Revenue ],
+           prev_revenue AS [Previous Month Revenue ],
+           ROUND((revenue-prev_revenue)*100/prev_revenue,2) AS [Percentage change]
+    FROM
+    (SELECT period,
+            year,
+            month_num,
+            revenue,
+            SUM(revenue) OVER (ORDER BY period RANGE BETWEEN 1 PRECEDING AND 1 PRECEDING)
+                AS prev_revenue
+    FROM sales_monthly) AS monthly
+    ORDER BY period"""
+
+
+def rolling_revenue_query(windows=(3, 6, 12)):
+    """
+    SQL for cumulative revenue and rolling revenue over the last `windows`
+    months (each including the current one) per month.
+
+    Windows are ranges of periods, so missing months count as zero revenue
+    instead of stretching a window further back.
+    """
+    rolling = ",\n           ".join(
+        f"SUM(revenue) OVER (ORDER BY period "
+        f"RANGE BETWEEN {int(months) - 1} PRECEDING AND CURRENT ROW) "
+        f"AS [Rolling {int(months)}M Revenue]"
+        for months in windows
+    )
+    return f"""SELECT year AS Year,
+           month_num AS Month_num,
+           revenue AS [Revenue],
+           SUM(revenue) OVER (ORDER BY period) AS [Cumulative Revenue],
+           {rolling}
+    FROM sales_monthly
+    ORDER BY period"""
+
+
+def monthly_growth(conn):
+    """Return the month-over-month growth report as a DataFrame."""
+    return pd.read_sql_query(monthly_growth_query(), conn)
@@ -0,0 +1,163 @@
+"""
+📈 Scale-out benchmark
+
+Runs every project script against synthetic data at several scales and
+reports, per (scale, script):
+
+- rows loaded and load time (from the load records of `--profile-json`)
+- per-query time (from its query records)
+- peak resident memory of the script process
+
+Data comes from `benchmarks/generators.py` and is generated once per scale
+into `<workdir>/x<scale>/<project>/`, then reused.  Each script runs in its
+own process with that folder as working directory, so the numbers match what
+a user running it by hand would see.
+
+After the summary a per-query table lists the time of every query at every
+scale; a query whose time grows much faster than the data between two scales
+is flagged as a scaling cliff.
+
+    python benchmarks/bench.py --scales 0.1 1 5 --loader bulk --json results.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from generators import BASE_ROWS, GENERATORS, generate  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# A query whose time grows by more than this factor times the data growth is a cliff.
+CLIFF_FACTOR = 2.0
+# Queries faster than this are timing noise and never flagged.
+CLIFF_MIN_SECONDS = 0.01
+
+
+def _run_script(dataset, data_dir, loader, extra_args=()):
+    """Run one project script in `data_dir`; return its measurements."""
+    _, project, script = GENERATORS[dataset]
+    profile = data_dir / "profile.jsonl"
+    log = data_dir / "run.log"
+    cmd = [sys.executable, str(REPO_ROOT / project / script), "--loader", loader,
+           "--profile-json", str(profile), *extra_args]
+    start = time.perf_counter()
+    with open(log, "w", encoding="utf-8") as out:
+        proc = subprocess.Popen(cmd, cwd=data_dir, stdout=out, stderr=subprocess.STDOUT)
+        # wait4 returns the child's rusage; ru_maxrss is its peak RSS in KiB on Linux.
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    total = time.perf_counter() - start
+    output = log.read_text(encoding="utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} failed in {data_dir} (exit {proc.returncode}):\n{output[-2000:]}")
+    records = []
+    if profile.exists():
+        with open(profile, encoding="utf-8") as fh:
+            records = [json.loads(line) for line in fh if line.strip()]
+    loads = [r for r in records if r["kind"] == "load"]
+    queries = [r for r in records if r["kind"] == "query"]
+    return {
+        "script": script,
+        "rows": sum(r["rows"] for r in loads),
+        "load_s": sum(r["seconds"] for r in loads),
+        "queries_s": sum(q["seconds"] for q in queries),
+        "total_s": total,
+        "peak_mb": usage.ru_maxrss / 1024,
+        "queries": {q["name"]: q["seconds"] for q in queries},
+    }
+
+
+def run_benchmark(scales, datasets=None, workdir="bench-data", loader="pandas", seed=0):
+    """Generate data for every scale and run the scripts on it; return one dict per run."""
+    results = []
+    for scale in scales:
+        for dataset in datasets or GENERATORS:
+            data_dir = Path(workdir) / f"x{scale:g}" / GENERATORS[dataset][1]
+            stamp = data_dir / ".generated"
+            expected = f"{dataset} rows={max(1, int(BASE_ROWS[dataset] * scale))} seed={seed}"
+            if not stamp.exists() or stamp.read_text() != expected:
+                generate(dataset, data_dir, scale=scale, seed=seed)
+                stamp.write_text(expected)
+            # The IPL script caches nothing unless asked, so every run measures a cold load.
+            result = _run_script(dataset, data_dir.resolve(), loader)
+            result.update(scale=scale, dataset=dataset)
+            results.append(result)
+            print(f"x{scale:g} {result['script']}: {result['total_s']:.2f}s, "
+                  f"{result['peak_mb']:.0f} MB peak", flush=True)
+    return results
+
+
+def summary(results):
+    """One row per (scale, script)."""
+    columns = ["scale", "script", "rows", "load_s", "queries_s", "total_s", "peak_mb"]
+    return pd.DataFrame([{c: r[c] for c in columns} for r in results], columns=columns)
+
+
+def query_table(results):
+    """Seconds per (script, query) with one column per scale."""
+    rows = [
+        {"script": r["script"], "query": name, "scale": r["scale"], "seconds": seconds}
+        for r in results for name, seconds in r["queries"].items()
+    ]
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    return df.pivot_table(index=["script", "query"], columns="scale", values="seconds", sort=False)
+
+
+def cliffs(results):
+    """
+    Queries whose time grew more than `CLIFF_FACTOR` times faster than the
+    data between two consecutive scales, as (script, query, from, to, growth).
+    """
+    found = []
+    by_script = {}
+    for r in sorted(results, key=lambda r: r["scale"]):
+        by_script.setdefault(r["script"], []).append(r)
+    for script, runs in by_script.items():
+        for before, after in zip(runs, runs[1:]):
+            data_growth = after["scale"] / before["scale"]
+            for name, seconds in after["queries"].items():
+                previous = before["queries"].get(name)
+                if not previous or seconds < CLIFF_MIN_SECONDS:
+                    continue
+                growth = seconds / previous
+                if growth > CLIFF_FACTOR * data_growth:
+                    found.append((script, name, before["scale"], after["scale"], growth))
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the SQL scripts on synthetic data at several scales")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.1, 1.0],
+                        help="multiples of the original dataset sizes")
+    parser.add_argument("--dataset", choices=list(GENERATORS), action="append",
+                        help="benchmark only this dataset (repeatable; default: all)")
+    parser.add_argument("--workdir", default="bench-data", help="where generated data is kept")
+    parser.add_argument("--loader", choices=["pandas", "bulk", "columnar"], default="pandas",
+                        help="loader passed to every script")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="also write the raw results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(sorted(args.scales), args.dataset, args.workdir, args.loader, args.seed)
+    with pd.option_context("display.width", 160, "display.max_rows", None,
+                           "display.float_format", "{:.3f}".format):
+        print("\nSummary:")
+        print(summary(results).to_string(index=False))
+        table = query_table(results)
+        if not table.empty:
+            print("\nSeconds per query:")
+            print(table.to_string())
+    for script, name, before, after, growth in cliffs(results):
+        print(f"Scaling cliff: {script} {name} grew {growth:.1f}x from x{before:g} to x{after:g}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
@@ -0,0 +1,309 @@
+"""
+🧪 Synthetic data generators
+
+Deterministic, seeded generators for the four inputs the project scripts
+read.  Each writes a CSV with the column layout of the original Kaggle file,
+so the scripts run against it unchanged, at any row count:
+
+- `deliveries.csv` (+ a matching `matches.csv`) for `SQL_IPL.py`
+- `sales_data.csv` for `SQL_Sales.py`
+- `salaries.csv` for `SQL_DataScientist.py`
+- `synthetic_ecommerce_data.csv` for `SQL_ECOM.py`
+
+The same (rows, seed) always produces byte-identical files.  IPL matches are
+taken from the shipped `SQL_IPL/matches.csv`, cycled with new ids once more
+matches are needed, and every match is simulated ball by ball (about 240
+deliveries each).
+
+    python benchmarks/generators.py --dataset all --scale 10 --out data/x10
+"""
+
+import argparse
+import csv
+import datetime
+import random
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MATCHES_TEMPLATE = REPO_ROOT / "SQL_IPL" / "matches.csv"
+
+# Approximate row counts of the original datasets: the size generated at scale 1.
+BASE_ROWS = {
+    "ipl": 260_000,
+    "sales": 113_000,
+    "salaries": 16_500,
+    "ecommerce": 100_000,
+}
+
+DELIVERY_HEADER = [
+    "match_id", "inning", "batting_team", "bowling_team", "over", "ball", "batter",
+    "bowler", "non_striker", "batsman_runs", "extra_runs", "total_runs", "extras_type",
+    "is_wicket", "player_dismissed", "dismissal_kind", "fielder",
+]
+# (extras_type, probability, counts as a legal ball)
+EXTRAS = (("wides", 0.032, False), ("noballs", 0.004, False), ("legbyes", 0.016, True),
+          ("byes", 0.003, True))
+RUNS = (0, 1, 2, 3, 4, 6)
+RUN_WEIGHTS = (38, 37, 7, 0.3, 11, 5)
+DISMISSALS = ("caught", "bowled", "lbw", "run out", "stumped", "caught and bowled",
+              "retired hurt")
+DISMISSAL_WEIGHTS = (60, 17, 10, 8, 3, 1.5, 0.5)
+WICKET_RATE = 0.05
+SURNAMES = ("Sharma", "Kohli", "Singh", "Patel", "Kumar", "Rahane", "Dhawan", "Pandya",
+            "Iyer", "Jadeja", "Ashwin", "Chahal", "Bumrah", "Shami", "Gill", "Pant",
+            "Samson", "Hooda", "Yadav", "Chahar", "Warner", "Smith", "Maxwell", "Finch",
+            "Williamson", "Boult", "Russell", "Narine", "Pollard", "Rashid", "Nabi",
+            "Buttler", "Stokes", "Archer", "Rabada", "Nortje", "Miller", "Klaasen",
+            "Conway", "Mitchell")
+
+
+def _players(teams, rng, squad=25):
+    """Give every team a squad of unique, stable player names."""
+    names = [f"{chr(65 + i)}{chr(65 + j)} {surname}"
+             for surname in SURNAMES for i in range(26) for j in range(0, 26, 5)]
+    rng.shuffle(names)
+    return {team: names[k * squad:(k + 1) * squad] for k, team in enumerate(sorted(teams))}
+
+
+def _innings(rng, write, match_id, inning, batting, bowling, bat_squad, bowl_squad, chase=None):
+    """Simulate one innings and return its total."""
+    order = rng.sample(bat_squad, 11)
+    bowlers = rng.sample(bowl_squad, 6)
+    fielders = rng.sample(bowl_squad, 11)
+    striker, non_striker, next_in = 0, 1, 2
+    total = wickets = 0
+    for over in range(20):
+        bowler = bowlers[over % len(bowlers)] if over % 2 == 0 else bowlers[(over + 3) % len(bowlers)]
+        legal = ball = 0
+        while legal < 6:
+            ball += 1
+            extras_type, extra_runs, is_legal = "NA", 0, True
+            roll = rng.random()
+            for kind, probability, counts in EXTRAS:
+                if roll < probability:
+                    extras_type, extra_runs, is_legal = kind, 1, counts
+                    break
+                roll -= probability
+            runs = rng.choices(RUNS, RUN_WEIGHTS)[0]
+            if extras_type in ("wides", "legbyes", "byes"):
+                extra_runs, runs = extra_runs + (runs if extras_type != "wides" and runs < 4 else 0), 0
+            player_dismissed = dismissal = fielder = "NA"
+            is_wicket = 0
+            if extras_type != "wides" and rng.random() < WICKET_RATE:
+                is_wicket, runs = 1, 0
+                dismissal = rng.choices(DISMISSALS, DISMISSAL_WEIGHTS)[0]
+                out = non_striker if dismissal == "run out" and rng.random() < 0.4 else striker
+                player_dismissed = order[out]
+                if dismissal in ("caught", "run out", "stumped"):
+                    fielder = rng.choice(fielders)
+            write([match_id, inning, batting, bowling, over, ball, order[striker], bowler,
+                   order[non_striker], runs, extra_runs, runs + extra_runs, extras_type,
+                   is_wicket, player_dismissed, dismissal, fielder])
+            total += runs + extra_runs
+            legal += is_legal
+            if is_wicket:
+                wickets += 1
+                if wickets == 10 or next_in == 11:
+                    return total
+                if order[striker] == player_dismissed:
+                    striker = next_in
+                else:
+                    non_striker = next_in
+                next_in += 1
+            elif runs % 2 == 1:
+                striker, non_striker = non_striker, striker
+            if chase is not None and total > chase:
+                return total
+        striker, non_striker = non_striker, striker
+    return total
+
+
+def generate_ipl(out_dir, rows=BASE_ROWS["ipl"], seed=0):
+    """Write `deliveries.csv` and the matching `matches.csv` with about `rows` deliveries."""
+    rng = random.Random(seed)
+    with open(MATCHES_TEMPLATE, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        matches_header = next(reader)
+        templates = list(reader)
+    teams = {row[7] for row in templates} | {row[8] for row in templates}
+    squads = _players(teams, rng)
+    n_matches = max(1, round(rows / 240))
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / "matches.csv", "w", newline="", encoding="utf-8") as m_fh, \
+            open(out_dir / "deliveries.csv", "w", newline="", encoding="utf-8") as d_fh:
+        matches = csv.writer(m_fh)
+        deliveries = csv.writer(d_fh)
+        matches.writerow(matches_header)
+        deliveries.writerow(DELIVERY_HEADER)
+        for i in range(n_matches):
+            cycle, template = divmod(i, len(templates))
+            match = list(templates[template])
+            match[0] = str(int(match[0]) + cycle * 10_000_000)
+            matches.writerow(match)
+            team1, team2 = match[7], match[8]
+            first = _innings(rng, deliveries.writerow, match[0], 1, team1, team2,
+                             squads[team1], squads[team2])
+            _innings(rng, deliveries.writerow, match[0], 2, team2, team1,
+                     squads[team2], squads[team1], chase=first)
+    return [out_dir / "deliveries.csv", out_dir / "matches.csv"]
+
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+SALES_STATES = {
+    "United States": ["California", "Washington", "Oregon"],
+    "Australia": ["New South Wales", "Victoria", "Queensland"],
+    "United Kingdom": ["England"],
+    "Germany": ["Bayern", "Hessen", "Nordrhein-Westfalen"],
+    "France": ["Seine (Paris)", "Nord", "Yveline"],
+    "Canada": ["British Columbia", "Alberta"],
+}
+SALES_PRODUCTS = [
+    ("Bikes", "Road Bikes", "Road-150 Red, 62", 2171, 3578),
+    ("Bikes", "Mountain Bikes", "Mountain-200 Black, 38", 1252, 2295),
+    ("Bikes", "Touring Bikes", "Touring-1000 Blue, 46", 1482, 2384),
+    ("Accessories", "Helmets", "Sport-100 Helmet, Red", 13, 35),
+    ("Accessories", "Tires and Tubes", "Patch Kit/8 Patches", 1, 2),
+    ("Accessories", "Bottles and Cages", "Water Bottle - 30 oz.", 2, 5),
+    ("Accessories", "Fenders", "Fender Set - Mountain", 8, 22),
+    ("Clothing", "Jerseys", "Long-Sleeve Logo Jersey, M", 38, 50),
+    ("Clothing", "Caps", "AWC Logo Cap", 7, 9),
+    ("Clothing", "Gloves", "Half-Finger Gloves, S", 9, 24),
+]
+
+
+def _age_group(age):
+    if age < 25:
+        return "Youth (<25)"
+    if age < 35:
+        return "Young Adults (25-34)"
+    if age < 65:
+        return "Adults (35-64)"
+    return "Seniors (64+)"
+
+
+def generate_sales(out_dir, rows=BASE_ROWS["sales"], seed=0):
+    """Write `sales_data.csv` with `rows` orders between 2011 and 2016."""
+    rng = random.Random(seed)
+    start = datetime.date(2011, 1, 1)
+    countries = list(SALES_STATES)
+    path = Path(out_dir) / "sales_data.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        out = csv.writer(fh)
+        out.writerow(["Date", "Day", "Month", "Year", "Customer_Age", "Age_Group",
+                      "Customer_Gender", "Country", "State", "Product_Category",
+                      "Sub_Category", "Product", "Order_Quantity", "Unit_Cost", "Unit_Price",
+                      "Profit", "Cost", "Revenue"])
+        for _ in range(rows):
+            day = start + datetime.timedelta(days=rng.randrange(6 * 365))
+            age = rng.randint(17, 87)
+            country = rng.choice(countries)
+            category, sub_category, product, unit_cost, unit_price = rng.choice(SALES_PRODUCTS)
+            quantity = rng.randint(1, 32)
+            cost = quantity * unit_cost
+            revenue = int(quantity * unit_price * rng.uniform(0.7, 1.0))
+            out.writerow([day.isoformat(), day.day, MONTHS[day.month - 1], day.year, age,
+                          _age_group(age), rng.choice("MF"), country,
+                          rng.choice(SALES_STATES[country]), category, sub_category, product,
+                          quantity, unit_cost, unit_price, revenue - cost, cost, revenue])
+    return [path]
+
+
+JOB_TITLES = ["Data Scientist", "Data Engineer", "Data Analyst", "Machine Learning Engineer",
+              "ML Engineer", "AI Engineer", "AI Researcher", "Research Scientist",
+              "Analytics Engineer", "Data Architect", "Applied Scientist",
+              "Senior Data Scientist", "Head of Data", "Business Intelligence Analyst",
+              "Computer Vision Engineer", "NLP Engineer"]
+LEVEL_PAY = {"EN": 85_000, "MI": 125_000, "SE": 165_000, "EX": 200_000}
+LOCATIONS = {"US": 1.0, "GB": 0.7, "CA": 0.8, "DE": 0.7, "IN": 0.3, "FR": 0.6, "ES": 0.5,
+             "AU": 0.8, "NL": 0.7, "BR": 0.35}
+
+
+def generate_salaries(out_dir, rows=BASE_ROWS["salaries"], seed=0):
+    """Write `salaries.csv` with `rows` salary records for 2020-2025."""
+    rng = random.Random(seed)
+    levels, level_weights = list(LEVEL_PAY), [10, 25, 55, 10]
+    locations = list(LOCATIONS)
+    location_weights = [70, 6, 5, 3, 3, 2, 2, 2, 2, 1]
+    path = Path(out_dir) / "salaries.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        out = csv.writer(fh)
+        out.writerow(["work_year", "experience_level", "employment_type", "job_title",
+                      "salary", "salary_currency", "salary_in_usd", "employee_residence",
+                      "remote_ratio", "company_location", "company_size"])
+        for _ in range(rows):
+            year = rng.choices(range(2020, 2026), [2, 4, 10, 25, 35, 24])[0]
+            level = rng.choices(levels, level_weights)[0]
+            location = rng.choices(locations, location_weights)[0]
+            usd = int(LEVEL_PAY[level] * LOCATIONS[location] * rng.lognormvariate(0, 0.3)
+                      * (1 + 0.03 * (year - 2020)))
+            out.writerow([year, level, rng.choices(["FT", "PT", "CT", "FL"], [97, 1, 1, 1])[0],
+                          rng.choice(JOB_TITLES), usd, "USD", usd, location,
+                          rng.choice([0, 50, 100]), location,
+                          rng.choices(["S", "M", "L"], [5, 85, 10])[0]])
+    return [path]
+
+
+ECOM_CATEGORIES = ["Electronics", "Toys", "Books", "Clothing", "Home Appliances"]
+ECOM_REGIONS = ["Asia", "Europe", "North America"]
+
+
+def generate_ecommerce(out_dir, rows=BASE_ROWS["ecommerce"], seed=0):
+    """Write `synthetic_ecommerce_data.csv` with `rows` transactions over 2023-2024."""
+    rng = random.Random(seed)
+    start = datetime.date(2023, 1, 1)
+    customers = max(100, rows // 10)
+    products = max(50, rows // 100)
+    path = Path(out_dir) / "synthetic_ecommerce_data.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        out = csv.writer(fh)
+        out.writerow(["Transaction_ID", "Customer_ID", "Product_ID", "Transaction_Date",
+                      "Units_Sold", "Discount_Applied", "Revenue", "Clicks", "Impressions",
+                      "Conversion_Rate", "Category", "Region", "Ad_CTR", "Ad_CPC", "Ad_Spend"])
+        for i in range(rows):
+            day = start + datetime.timedelta(days=rng.randrange(730))
+            impressions = rng.randint(50, 500)
+            clicks = rng.randint(1, impressions // 5)
+            ctr = clicks / impressions
+            cpc = round(rng.uniform(0.1, 2.0), 2)
+            out.writerow([f"TXN_{i:08d}", f"CUST_{rng.randrange(customers):06d}",
+                          f"PROD_{rng.randrange(products):05d}", day.isoformat(),
+                          rng.randint(1, 50), round(rng.uniform(0, 0.5), 2),
+                          round(rng.uniform(10, 5000), 2), clicks, impressions,
+                          round(rng.uniform(0.01, 0.3), 2), rng.choice(ECOM_CATEGORIES),
+                          rng.choice(ECOM_REGIONS), round(ctr, 4), cpc, round(clicks * cpc, 2)])
+    return [path]
+
+
+# dataset -> (generator, project directory, script)
+GENERATORS = {
+    "ipl": (generate_ipl, "SQL_IPL", "SQL_IPL.py"),
+    "sales": (generate_sales, "SQL_Sales", "SQL_Sales.py"),
+    "salaries": (generate_salaries, "SQL_Data_Scientist", "SQL_DataScientist.py"),
+    "ecommerce": (generate_ecommerce, "SQL_E-Product", "SQL_ECOM.py"),
+}
+
+
+def generate(dataset, out_dir, scale=1.0, rows=None, seed=0):
+    """Generate `dataset` into `out_dir` at `scale` x its base size (or exactly `rows`)."""
+    fn = GENERATORS[dataset][0]
+    rows = rows if rows is not None else max(1, int(BASE_ROWS[dataset] * scale))
+    return fn(out_dir, rows=rows, seed=seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic inputs for the SQL scripts")
+    parser.add_argument("--dataset", choices=[*GENERATORS, "all"], default="all")
+    parser.add_argument("--out", default="data", help="output directory (one sub-folder per project)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiple of the original dataset size (ignored with --rows)")
+    parser.add_argument("--rows", type=int, help="exact number of rows to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for name in GENERATORS if args.dataset == "all" else [args.dataset]:
+        paths = generate(name, Path(args.out) / GENERATORS[name][1], args.scale, args.rows, args.seed)
+        print("wrote", ", ".join(str(p) for p in paths))
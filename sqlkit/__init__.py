@@ -0,0 +1,6 @@
+"""
+🧰 sqlkit — shared helpers for the SQL portfolio scripts.
+
+Each project script (`SQL_IPL.py`, `SQL_Sales.py`, `SQL_DataScientist.py`,
+`SQL_ECOM.py`) puts the repository root on `sys.path` and imports from here.
+"""
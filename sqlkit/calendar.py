@@ -0,0 +1,117 @@
+"""
+📅 Calendar dimension
+
+A shared date dimension for the fact tables.  Instead of parsing the date
+column of every row (`pd.to_datetime` plus `.dt.year/.month/.day`) and
+storing the parts as extra columns, a loader maps each row's date string to
+a compact integer key and the fact table carries only that key:
+
+- `date_key` = `YYYYMMDD` (e.g. 20150103).  Sorting by it sorts by date, and
+  `period_sql` / `year_sql` / `month_sql` get the month parts back with
+  integer arithmetic, without a join.
+- `period` = `year*12 + month`, so consecutive months are consecutive
+  integers across year ends (what month-over-month windows order by).
+
+`date_keys` parses only the distinct strings of a column (a few thousand
+dates for hundreds of thousands of rows) and maps every row through that
+lookup.  `ensure_calendar` writes the `calendar` table, one row per day with
+the date, year, month, day, month name, quarter, weekday and period, and
+regenerates it only when new keys fall outside the range it covers, so a
+persistent database builds it once.
+"""
+
+import pandas as pd
+
+CALENDAR_TABLE = "calendar"
+
+CALENDAR_COLUMNS = {
+    "date_key": "INTEGER PRIMARY KEY",
+    "date": "TEXT",
+    "year": "INTEGER",
+    "month": "INTEGER",
+    "day": "INTEGER",
+    "month_name": "TEXT",
+    "quarter": "INTEGER",
+    "weekday": "TEXT",
+    "period": "INTEGER",
+}
+
+
+def period_sql(key):
+    """SQL expression for the `year*12 + month` period of the date key expression `key`."""
+    return f"({key}/10000*12 + {key}/100%100)"
+
+
+def year_sql(key):
+    """SQL expression for the year of the date key expression `key`."""
+    return f"({key}/10000)"
+
+
+def month_sql(key):
+    """SQL expression for the month (1-12) of the date key expression `key`."""
+    return f"({key}/100%100)"
+
+
+def date_keys(values, format=None):
+    """
+    Integer `YYYYMMDD` keys for a column of date strings, as a nullable
+    Int64 Series.  Each distinct string is parsed once; unparseable or
+    missing dates get <NA>.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Index(uniques), format=format, errors="coerce")
+    lookup = pd.array(parsed.year * 10000 + parsed.month * 100 + parsed.day, dtype="Int64")
+    return pd.Series(lookup.take(codes, allow_fill=True), index=values.index, name="date_key")
+
+
+def calendar_frame(first_key, last_key):
+    """One row per day from `first_key` to `last_key` (inclusive), in `CALENDAR_COLUMNS` order."""
+    days = pd.date_range(pd.to_datetime(str(first_key)), pd.to_datetime(str(last_key)), freq="D")
+    return pd.DataFrame({
+        "date_key": days.year * 10000 + days.month * 100 + days.day,
+        "date": days.strftime("%Y-%m-%d"),
+        "year": days.year,
+        "month": days.month,
+        "day": days.day,
+        "month_name": days.month_name(),
+        "quarter": days.quarter,
+        "weekday": days.day_name(),
+        "period": days.year * 12 + days.month,
+    })
+
+
+def _covered(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CALENDAR_TABLE,)
+    ).fetchone()
+    if not exists:
+        return None, None
+    return conn.execute(f"SELECT MIN(date_key), MAX(date_key) FROM {CALENDAR_TABLE}").fetchone()
+
+
+def ensure_calendar(conn, keys):
+    """
+    Make the `calendar` table cover every date in `keys` (date keys; NA is
+    ignored).  Returns the number of days written, 0 when it already did.
+    """
+    keys = pd.Series(keys).dropna()
+    if keys.empty:
+        return 0
+    first, last = int(keys.min()), int(keys.max())
+    low, high = _covered(conn)
+    if low is not None and low <= first and last <= high:
+        return 0
+    if low is not None:
+        first, last = min(first, low), max(last, high)
+    frame = calendar_frame(first, last)
+    conn.execute(f"DROP TABLE IF EXISTS {CALENDAR_TABLE}")
+    conn.execute(
+        f"CREATE TABLE {CALENDAR_TABLE} ("
+        + ", ".join(f"{col} {col_type}" for col, col_type in CALENDAR_COLUMNS.items()) + ")"
+    )
+    conn.executemany(
+        f"INSERT INTO {CALENDAR_TABLE} VALUES ({', '.join('?' * len(CALENDAR_COLUMNS))})",
+        frame.astype(object).itertuples(index=False, name=None),
+    )
+    conn.commit()
+    return len(frame)
@@ -0,0 +1,113 @@
+"""
+🧱 Columnar CSV cache
+
+`read_csv_cached` is a drop-in for `pd.read_csv` that keeps a typed Arrow
+IPC (Feather v2) copy of each CSV next to it, e.g. `deliveries.feather` beside
+`deliveries.csv`.  The first run parses the text and writes the cache; later
+runs memory-map the Feather file instead, so CSV parsing drops out of the
+startup path and the dtypes come back exactly as they were first read.
+
+The cache is written uncompressed (memory-mapping a compressed file would
+decompress it anyway) and records the size and mtime of its CSV plus the
+`read_csv` options in the Arrow schema metadata; if any of them change it is
+rewritten.  Without `pyarrow` installed the function is plain `pd.read_csv`.
+
+`columnar_load` is the loader the scripts use for `--loader columnar`: the
+cached frame goes into SQLite through `sqlkit.bulkload.bulk_load_frame`.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from sqlkit.bulkload import LoadStats, bulk_load_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = feather = None
+
+CACHE_SUFFIX = ".feather"
+METADATA_KEY = b"sqlkit.source"
+
+
+def cache_path(path):
+    """Location of the columnar cache for the CSV at `path`."""
+    return Path(path).with_suffix(CACHE_SUFFIX)
+
+
+def _source_stamp(path, read_options):
+    stat = os.stat(path)
+    return json.dumps(
+        {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "options": read_options},
+        sort_keys=True, default=str,
+    ).encode()
+
+
+def _read_cache(cache, stamp):
+    """Memory-map `cache` and return it as a DataFrame, or None if it is stale."""
+    try:
+        table = feather.read_table(cache, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (table.schema.metadata or {}).get(METADATA_KEY) != stamp:
+        return None
+    return table.to_pandas()
+
+
+def _write_cache(cache, df, stamp):
+    """Write `df` to `cache` atomically; a read-only directory just skips it."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: stamp})
+    tmp = cache.with_name(cache.name + ".tmp")
+    try:
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, cache)
+    except OSError:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def read_csv_cached(path, **read_options):
+    """
+    Read a CSV through its columnar cache.
+
+    `read_options` are passed to `pd.read_csv` when the cache has to be
+    (re)built and are part of its stamp, so asking for different dtypes
+    rebuilds the cache rather than returning the old ones.
+    """
+    return _cached_frame(path, read_options)[0]
+
+
+def _cached_frame(path, read_options):
+    """Return (DataFrame, whether it came from the cache)."""
+    if feather is None:
+        return pd.read_csv(path, **read_options), False
+    cache = cache_path(path)
+    stamp = _source_stamp(path, read_options)
+    if cache.exists():
+        df = _read_cache(cache, stamp)
+        if df is not None:
+            return df, True
+    df = pd.read_csv(path, **read_options)
+    _write_cache(cache, df, stamp)
+    return df, False
+
+
+def columnar_load(conn, table, path, report=False, **read_options):
+    """
+    Timed `read_csv_cached` + `bulk_load_frame`: load a CSV into `table`
+    through its columnar cache.
+    """
+    start = time.perf_counter()
+    df, hit = _cached_frame(path, read_options)
+    bulk_load_frame(conn, table, df)
+    method = "feather cache" if hit else "read_csv + feather"
+    stats = LoadStats(table, len(df), time.perf_counter() - start, method)
+    if report:
+        print(stats)
+    return stats
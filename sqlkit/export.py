@@ -0,0 +1,257 @@
+"""
+📤 Result export
+
+Writes the output of registered queries to files instead of printing it: one
+file per query in CSV, JSON Lines or Parquet, plus a `manifest.json`
+describing what was written.
+
+Rows stream from the SQLite cursor straight into the writer in batches of
+`BATCH_ROWS` (`fetchmany`), so no DataFrame is built and memory stays at one
+batch whatever the size of the result.  Queries computed in Python (`fn`)
+already return a DataFrame, which is written through the same writers.
+
+- CSV and JSON Lines can be gzip-compressed (`compression="gzip"`, files get
+  a `.gz` suffix).
+- Parquet needs `pyarrow`; `compression` is the Parquet codec (snappy, zstd,
+  gzip, ...).  Column types are inferred from the rows: a column that has
+  only been NULL so far is written as strings, and when a later batch needs
+  a wider type (values in such a column, floats after integers, mixed types
+  as strings) the file written so far is streamed into a copy with the
+  widened schema before the batch is added.
+
+The manifest lists every file with its query, title, columns, row count,
+size in bytes and the seconds spent writing it.
+"""
+
+import csv
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from sqlkit.parallel import ReadOnlyPool
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pq = None
+
+FORMATS = ("csv", "jsonl", "parquet")
+BATCH_ROWS = 10_000
+MANIFEST = "manifest.json"
+
+
+def export_path(directory, name, fmt, compression=None):
+    """File an export of query `name` is written to."""
+    suffix = "." + fmt
+    if compression == "gzip" and fmt != "parquet":
+        suffix += ".gz"
+    return Path(directory) / (name + suffix)
+
+
+def _open_text(path, compression):
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression:
+        raise ValueError(f"unsupported compression for text exports: {compression!r}")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_csv(path, columns, batches, compression):
+    rows = 0
+    with _open_text(path, compression) as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(batch)
+            rows += len(batch)
+    return rows
+
+
+def _write_jsonl(path, columns, batches, compression):
+    rows = 0
+    with _open_text(path, compression) as fh:
+        for batch in batches:
+            fh.writelines(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in batch)
+            rows += len(batch)
+    return rows
+
+
+def _arrow_type(values):
+    """Arrow type of a column of Python values (null when all are None)."""
+    try:
+        return pa.array(values).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.string()
+
+
+def _widen(old, new, unknown):
+    """Type that holds values of `old` and `new`; `unknown` if `old` only held NULLs."""
+    if pa.types.is_null(new) or new == old:
+        return old
+    if unknown:
+        return new
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(check(old) for check in numeric) and any(check(new) for check in numeric):
+        return pa.float64()
+    return pa.string()
+
+
+def _arrow_batch(values, schema):
+    arrays = []
+    for column, field in zip(values, schema):
+        if pa.types.is_string(field.type):
+            column = [None if value is None else str(value) for value in column]
+        arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _write_parquet(path, columns, batches, compression):
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    codec = compression or "snappy"
+    path = Path(path)
+    # Widening the schema copies the file between `path` and `spare`.
+    current, spare = path, path.with_name(path.name + ".tmp")
+    rows = 0
+    schema = writer = None
+    unknown = set(range(len(columns)))  # columns with only NULLs so far
+    try:
+        for batch in batches:
+            values = [list(column) for column in zip(*batch)]
+            types = [_arrow_type(column) for column in values]
+            if schema is None:
+                schema = pa.schema([
+                    pa.field(name, pa.string() if pa.types.is_null(t) else t)
+                    for name, t in zip(columns, types)
+                ])
+                writer = pq.ParquetWriter(current, schema, compression=codec)
+            widened = pa.schema([
+                pa.field(field.name, _widen(field.type, t, i in unknown))
+                for i, (field, t) in enumerate(zip(schema, types))
+            ])
+            if not widened.equals(schema):
+                writer.close()
+                writer = pq.ParquetWriter(spare, widened, compression=codec)
+                with pq.ParquetFile(current) as written:
+                    for old in written.iter_batches():
+                        writer.write_table(pa.Table.from_batches([old]).cast(widened))
+                current, spare, schema = spare, current, widened
+            unknown -= {i for i, t in enumerate(types) if not pa.types.is_null(t)}
+            writer.write_batch(_arrow_batch(values, schema))
+            rows += len(batch)
+        if writer is None:
+            schema = pa.schema([pa.field(name, pa.string()) for name in columns])
+            writer = pq.ParquetWriter(current, schema, compression=codec)
+            writer.write_batch(_arrow_batch([[] for _ in columns], schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if current != path:
+        os.replace(current, path)
+    elif spare.exists():
+        spare.unlink()
+    return rows
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def _cursor_batches(cursor, transform=None, size=None):
+    columns = [d[0] for d in cursor.description]
+    while True:
+        batch = cursor.fetchmany(size or BATCH_ROWS)
+        if not batch:
+            return
+        yield transform(columns, batch) if transform else batch
+
+
+def _plain(value):
+    """Python scalar for a DataFrame cell, None for missing values."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _frame_batches(df, size=None):
+    size = size or BATCH_ROWS
+    for start in range(0, len(df), size):
+        chunk = df.iloc[start:start + size]
+        yield [tuple(_plain(v) for v in row) for row in chunk.itertuples(index=False, name=None)]
+
+
+def export_query(conn, sql, path, fmt="csv", compression=None, params=None, transform=None):
+    """
+    Stream the result of `sql` into `path`; returns (columns, rows written).
+
+    `transform(columns, rows)` may rewrite each batch before it is written
+    (e.g. to decode ids back to names).
+    """
+    cursor = conn.execute(sql, params or ())
+    columns = [d[0] for d in cursor.description]
+    return columns, WRITERS[fmt](path, columns, _cursor_batches(cursor, transform), compression)
+
+
+def export_frame(df, path, fmt="csv", compression=None):
+    """Write an already computed DataFrame with the same writers; returns (columns, rows)."""
+    columns = [str(c) for c in df.columns]
+    return columns, WRITERS[fmt](path, columns, _frame_batches(df), compression)
+
+
+def export_queries(registry, queries, conn, directory, fmt="csv", compression=None, jobs=1,
+                   transform=None):
+    """
+    Export every query in `queries` (from a `sqlkit.registry.QueryRegistry`)
+    to `directory` and write the manifest; returns the manifest entries.
+
+    Prerequisites are built first; with `jobs > 1` the files are written
+    concurrently over a `ReadOnlyPool`.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (choose from {', '.join(FORMATS)})")
+    if fmt != "parquet" and compression not in (None, "gzip"):
+        raise ValueError(f"{fmt} exports support only gzip compression, not {compression!r}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    registry.build(registry.required(queries))
+
+    def export_one(query, db):
+        path = export_path(directory, query.name, fmt, compression)
+        start = time.perf_counter()
+        if query.fn is not None:
+            columns, rows = export_frame(query.fn(db), path, fmt, compression)
+        else:
+            sql = query.sql(db) if callable(query.sql) else query.sql
+            columns, rows = export_query(db, sql, path, fmt, compression, transform=transform)
+        return {
+            "query": query.name,
+            "title": query.title.strip().rstrip(":"),
+            "file": path.name,
+            "columns": columns,
+            "rows": rows,
+            "bytes": path.stat().st_size,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+
+    if jobs > 1 and len(queries) > 1:
+        with ReadOnlyPool(conn, jobs) as pool:
+            entries = pool.map(export_one, queries)
+    else:
+        entries = [export_one(query, conn) for query in queries]
+
+    manifest = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "format": fmt,
+        "compression": compression,
+        "files": entries,
+    }
+    with open(directory / MANIFEST, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    print(f"Exported {len(entries)} queries ({sum(e['rows'] for e in entries):,} rows) "
+          f"as {fmt} to {directory}")
+    return entries
@@ -0,0 +1,146 @@
+"""
+⏱️ Query instrumentation
+
+`QueryProfiler` wraps the `pd.read_sql_query` calls of the project scripts.
+For every query it records the wall time, the number of rows returned and
+SQLite's `EXPLAIN QUERY PLAN`, flagging full table scans (a `SCAN` step that
+uses no index) and temporary B-trees (sorts for ORDER BY / GROUP BY /
+DISTINCT that no index could serve).
+
+The scripts also hand it the `sqlkit.bulkload.LoadStats` of their table
+loads (`record_load`).  After a run, `print_report` prints the loads and the
+queries slowest first, and `write_jsonl` writes one JSON object per load and
+per query (plan included) so runs can be diffed or loaded elsewhere.  A disabled profiler is a plain pass-through to
+`pd.read_sql_query`, so the scripts can always call through it.
+"""
+
+import json
+import sys
+import time
+from typing import NamedTuple
+
+import pandas as pd
+
+
+class QueryRecord(NamedTuple):
+    name: str
+    seconds: float
+    rows: int
+    plan: list
+    full_scans: list
+    temp_btrees: list
+
+
+def explain(conn, sql, params=None):
+    """Return the `EXPLAIN QUERY PLAN` of `sql` as indented text lines."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return lines
+
+
+def plan_flags(plan):
+    """
+    Split the plan steps worth a look into (full scans, temp B-trees).
+
+    A full scan is a `SCAN` of a table without an index; scans of
+    subqueries, materialized CTEs and constant rows are not counted.
+    """
+    steps = [line.strip() for line in plan]
+    derived = {
+        step.split(" ", 1)[1] for step in steps
+        if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))
+    }
+    full_scans = [
+        step for step in steps
+        if step.startswith("SCAN ") and " USING " not in step
+        and not step.startswith(("SCAN (", "SCAN CONSTANT ROW"))
+        and step.split(" ", 1)[1] not in derived
+    ]
+    temp_btrees = [step for step in steps if "TEMP B-TREE" in step]
+    return full_scans, temp_btrees
+
+
+class QueryProfiler:
+    """Times queries, keeps their plans and reports on them."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+        self.loads = []
+
+    def record_load(self, stats):
+        """Keep the `LoadStats` of a table load when enabled."""
+        if self.enabled:
+            self.loads.append(stats)
+
+    def read_sql_query(self, sql, conn, name=None, params=None):
+        """Drop-in for `pd.read_sql_query` that records the query when enabled."""
+        if not self.enabled:
+            return pd.read_sql_query(sql, conn, params=params)
+        name = name or f"query {len(self.records) + 1}"
+        plan = explain(conn, sql, params)
+        start = time.perf_counter()
+        result = pd.read_sql_query(sql, conn, params=params)
+        seconds = time.perf_counter() - start
+        self.records.append(QueryRecord(name, seconds, len(result), plan, *plan_flags(plan)))
+        return result
+
+    def call(self, name, fn):
+        """Time a step that is not a single SQL query (no plan is recorded)."""
+        if not self.enabled:
+            return fn()
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        rows = len(result) if hasattr(result, "__len__") else 0
+        self.records.append(QueryRecord(name, seconds, rows, [], [], []))
+        return result
+
+    def report(self):
+        """One row per query, slowest first."""
+        rows = [
+            {
+                "query": r.name,
+                "seconds": round(r.seconds, 4),
+                "rows": r.rows,
+                "full scans": ", ".join(step.split()[1] for step in r.full_scans),
+                "temp b-trees": ", ".join(step.split(" FOR ", 1)[-1] for step in r.temp_btrees),
+            }
+            for r in self.records
+        ]
+        report = pd.DataFrame(rows, columns=["query", "seconds", "rows", "full scans", "temp b-trees"])
+        return report.sort_values("seconds", ascending=False, kind="stable").reset_index(drop=True)
+
+    def print_report(self, plans=False):
+        """Print the report; with `plans` also the plan of every flagged query."""
+        for stats in self.loads:
+            print(stats)
+        if not self.records:
+            return
+        total = sum(r.seconds for r in self.records)
+        print(f"\nQuery profile ({len(self.records)} queries, {total:.3f}s):")
+        print(self.report().to_string(index=False))
+        if plans:
+            for r in sorted(self.records, key=lambda r: r.seconds, reverse=True):
+                if r.full_scans or r.temp_btrees:
+                    print(f"\n{r.name}:")
+                    print("\n".join(r.plan))
+
+    def write_jsonl(self, path):
+        """
+        Write one JSON object per load, then per query, to `path` ("-" for
+        stdout); `kind` is "load" or "query".
+        """
+        out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+        try:
+            for stats in self.loads:
+                out.write(json.dumps({"kind": "load", **stats._asdict()}) + "\n")
+            for r in self.records:
+                out.write(json.dumps({"kind": "query", **r._asdict()}) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
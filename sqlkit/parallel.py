@@ -0,0 +1,90 @@
+"""
+🧵 Parallel read-only query execution
+
+The report queries only read the database once it is loaded, so they can run
+side by side.  `ReadOnlyPool` fans work out over a thread pool in which every
+worker holds its own read-only connection (`mode=ro` URI) to the same
+database file:
+
+- a file-backed database (the IPL cache, `sales_data.db`) is opened directly,
+  after committing anything pending on the loading connection;
+- an in-memory database is first copied with the SQLite backup API into a
+  temporary file, which is removed when the pool closes.
+
+Each connection is private to its thread, so SQLite runs the queries in
+parallel; the sqlite3 module releases the GIL while a statement steps.
+`map` returns results in the order of its input, whatever order the queries
+finish in, so a report prints exactly as it would serially.
+"""
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def database_file(conn):
+    """
+    Return (path, temporary directory or None) of a file holding the main
+    database of `conn`, snapshotting an in-memory database to a temp file.
+    """
+    for _, name, file in conn.execute("PRAGMA database_list"):
+        if name == "main" and file:
+            conn.commit()
+            return Path(file), None
+    tmpdir = tempfile.mkdtemp(prefix="sqlkit-")
+    path = Path(tmpdir) / "snapshot.db"
+    target = sqlite3.connect(path)
+    try:
+        conn.backup(target)
+    finally:
+        target.close()
+    return path, tmpdir
+
+
+class ReadOnlyPool:
+    """A thread pool whose workers each query the database of `conn` read-only."""
+
+    def __init__(self, conn, jobs):
+        self.path, self._tmpdir = database_file(conn)
+        self.uri = self.path.resolve().as_uri() + "?mode=ro"
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="sqlkit-ro")
+
+    def connection(self):
+        """The calling worker's read-only connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Closed from the main thread in `close`, hence check_same_thread=False.
+            conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def map(self, fn, items):
+        """Run `fn(item, conn)` for every item across the pool; results in input order."""
+        futures = [
+            self._executor.submit(lambda item=item: fn(item, self.connection()))
+            for item in items
+        ]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
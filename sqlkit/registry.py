@@ -0,0 +1,181 @@
+"""
+🗃️ Query registry
+
+Each project script registers its report queries here instead of running a
+fixed sequence of `queryXN` strings, so a run can be narrowed to the queries
+it needs:
+
+- `--only querya1 querya3` runs just those queries,
+- `--tag salary` runs every query carrying that tag,
+- `--list` prints the registered queries and exits before loading anything.
+
+A query may name prerequisites (`requires`): tables or rollups that must
+exist before it runs.  Each prerequisite is registered once with the function
+that builds it and is built on first use, after its own prerequisites, so a
+targeted run only pays for what its queries read.
+
+`sql` may be a callable taking the connection when the text depends on the
+loaded data; it is resolved only when the query runs.  A query with `fn`
+instead of `sql` is a step computed in Python: `fn(conn)` returns a DataFrame.
+
+With `jobs > 1` (`--jobs N`) every prerequisite is built first and the
+queries then run concurrently over a `sqlkit.parallel.ReadOnlyPool`; results
+are still printed in registration order.
+"""
+
+from typing import Callable, NamedTuple, Optional
+
+import pandas as pd
+
+from sqlkit.parallel import ReadOnlyPool
+
+
+class UnknownQueryError(ValueError):
+    """Raised when a selection names a query or tag that is not registered."""
+
+
+class Query(NamedTuple):
+    name: str
+    title: str
+    sql: object = None
+    fn: Optional[Callable] = None
+    tags: tuple = ()
+    requires: tuple = ()
+
+
+class QueryRegistry:
+    """An ordered set of named, tagged report queries and their prerequisites."""
+
+    def __init__(self):
+        self.queries = {}
+        self.prerequisites = {}
+        self.built = set()
+
+    def add(self, name, title, sql=None, fn=None, tags=(), requires=()):
+        """Register a query; `sql` (text) or `fn` (returns a DataFrame) is required."""
+        if name in self.queries:
+            raise ValueError(f"query {name!r} is already registered")
+        if (sql is None) == (fn is None):
+            raise ValueError(f"query {name!r} needs exactly one of sql or fn")
+        query = Query(name, title, sql, fn, tuple(tags), tuple(requires))
+        self.queries[name] = query
+        return query
+
+    def prerequisite(self, name, build, requires=()):
+        """Register `build()` as the step that creates prerequisite `name`."""
+        self.prerequisites[name] = (build, tuple(requires))
+
+    def tags(self):
+        """Every tag in use, in registration order."""
+        return list(dict.fromkeys(tag for q in self.queries.values() for tag in q.tags))
+
+    def select(self, only=None, tags=None):
+        """
+        The queries named in `only` and/or carrying any of `tags`, in
+        registration order; every query when neither is given.  Unknown
+        names or tags raise `UnknownQueryError`.
+        """
+        unknown = [name for name in only or () if name not in self.queries]
+        unknown += [tag for tag in tags or () if tag not in self.tags()]
+        if unknown:
+            raise UnknownQueryError("unknown queries or tags: " + ", ".join(unknown))
+        if not only and not tags:
+            return list(self.queries.values())
+        return [
+            q for q in self.queries.values()
+            if q.name in (only or ()) or set(q.tags) & set(tags or ())
+        ]
+
+    def required(self, queries):
+        """Prerequisite names needed by `queries`, dependencies first."""
+        order = []
+
+        def visit(name):
+            if name in order:
+                return
+            if name not in self.prerequisites:
+                raise ValueError(f"unknown prerequisite {name!r}")
+            for dependency in self.prerequisites[name][1]:
+                visit(dependency)
+            order.append(name)
+
+        for query in queries:
+            for name in query.requires:
+                visit(name)
+        return order
+
+    def build(self, names):
+        """Build the prerequisites in `names` that have not been built yet."""
+        for name in names:
+            if name not in self.built:
+                self.prerequisites[name][0]()
+                self.built.add(name)
+
+    def listing(self, queries=None):
+        """One row per query: name, tags, prerequisites and title."""
+        rows = [
+            {
+                "query": q.name,
+                "tags": ", ".join(q.tags),
+                "requires": ", ".join(q.requires),
+                "title": q.title.strip().rstrip(":"),
+            }
+            for q in (self.queries.values() if queries is None else queries)
+        ]
+        return pd.DataFrame(rows, columns=["query", "tags", "requires", "title"])
+
+    def execute(self, query, conn, profiler):
+        """Run one query on `conn` through `profiler` (a `sqlkit.instrument.QueryProfiler`)."""
+        if query.fn is not None:
+            return profiler.call(query.name, lambda: query.fn(conn))
+        sql = query.sql(conn) if callable(query.sql) else query.sql
+        return profiler.read_sql_query(sql, conn, name=query.name)
+
+    def run(self, queries, conn, profiler, execute=None, jobs=1):
+        """
+        Run `queries`, building their prerequisites first, and print each
+        title and result in order; returns {name: result}.
+
+        Queries run through `execute` (default `self.execute` with `profiler`),
+        called as `execute(query, conn)`.  With `jobs > 1` they run on a pool
+        of read-only connections to `conn`'s database instead of on `conn`.
+        """
+        if execute is None:
+            def execute(query, db):
+                return self.execute(query, db, profiler)
+
+        if jobs > 1 and len(queries) > 1:
+            self.build(self.required(queries))
+            with ReadOnlyPool(conn, jobs) as pool:
+                outputs = pool.map(execute, queries)
+        else:
+            outputs = (self._run_one(query, conn, execute) for query in queries)
+
+        results = {}
+        for query, result in zip(queries, outputs):
+            print("\n" + query.title)
+            print(result)
+            results[query.name] = result
+        return results
+
+    def _run_one(self, query, conn, execute):
+        self.build(self.required([query]))
+        return execute(query, conn)
+
+
+def add_arguments(parser):
+    """Add the query selection, `--jobs` and `--export` options to a script's parser."""
+    parser.add_argument("--only", nargs="+", metavar="QUERY",
+                        help="run only these queries (see --list)")
+    parser.add_argument("--tag", dest="tags", nargs="+", metavar="TAG",
+                        help="run only the queries carrying any of these tags")
+    parser.add_argument("--list", dest="list_queries", action="store_true",
+                        help="list the registered queries with their tags and exit")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="run the queries on N read-only connections in parallel")
+    parser.add_argument("--export", dest="export_dir", metavar="DIR",
+                        help="write each query's result to a file in DIR (plus manifest.json) instead of printing")
+    parser.add_argument("--export-format", choices=["csv", "jsonl", "parquet"], default="csv",
+                        help="file format for --export")
+    parser.add_argument("--compression", metavar="CODEC",
+                        help="gzip for csv/jsonl exports; a Parquet codec (snappy, zstd, gzip) for parquet")
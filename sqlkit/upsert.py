@@ -0,0 +1,167 @@
+"""
+🔁 Incremental upsert
+
+Keeps a persistent SQLite table in step with its CSV without replacing it.
+`DataFrame.to_sql(..., if_exists="replace")` rewrites the whole table on
+every run and drops every index built on it; `upsert_frame` instead stages
+the incoming rows in a temporary table and, in one transaction,
+
+- inserts rows whose natural key is new,
+- updates rows whose key exists but whose other columns changed,
+- deletes rows whose key is no longer in the file,
+
+leaving unchanged rows (and the indexes over them) untouched.  Rows that
+repeat the same natural key are told apart by their ordinal among those
+duplicates, stored in an extra `_dup` column; the key plus `_dup` carries a
+UNIQUE index, which is what the `ON CONFLICT` upsert targets.  Key columns
+must not be NULL.
+
+The database is switched to WAL journaling so readers are not blocked while
+a load is written.  `source_unchanged` / `record_source` remember the size
+and mtime of the CSV a table was last loaded from, so an unchanged file is
+not even parsed.
+"""
+
+import os
+import time
+from typing import NamedTuple
+
+from sqlkit.bulkload import _frame_schema, append_frame
+
+ORDINAL_COLUMN = "_dup"
+SOURCES_TABLE = "_sources"
+STAGE_TABLE = "_upsert_stage"
+
+
+class UpsertStats(NamedTuple):
+    table: str
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    seconds: float
+
+    def __str__(self):
+        return (f"Upserted {self.table} in {self.seconds:.2f}s: {self.inserted:,} new, "
+                f"{self.updated:,} changed, {self.deleted:,} removed, {self.unchanged:,} unchanged")
+
+
+def enable_wal(conn):
+    """Switch the database to write-ahead logging (persistent in the file)."""
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+
+def _create(conn, table, schema, key):
+    columns = ", ".join(f"{_quote(col)} {col_type}" for col, col_type in schema.items())
+    conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+    conn.execute(f"CREATE TABLE {_quote(table)} ({columns})")
+    conn.execute(
+        f"CREATE UNIQUE INDEX {_quote(table + '_natural_key')} ON {_quote(table)} "
+        f"({', '.join(_quote(col) for col in [*key, ORDINAL_COLUMN])})"
+    )
+
+
+def upsert_frame(conn, table, df, key, report=True):
+    """
+    Bring `table` in line with `df`, matching rows on the `key` columns.
+
+    The table (with its unique key index) is created on first use, and
+    recreated if its columns no longer match the frame's.  Returns an
+    `UpsertStats`.
+    """
+    start = time.perf_counter()
+    df = df.assign(**{ORDINAL_COLUMN: df.groupby(list(key), sort=False).cumcount()})
+    schema = _frame_schema(df)
+    columns = list(schema)
+    key_columns = [*key, ORDINAL_COLUMN]
+    values = [col for col in columns if col not in key_columns]
+    match = " AND ".join(f"t.{_quote(col)} = s.{_quote(col)}" for col in key_columns)
+    differs = " OR ".join(f"{_quote(table)}.{_quote(col)} IS NOT excluded.{_quote(col)}" for col in values)
+    names = ", ".join(_quote(col) for col in columns)
+
+    enable_wal(conn)
+    conn.execute("BEGIN")
+    try:
+        if _columns(conn, table) != columns:
+            _create(conn, table, schema, key)
+        conn.execute(f"DROP TABLE IF EXISTS temp.{STAGE_TABLE}")
+        conn.execute(f"CREATE TEMP TABLE {STAGE_TABLE} AS SELECT * FROM {_quote(table)} WHERE 0")
+        append_frame(conn, STAGE_TABLE, df[columns])
+        # Indexed so finding removed rows is a probe per row rather than a scan.
+        conn.execute(
+            f"CREATE INDEX temp.{STAGE_TABLE}_key ON {STAGE_TABLE} "
+            f"({', '.join(_quote(col) for col in key_columns)})"
+        )
+        inserted = conn.execute(
+            f"SELECT COUNT(*) FROM {STAGE_TABLE} AS s "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {_quote(table)} AS t WHERE {match})"
+        ).fetchone()[0]
+        # `WHERE true` keeps the parser from reading ON CONFLICT as a join constraint.
+        written = conn.execute(
+            f"INSERT INTO {_quote(table)} ({names}) SELECT {names} FROM {STAGE_TABLE} WHERE true "
+            f"ON CONFLICT ({', '.join(_quote(col) for col in key_columns)}) DO UPDATE SET "
+            + ", ".join(f"{_quote(col)} = excluded.{_quote(col)}" for col in values)
+            + (f" WHERE {differs}" if values else "")
+        ).rowcount
+        deleted = conn.execute(
+            f"DELETE FROM {_quote(table)} AS t "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {STAGE_TABLE} AS s WHERE {match})"
+        ).rowcount
+        conn.execute(f"DROP TABLE temp.{STAGE_TABLE}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    updated = written - inserted
+    stats = UpsertStats(table, inserted, updated, deleted, len(df) - inserted - updated,
+                        time.perf_counter() - start)
+    if report:
+        print(stats)
+    return stats
+
+
+def _ensure_sources(conn):
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {SOURCES_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL)"""
+    )
+
+
+def source_unchanged(conn, table, path):
+    """True when `table` was last loaded from `path` and the file has not changed since."""
+    _ensure_sources(conn)
+    stat = os.stat(path)
+    row = conn.execute(
+        f"SELECT path, size, mtime_ns FROM {SOURCES_TABLE} WHERE table_name = ?", (table,)
+    ).fetchone()
+    return row == (os.fspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def record_source(conn, table, path):
+    """Remember the size and mtime of the CSV `table` was just loaded from."""
+    _ensure_sources(conn)
+    stat = os.stat(path)
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?, ?)",
+        (table, os.fspath(path), stat.st_size, stat.st_mtime_ns),
+    )
+    conn.commit()
+
+
+def forget_source(conn, table):
+    """Drop the recorded source of `table` (after it was loaded some other way)."""
+    _ensure_sources(conn)
+    conn.execute(f"DELETE FROM {SOURCES_TABLE} WHERE table_name = ?", (table,))
+    conn.commit()
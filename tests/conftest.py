@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The scripts import `sqlkit` from the repository root and their sibling
+# modules (`ipl_store`, `ipl_rollups`, ...) from their own directory.
+for path in (ROOT, ROOT / "SQL_IPL"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture(scope="session")
+def ipl_csvs(tmp_path_factory):
+    """A small seeded deliveries.csv / matches.csv pair (about 12 matches)."""
+    from benchmarks.generators import generate_ipl
+
+    return generate_ipl(tmp_path_factory.mktemp("ipl"), rows=3_000, seed=7)
@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+from sqlkit import export
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def sparse(monkeypatch):
+    """20 rows read in batches of 5, with columns that stay NULL for a while."""
+    monkeypatch.setattr(export, "BATCH_ROWS", 5)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER, dismissed TEXT, runs, score)")
+    conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?)", [
+        (i, None if i < 7 else f"player {i}", None if i < 12 else i / 2, i if i < 15 else "DNB")
+        for i in range(20)
+    ])
+    return conn
+
+
+def test_parquet_widens_columns_that_start_null(tmp_path, sparse):
+    path = tmp_path / "t.parquet"
+    columns, rows = export.export_query(sparse, "SELECT * FROM t ORDER BY id", path, "parquet")
+    table = pq.read_table(path)
+    assert rows == 20 and table.column_names == columns
+    assert [str(field.type) for field in table.schema] == ["int64", "string", "double", "string"]
+    data = table.to_pydict()
+    assert data["dismissed"] == [None] * 7 + [f"player {i}" for i in range(7, 20)]
+    assert data["runs"] == [None] * 12 + [i / 2 for i in range(12, 20)]
+    assert data["score"] == [str(i) for i in range(15)] + ["DNB"] * 5
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_parquet_keeps_all_null_columns_as_strings(tmp_path, sparse):
+    path = tmp_path / "t.parquet"
+    export.export_query(sparse, "SELECT id, NULL AS missing FROM t", path, "parquet")
+    table = pq.read_table(path)
+    assert str(table.schema.field("missing").type) == "string"
+    assert table.column("missing").null_count == 20
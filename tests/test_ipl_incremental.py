@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ipl_store import open_database
+
+TOTALS = "SELECT match_id, SUM(total_runs) FROM IPL GROUP BY match_id ORDER BY match_id"
+SCORECARD = "SELECT match_id, SUM(runs) FROM batting_scorecard GROUP BY match_id ORDER BY match_id"
+
+
+def _lines(path):
+    with open(path, "rb") as fh:
+        return fh.readlines()
+
+
+def _write(path, lines):
+    with open(path, "wb") as fh:
+        fh.writelines(lines)
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def season(tmp_path, ipl_csvs):
+    """
+    CSVs holding all but the last three matches, and the full CSVs they grow
+    into by a pure append.
+    """
+    deliveries, matches = ipl_csvs
+    match_lines = _lines(matches)
+    delivery_lines = _lines(deliveries)
+    kept = {int(line.split(b",", 1)[0]) for line in match_lines[1:-3]}
+    first_new = next(
+        i for i, line in enumerate(delivery_lines[1:], 1) if int(line.split(b",", 1)[0]) not in kept
+    )
+    paths = {name: tmp_path / name for name in ("deliveries.csv", "matches.csv")}
+    _write(paths["deliveries.csv"], delivery_lines[:first_new])
+    _write(paths["matches.csv"], match_lines[:-3])
+    full = {"deliveries.csv": delivery_lines, "matches.csv": match_lines}
+    return paths, full
+
+
+def _snapshot(conn):
+    return conn.execute(TOTALS).fetchall(), conn.execute(SCORECARD).fetchall()
+
+
+def _fresh(deliveries, matches):
+    conn = open_database(deliveries, matches)
+    try:
+        return _snapshot(conn)
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("options", [{}, {"player_ids": True}, {"partition_seasons": True}])
+def test_appending_new_matches_matches_a_fresh_build(tmp_path, season, options, capsys):
+    paths, full = season
+    cache = tmp_path / "ipl.db"
+    open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache, **options).close()
+
+    for name, lines in full.items():
+        _write(paths[name], lines)
+    conn = open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache,
+                         incremental=True, **options)
+    try:
+        assert "Appended 3 new matches" in capsys.readouterr().out
+        assert _snapshot(conn) == _fresh(paths["deliveries.csv"], paths["matches.csv"])
+    finally:
+        conn.close()
+
+
+def test_editing_a_cached_match_rebuilds_instead_of_appending(tmp_path, season, capsys):
+    paths, _ = season
+    cache = tmp_path / "ipl.db"
+    open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache).close()
+
+    # Correct 30 deliveries of a match the cache already holds; matches.csv is untouched.
+    df = pd.read_csv(paths["deliveries.csv"])
+    edited = df.index[df["match_id"] == df["match_id"].iloc[0]][:30]
+    df.loc[edited, "batsman_runs"] = 6
+    df.loc[edited, "total_runs"] = 6 + df.loc[edited, "extra_runs"]
+    df.to_csv(paths["deliveries.csv"], index=False)
+    _bump_mtime(paths["deliveries.csv"])
+
+    expected = _fresh(paths["deliveries.csv"], paths["matches.csv"])
+    conn = open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache, incremental=True)
+    try:
+        assert "Appended" not in capsys.readouterr().out
+        assert _snapshot(conn) == expected
+    finally:
+        conn.close()
+
+    # The rebuilt cache is trusted by a later run without --incremental.
+    conn = open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache)
+    try:
+        assert _snapshot(conn) == expected
+    finally:
+        conn.close()
+
+
+def test_deliveries_added_to_a_cached_match_rebuild(tmp_path, season, capsys):
+    paths, full = season
+    cache = tmp_path / "ipl.db"
+    open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache).close()
+
+    # Re-append a delivery of a cached match along with the new matches.
+    delivery_lines = _lines(paths["deliveries.csv"])
+    _write(paths["deliveries.csv"], full["deliveries.csv"] + [delivery_lines[1]])
+    _write(paths["matches.csv"], full["matches.csv"])
+
+    expected = _fresh(paths["deliveries.csv"], paths["matches.csv"])
+    conn = open_database(paths["deliveries.csv"], paths["matches.csv"], cache=cache, incremental=True)
+    try:
+        assert "Appended" not in capsys.readouterr().out
+        assert _snapshot(conn) == expected
+    finally:
+        conn.close()
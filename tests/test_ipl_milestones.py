@@ -0,0 +1,28 @@
+import sqlite3
+
+import pandas as pd
+
+from ipl_milestones import balls_to_milestones
+from ipl_pandas import IPLFrames
+from ipl_pandas import balls_to_milestones as pandas_balls_to_milestones
+
+COLUMNS = ["match_id", "inning", "batter", "batting_team", "over", "ball", "batsman_runs"]
+
+
+def _deliveries():
+    # 40 runs off 10 balls in the second innings, then 20 off 4 in the super over.
+    rows = [(1, 2, "A", "X", 0, ball, 4) for ball in range(1, 11)]
+    rows += [(1, 3, "A", "X", 0, ball, runs) for ball, runs in enumerate((6, 6, 4, 4), 1)]
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_milestones_do_not_carry_over_into_a_super_over():
+    conn = sqlite3.connect(":memory:")
+    _deliveries().to_sql("IPL", conn, index=False)
+    assert balls_to_milestones(conn, (30, 50)).values.tolist() == [[1, 2, "A", "X", 30, 8]]
+
+
+def test_pandas_engine_counts_per_innings():
+    frames = IPLFrames(_deliveries(), pd.DataFrame(columns=["id", "season"]))
+    found = pandas_balls_to_milestones(frames, (30, 50))
+    assert found[["inning", "milestone", "balls"]].values.tolist() == [[2, 30, 8]]
@@ -0,0 +1,53 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+import ipl_pandas
+
+STORAGE = {
+    "default": {},
+    "player_ids": {"player_ids": True},
+    "partition_seasons": {"partition_seasons": True},
+}
+
+
+@pytest.fixture(scope="module", params=list(STORAGE))
+def engine_results(request, tmp_path_factory, ipl_csvs):
+    """
+    Run the full report with both engines over the fixture CSVs and collect
+    {query: (sql result, pandas result)} from the parity check.
+    """
+    import SQL_IPL
+
+    workdir = tmp_path_factory.mktemp(request.param)
+    for path in ipl_csvs:
+        shutil.copy(path, workdir / path.name)
+    results = {}
+    compare = ipl_pandas.compare_results
+
+    def recording_compare(name, sql_result, pandas_result):
+        results[name] = (sql_result, pandas_result)
+        return compare(name, sql_result, pandas_result)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        mp.setattr(ipl_pandas, "compare_results", recording_compare)
+        SQL_IPL.main(check_parity=True, **STORAGE[request.param])
+    return results
+
+
+def test_every_query_is_compared(engine_results):
+    assert sorted(engine_results) == sorted(ipl_pandas.QUERIES)
+
+
+@pytest.mark.parametrize("name", list(ipl_pandas.QUERIES))
+def test_engines_agree(engine_results, name):
+    sql_result, pandas_result = engine_results[name]
+    assert ipl_pandas.compare_results(name, sql_result, pandas_result) is None
+    # Row by row the ranking columns are identical; only rows tied on them
+    # may be ordered, or cut by LIMIT, differently.
+    columns = ipl_pandas.ORDER_BY.get(name) or list(sql_result.columns)
+    pd.testing.assert_frame_equal(sql_result[columns].reset_index(drop=True),
+                                  pandas_result[columns].reset_index(drop=True),
+                                  check_dtype=False)
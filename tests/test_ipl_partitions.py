@@ -0,0 +1,52 @@
+import pandas as pd
+
+from ipl_partitions import frozen_seasons, partitions
+from ipl_store import open_database
+
+TOTALS = "SELECT match_id, SUM(total_runs) FROM IPL GROUP BY match_id ORDER BY match_id"
+
+
+def test_append_into_an_existing_numeric_season(tmp_path, ipl_csvs, capsys):
+    deliveries, matches = ipl_csvs
+    all_matches = pd.read_csv(matches)
+    # Integer seasons, with the three newest matches joining the latest season.
+    all_matches["season"] = [2022] * 4 + [2023] * (len(all_matches) - 4)
+    all_deliveries = pd.read_csv(deliveries)
+    old_ids = set(all_matches["id"].iloc[:-3])
+
+    paths = {"deliveries": tmp_path / "deliveries.csv", "matches": tmp_path / "matches.csv"}
+    all_matches.iloc[:-3].to_csv(paths["matches"], index=False)
+    all_deliveries[all_deliveries["match_id"].isin(old_ids)].to_csv(paths["deliveries"], index=False)
+    cache = tmp_path / "ipl.db"
+    open_database(paths["deliveries"], paths["matches"], cache=cache, partition_seasons=True).close()
+
+    with open(paths["matches"], "a", newline="") as fh:
+        all_matches.iloc[-3:].to_csv(fh, index=False, header=False)
+    with open(paths["deliveries"], "a", newline="") as fh:
+        all_deliveries[~all_deliveries["match_id"].isin(old_ids)].to_csv(fh, index=False, header=False)
+    conn = open_database(paths["deliveries"], paths["matches"], cache=cache,
+                         partition_seasons=True, incremental=True)
+    try:
+        assert "Appended 3 new matches" in capsys.readouterr().out
+        assert [season for season, _ in partitions(conn)] == ["2022", "2023"]
+        assert frozen_seasons(conn) == {"2022"}
+        fresh = open_database(paths["deliveries"], paths["matches"])
+        assert conn.execute(TOTALS).fetchall() == fresh.execute(TOTALS).fetchall()
+        fresh.close()
+    finally:
+        conn.close()
+
+
+def test_partitioning_without_deliveries(tmp_path, ipl_csvs):
+    deliveries, matches = ipl_csvs
+    empty = tmp_path / "deliveries.csv"
+    with open(deliveries, "rb") as src, open(empty, "wb") as dst:
+        dst.write(src.readline())
+    conn = open_database(empty, matches, partition_seasons=True)
+    try:
+        assert partitions(conn) == []
+        assert conn.execute("SELECT COUNT(*) FROM IPL").fetchone() == (0,)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(IPL)")]
+        assert columns == list(pd.read_csv(deliveries, nrows=0).columns)
+    finally:
+        conn.close()